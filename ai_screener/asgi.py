@@ -2,6 +2,8 @@
 ASGI config for ai_screener project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Websocket connections on ``TWILIO_MEDIA_STREAMS['PATH']`` go to the Twilio
+Media Streams endpoint; everything else is handled by Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +15,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ai_screener.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up
+from django.conf import settings  # noqa: E402
+from interviews.media_streams import media_stream_app  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket' and scope['path'] == settings.TWILIO_MEDIA_STREAMS['PATH']:
+        await media_stream_app(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
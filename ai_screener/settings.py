@@ -14,6 +14,8 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from interviews.log import logging_config, parse_module_levels
+
 # Load environment variables
 load_dotenv()
 
@@ -48,6 +50,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'interviews.tracing.TracingMiddleware',
+    'interviews.queries.QueryBudgetMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -57,6 +61,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'interviews.log.LogContextMiddleware',
 ]
 
 ROOT_URLCONF = 'ai_screener.urls'
@@ -152,21 +157,233 @@ API_KEY = os.getenv('API_KEY', '1122334455667788990aaa')
 
 # OpenAI settings
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+# Provider base URLs default to the real APIs; point them at the fakes in
+# interviews.testing (`manage.py run_fake_providers`) to run offline
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
+
+# LLM gateway (interviews.llm): "openai" or "fake" for offline runs
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'openai')
+LLM_REQUESTS_PER_MINUTE = int(os.getenv('LLM_REQUESTS_PER_MINUTE', '500'))
+LLM_TOKENS_PER_MINUTE = int(os.getenv('LLM_TOKENS_PER_MINUTE', '200000'))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '30'))  # seconds per attempt
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '4'))
+
+
+# Transcription backends (interviews.transcription)
+ASSEMBLYAI_API_KEY = os.getenv('ASSEMBLYAI_API_KEY')
+TRANSCRIPTION = {
+    'BACKEND': os.getenv('TRANSCRIPTION_BACKEND', 'assemblyai'),  # assemblyai, whisper_api, local, stub, routing or a dotted path
+    'ROUTING_BACKENDS': os.getenv('TRANSCRIPTION_ROUTING_BACKENDS', 'assemblyai,whisper_api').split(','),
+    'MAX_CONCURRENCY': int(os.getenv('TRANSCRIPTION_MAX_CONCURRENCY', '4')),  # in-flight transcriptions per backend
+    'POOL_SIZE': 10,  # pooled HTTP connections per backend
+    'REQUEST_TIMEOUT': 30,  # seconds per HTTP request
+    'TIMEOUT': 300,  # seconds per transcription, including polling
+    'POLL_INTERVAL': 3,  # seconds between AssemblyAI status polls
+    'ASSEMBLYAI_API_KEY': ASSEMBLYAI_API_KEY,
+    'ASSEMBLYAI_BASE_URL': os.getenv('ASSEMBLYAI_BASE_URL') or None,
+    'OPENAI_API_KEY': OPENAI_API_KEY,
+    'OPENAI_BASE_URL': OPENAI_BASE_URL,
+    'WHISPER_MODEL': 'whisper-1',
+    # "local" backend (requires faster-whisper)
+    'LOCAL_MODEL': os.getenv('TRANSCRIPTION_LOCAL_MODEL', 'base.en'),
+    'LOCAL_WORKERS': int(os.getenv('TRANSCRIPTION_LOCAL_WORKERS', '0')),  # 0 = one process per CPU core
+    'LOCAL_COMPUTE_TYPE': 'int8',
+    'LOCAL_BEAM_SIZE': 1,
+    'LOCAL_LANGUAGE': 'en',
+    # Long recordings are split on silence and the chunks transcribed in parallel
+    'CHUNK_THRESHOLD_SECONDS': int(os.getenv('TRANSCRIPTION_CHUNK_THRESHOLD_SECONDS', '45')),  # 0 disables chunking
+    'CHUNK_TARGET_SECONDS': 30,
+    'CHUNK_MAX_SECONDS': 60,
+    'CHUNK_MIN_SILENCE_MS': 700,
+    'CHUNK_SILENCE_THRESHOLD_DB': 16,  # below the recording's average loudness
+    'CHUNK_WORKERS': int(os.getenv('TRANSCRIPTION_CHUNK_WORKERS', '0')),  # 0 = MAX_CONCURRENCY
+}
 
+# Resume parsing limits; PDFs with PARALLEL_MIN_PAGES or more pages are split
+# across WORKERS processes. Parsed text is cached by file hash.
+RESUME_PARSING = {
+    'MAX_BYTES': int(os.getenv('RESUME_MAX_BYTES', str(10 * 1024 * 1024))),
+    'MAX_PAGES': int(os.getenv('RESUME_MAX_PAGES', '60')),  # later pages are not parsed
+    'TIMEOUT': float(os.getenv('RESUME_PARSE_TIMEOUT', '10')),  # seconds; leading pages parsed so far are kept
+    'WORKERS': int(os.getenv('RESUME_PARSE_WORKERS', '0')),  # 0 = one process per CPU core
+    'PARALLEL_MIN_PAGES': 8,
+    'CACHE_TIMEOUT': 7 * 24 * 60 * 60,  # seconds
+    # Resumes are split into section chunks; scoring prompts get the most relevant ones
+    'CHUNK_CHARS': 400,
+    'CONTEXT_CHUNKS': 3,
+}
+
+# Full-text search (/api/search/): only the newest SEARCH_RANK_WINDOW matches are
+# sorted by rank, and older matches follow them newest first. This keeps very
+# common terms fast on large indexes (SQLite)
+SEARCH_RANK_WINDOW = 5000
+
+# Question and boilerplate prompts pre-rendered to audio when a job description
+# is created, then played with <Play> instead of synthesized by Twilio's <Say>
+TTS = {
+    'PRERENDER_ENABLED': os.getenv('TTS_PRERENDER_ENABLED', 'False').lower() == 'true',
+    'BACKEND': os.getenv('TTS_BACKEND', 'openai'),  # openai or stub
+    'MODEL': 'tts-1',
+    'VOICE': os.getenv('TTS_VOICE', 'alloy'),
+    # Twilio <Say> voice for prompts that aren't rendered and for follow-ups; pick one close to VOICE
+    'SAY_VOICE': os.getenv('TTS_SAY_VOICE', 'Polly.Joanna'),
+    'CACHE_MAX_AGE': 365 * 24 * 60 * 60,  # seconds; files are content-addressed and never change
+}
+
+# Adaptive follow-up questions, generated from the streamed transcript of each
+# answer (needs TWILIO_MEDIA_STREAMS). If no follow-up is ready within the
+# deadline the call moves on to the next prepared question.
+ADAPTIVE_FOLLOWUPS_ENABLED = os.getenv('ADAPTIVE_FOLLOWUPS_ENABLED', 'False').lower() == 'true'
+ADAPTIVE_FOLLOWUP_DEADLINE = float(os.getenv('ADAPTIVE_FOLLOWUP_DEADLINE', '2.0'))  # seconds, from answer webhook to TwiML
+ADAPTIVE_FOLLOWUP_MAX_TOKENS = 60
+ADAPTIVE_FOLLOWUP_MODEL = 'gpt-4o-mini'
 
 # Twilio settings
 TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
 TWILIO_PHONE_NUMBER = os.getenv('TWILIO_PHONE_NUMBER')
+TWILIO_API_BASE_URL = os.getenv('TWILIO_API_BASE_URL') or None  # replaces https://api.twilio.com
+
+TWILIO_RECORDING_DOWNLOAD_TIMEOUT = 10  # seconds for the whole download; Twilio retries webhooks that take over 15
+
+# Retried Twilio webhooks (interviews.idempotency) are answered with the first
+# delivery's response, keyed on (CallSid, RecordingSid) for answers and
+# (CallSid, CallStatus) for status callbacks. Set CACHE_REDIS_URL when running
+# several worker processes so retries reaching another process are recognised
+TWILIO_WEBHOOK_IDEMPOTENCY = {
+    'ENABLED': os.getenv('TWILIO_WEBHOOK_IDEMPOTENCY_ENABLED', 'True').lower() == 'true',
+    'CACHE_ALIAS': 'default',
+    'RESPONSE_TTL': 60 * 60,  # seconds a response is replayed to retries
+    'IN_FLIGHT_PAUSE': 2,  # seconds Twilio pauses before re-requesting an answer whose first delivery is running
+    'IN_FLIGHT_TIMEOUT': 120,  # seconds before the claim of a delivery that never finished expires
+}
 
 WHITELISTED_NUMBERS = ["*"]
 
+# Real-time transcription over Twilio Media Streams. Requires serving the
+# project with an ASGI server (e.g. uvicorn ai_screener.asgi:application) in a
+# single process, since streaming sessions live in memory.
+TWILIO_MEDIA_STREAMS = {
+    'ENABLED': os.getenv('TWILIO_MEDIA_STREAMS_ENABLED', 'False').lower() == 'true',
+    'PATH': '/ws/media-stream/',
+    'BACKEND': os.getenv('TWILIO_MEDIA_STREAMS_BACKEND') or None,  # None = TRANSCRIPTION['BACKEND']
+    'WORKERS': int(os.getenv('TWILIO_MEDIA_STREAMS_WORKERS', '4')),  # utterances transcribed in parallel
+    'END_SILENCE_MS': 600,  # pause that ends an utterance
+    'ENERGY_THRESHOLD': 500,  # RMS of 16-bit PCM treated as speech
+    'FLUSH_TIMEOUT': 1.0,  # seconds the answer webhook waits for the last utterance
+    'RECORD_DIR': os.getenv('TWILIO_MEDIA_STREAMS_RECORD_DIR') or None,  # save raw frames for replay_media_stream
+    'AUTHENTICATE': True,  # require the signed token from the call's TwiML on 'start'
+    'TOKEN_MAX_AGE': 300,  # seconds from the TwiML request to the stream starting
+}
+
 # Base URL for webhooks (update with your domain)
 if DEBUG:
     BASE_URL = os.getenv('LOCALBASE_URL', 'http://localhost:8000')
 else:
     BASE_URL = os.getenv('BASE_URL')
 
+# Logging (interviews.log): LOG_LEVEL for the app, LOG_LEVELS to override single
+# modules, e.g. "interviews.audio=DEBUG,interviews.telephony=DEBUG"
+LOGGING = logging_config(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    module_levels=parse_module_levels(os.getenv('LOG_LEVELS', '')),
+    fmt=os.getenv('LOG_FORMAT', 'json'),  # json or text
+)
+
+# OpenTelemetry tracing (interviews.tracing); one trace per interview.
+# EXPORTER is "otlp" (OTLP/HTTP collector) or "file" (JSON lines, for offline use)
+TRACING = {
+    'ENABLED': os.getenv('TRACING_ENABLED', 'False').lower() == 'true',
+    'EXPORTER': os.getenv('TRACING_EXPORTER', 'otlp'),
+    'OTLP_ENDPOINT': os.getenv('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces'),
+    'FILE_PATH': os.getenv('TRACING_FILE_PATH', str(BASE_DIR / 'traces.jsonl')),
+    'SERVICE_NAME': os.getenv('TRACING_SERVICE_NAME', 'ai-screener'),
+}
+
+# Caches: local memory per process by default. Set CACHE_REDIS_URL (requires
+# `pip install redis`) to share parsed resumes and cached responses between
+# worker processes; local-memory invalidations only reach the process that
+# made the change, so other workers may serve entries up to TIMEOUT old
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+# Worker processes serving requests; gunicorn and uvicorn --workers read the
+# same variable. Above 1, the response cache requires CACHE_REDIS_URL
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': 'ai-screener',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+# Cached GET responses for results and list endpoints (interviews.response_cache),
+# invalidated by model signals and revalidated by clients with ETag/Last-Modified
+RESPONSE_CACHE = {
+    'ENABLED': os.getenv('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true',
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300')),  # seconds
+}
+
+# Live interview events streamed as server-sent events from
+# /api/interviews/<id>/events/ (interviews.events). The in-process broker
+# needs a single ASGI process, like TWILIO_MEDIA_STREAMS
+EVENTS = {
+    'BACKEND': os.getenv('EVENTS_BACKEND', 'interviews.events.InProcessBroker'),
+    'MAX_QUEUED': 100,  # events buffered per client before it is resent a snapshot
+    'HEARTBEAT_SECONDS': 15,
+    'RETRY_MS': 3000,  # EventSource reconnection delay
+}
+
+# Outbound webhooks to client systems (interviews.webhooks). DISPATCHER is
+# "thread" (deliver from a thread in the web process) or "command" (run
+# `python manage.py dispatch_webhooks`, e.g. where web workers can't keep threads)
+WEBHOOKS = {
+    'ENABLED': os.getenv('WEBHOOKS_ENABLED', 'True').lower() == 'true',
+    'DISPATCHER': os.getenv('WEBHOOKS_DISPATCHER', 'thread'),
+    'BATCH_SIZE': int(os.getenv('WEBHOOKS_BATCH_SIZE', '20')),  # events per POST
+    'MAX_CONCURRENCY_PER_ENDPOINT': int(os.getenv('WEBHOOKS_MAX_CONCURRENCY_PER_ENDPOINT', '2')),
+    'WORKERS': 8,
+    'TIMEOUT': 10,  # seconds per POST
+    'MAX_ATTEMPTS': int(os.getenv('WEBHOOKS_MAX_ATTEMPTS', '8')),
+    'BACKOFF_BASE': 30,  # seconds before the first retry, doubled on each failure
+    'BACKOFF_MAX': 60 * 60,
+    'LEASE_SECONDS': 60,  # leased rows whose sender died are retried after this
+    'POLL_INTERVAL': 5,  # seconds between checks for retries that became due
+    # Endpoint URLs must be https and resolve to public addresses, except these hosts (e.g. for local testing)
+    'ALLOWED_HOSTS': [host.strip() for host in os.getenv('WEBHOOKS_ALLOWED_HOSTS', '').split(',') if host.strip()],
+}
+
+# Query budgets (interviews.queries): queries allowed per request by URL name,
+# and how often one query shape may repeat before it is reported as an N+1.
+# Counts are returned in X-Query-* headers when DEBUG; RAISE fails the request
+# (set it in tests so budget regressions fail them)
+QUERY_BUDGETS = {
+    'ENABLED': os.getenv('QUERY_BUDGETS_ENABLED', str(DEBUG)).lower() == 'true',
+    'RAISE': os.getenv('QUERY_BUDGETS_RAISE', 'False').lower() == 'true',
+    'N_PLUS_ONE_THRESHOLD': int(os.getenv('QUERY_BUDGETS_N_PLUS_ONE_THRESHOLD', '5')),
+    'DEFAULT': 30,  # None = no limit
+    'VIEWS': {
+        'list_interviews': 5,
+        'list_candidates': 3,
+        'list_job_descriptions': 3,
+        'list_audio_files': 3,
+        'list_audio_files_by_interview': 4,
+        'get_interview_results': 12,
+        'twilio_webhook_twiml': 8,
+        'twilio_webhook_answer': 15,
+        'twilio_webhook_status': 8,  # includes queueing outbound webhook events
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -177,4 +394,16 @@ CELERY_RESULT_BACKEND = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
+
+# Background tasks (in-process worker pool)
+BACKGROUND_TASK_WORKERS = int(os.getenv('BACKGROUND_TASK_WORKERS', '4'))
+BACKGROUND_TASKS_EAGER = os.getenv('BACKGROUND_TASKS_EAGER', 'False').lower() == 'true'
+# Seconds before the claim of an answer evaluation that never finished (e.g. a
+# killed worker) expires and another worker may evaluate the answer
+ANSWER_EVALUATION_LEASE = 600
+JOB_DESCRIPTION_CALLBACK_TIMEOUT = 10  # seconds
+# Callback hosts trusted without the https/public address checks (e.g. localhost for local testing)
+JOB_DESCRIPTION_CALLBACK_ALLOWED_HOSTS = [
+    host.strip() for host in os.getenv('JOB_DESCRIPTION_CALLBACK_ALLOWED_HOSTS', '').split(',') if host.strip()
+]
 APPEND_SLASH=False
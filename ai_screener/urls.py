@@ -18,9 +18,12 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from interviews.views import PrometheusMetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('interviews.urls')),
+    path('metrics', PrometheusMetricsView.as_view(), name='prometheus_metrics'),
 ]
 
 # Serve media files in development
@@ -1,29 +1,63 @@
 from django.contrib import admin
-from .models import JobDescription, Candidate, Interview, Question, Answer
+from .models import (
+    JobDescription, QuestionGenerationCache, QuestionSet, Candidate, Interview, Question, Answer,
+    WebhookEndpoint, WebhookDelivery
+)
+from .search import search_object_ids
+
+class IndexedSearchMixin:
+    """Answer the admin search box from the full-text index instead of LIKE scans"""
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.filter(pk__in=search_object_ids(search_term, self.search_kind)), False
 
 @admin.register(JobDescription)
-class JobDescriptionAdmin(admin.ModelAdmin):
+class JobDescriptionAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['title', 'created_at', 'updated_at']
     search_fields = ['title', 'description']
+    search_kind = 'job_description'
     readonly_fields = ['id', 'created_at', 'updated_at']
 
+@admin.register(QuestionGenerationCache)
+class QuestionGenerationCacheAdmin(admin.ModelAdmin):
+    list_display = ['description_hash', 'model', 'hit_count', 'created_at', 'last_used_at']
+    search_fields = ['description_hash']
+    readonly_fields = ['id', 'description_hash', 'questions', 'model', 'hit_count', 'created_at', 'last_used_at']
+    actions = ['invalidate_entries']
+
+    @admin.action(description='Invalidate selected cache entries')
+    def invalidate_entries(self, request, queryset):
+        deleted, _ = queryset.delete()
+        self.message_user(request, f"Invalidated {deleted} cached question generation(s).")
+
+@admin.register(QuestionSet)
+class QuestionSetAdmin(admin.ModelAdmin):
+    list_display = ['job_description', 'version', 'created_at']
+    list_filter = ['job_description']
+    readonly_fields = ['id', 'created_at']
+
 @admin.register(Candidate)
-class CandidateAdmin(admin.ModelAdmin):
+class CandidateAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'phone', 'created_at']
     search_fields = ['name', 'email', 'phone']
+    search_kind = 'candidate'
     readonly_fields = ['id', 'created_at', 'updated_at']
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
-    list_display = ['question_text', 'interview', 'question_number', 'created_at']
+    list_display = ['question_text', 'question_set', 'interview', 'question_number', 'created_at']
     search_fields = ['question_text']
-    list_filter = ['interview']
+    list_filter = ['question_set', 'interview']
     readonly_fields = ['id', 'created_at']
 
 @admin.register(Answer)
-class AnswerAdmin(admin.ModelAdmin):
+class AnswerAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['question', 'score', 'created_at']
     search_fields = ['transcript']
+    search_kind = 'answer'
     list_filter = ['score']
     readonly_fields = ['id', 'created_at']
 
@@ -36,3 +70,30 @@ class InterviewAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('candidate', 'job_description')
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ['url', 'events', 'is_active', 'created_at']
+    list_filter = ['is_active']
+    search_fields = ['url']
+    readonly_fields = ['id', 'created_at', 'updated_at']
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['event', 'endpoint', 'interview', 'status', 'attempts', 'next_attempt_at', 'delivered_at']
+    list_filter = ['status', 'event']
+    readonly_fields = [
+        'id', 'endpoint', 'interview', 'event', 'payload', 'attempts', 'lease_token', 'leased_until',
+        'last_error', 'created_at', 'delivered_at'
+    ]
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected deliveries now')
+    def retry_now(self, request, queryset):
+        from django.utils import timezone
+        from .webhooks import wake_dispatcher
+        updated = queryset.exclude(status='delivered').update(
+            status='pending', next_attempt_at=timezone.now(), lease_token=None, leased_until=None
+        )
+        wake_dispatcher()
+        self.message_user(request, f"Scheduled {updated} delivery(ies) for retry.")
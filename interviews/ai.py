@@ -0,0 +1,241 @@
+"""OpenAI-backed question generation, answer scoring and recommendations"""
+import re
+import json
+import hashlib
+import logging
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .models import QuestionGenerationCache
+from .llm import get_llm_gateway, LLMError
+from .metrics import span, stage_errors
+
+logger = logging.getLogger(__name__)
+
+QUESTION_GENERATION_MODEL = "gpt-4o-mini"
+# Bump when the generation prompt changes; cached generations from older prompts are then not served
+QUESTION_PROMPT_VERSION = 1
+# Recommendations stored when there is nothing to evaluate or the LLM call failed
+NO_ANSWERS_RECOMMENDATION = "No answers provided for evaluation."
+FAILED_RECOMMENDATION = "Unable to generate recommendation"
+FALLBACK_RECOMMENDATIONS = frozenset({NO_ANSWERS_RECOMMENDATION, FAILED_RECOMMENDATION})
+
+def normalize_job_description(job_description):
+    """Normalize a job description so that re-posts with different whitespace/case share a cache entry"""
+    return re.sub(r'\s+', ' ', job_description).strip().lower()
+
+def job_description_hash(job_description):
+    """SHA-256 of the generation model, prompt version and normalized job description"""
+    key = f"{QUESTION_GENERATION_MODEL}\nv{QUESTION_PROMPT_VERSION}\n{normalize_job_description(job_description)}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def select_questions(questions, description_hash):
+    """Deterministically keep 5-7 questions, derived from the description hash"""
+    number_of_questions = 5 + int(description_hash, 16) % 3
+    return questions[:number_of_questions]
+
+def get_cached_questions(job_description):
+    """Return cached questions for a job description, or None if it has not been generated yet"""
+    description_hash = job_description_hash(job_description)
+    cached = QuestionGenerationCache.objects.filter(description_hash=description_hash).first()
+    if not cached:
+        return None
+    QuestionGenerationCache.objects.filter(pk=cached.pk).update(
+        hit_count=F('hit_count') + 1, last_used_at=timezone.now()
+    )
+    logger.debug("Question cache hit for description hash %s", description_hash[:12])
+    return select_questions(cached.questions, description_hash)
+
+@span('ai.generate_questions')
+def generate_questions_from_jd(job_description, fallback=True):
+    """Generate interview questions from job description using OpenAI, reusing cached generations.
+
+    If generation fails, returns generic questions, or re-raises the error
+    when `fallback` is False so the caller can record the failure and retry.
+    """
+    cached_questions = get_cached_questions(job_description)
+    if cached_questions is not None:
+        return cached_questions
+
+    description_hash = job_description_hash(job_description)
+    try:
+        prompt = f"""
+        Based on the following job description, generate 5-7 relevant interview questions.
+        Focus on technical skills, experience, and behavioral questions.
+        
+        Job Description:
+        {job_description}
+        
+        Return only a JSON array of questions, no additional text.
+        Example format: ["Question 1", "Question 2", "Question 3"]
+        """
+        
+        response = get_llm_gateway().chat(
+            operation="generate_questions",
+            model=QUESTION_GENERATION_MODEL,
+            messages=[
+                {"role": "system", "content": "You are an expert HR professional who creates relevant interview questions."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=500,
+            temperature=0.7
+        )
+        
+        questions_text = response.content.strip()
+        questions = json.loads(questions_text)
+        if not isinstance(questions, list) or not questions or not all(isinstance(q, str) for q in questions):
+            raise ValueError(f"Expected a JSON array of questions, got {questions_text[:100]!r}")
+        
+        # Cache the full list; truncation is applied on every read
+        QuestionGenerationCache.objects.update_or_create(
+            description_hash=description_hash,
+            defaults={'questions': questions, 'model': QUESTION_GENERATION_MODEL}
+        )
+        return select_questions(questions, description_hash)
+        
+    except Exception as e:
+        logger.error("Error generating questions: %s", e)
+        stage_errors.inc(stage='ai.generate_questions', error=type(e).__name__)
+        if not fallback:
+            raise
+        return [
+            "Tell me about your relevant experience for this role.",
+            "What are your key strengths that would benefit this position?",
+            "Describe a challenging project you worked on.",
+            "How do you handle tight deadlines and pressure?",
+            "What are your career goals for the next few years?"
+        ]
+
+@span('ai.score_answer')
+def score_answer(question, answer_transcript, resume_context=""):
+    """Score a candidate's answer using OpenAI.
+
+    `resume_context` should be the relevant resume excerpts (`Candidate.resume_context`),
+    not the whole resume.
+    """
+    try:
+        prompt = f"""
+        Score the following answer to an interview question on a scale of 1-10.
+        
+        Question: {question}
+        Answer: {answer_transcript}
+        Relevant Resume Excerpts:
+        {resume_context or "None provided"}
+        
+        Provide:
+        1. A score from 1-10
+        2. Brief feedback (1-2 sentences)
+        
+        Return as JSON: {{"score": 8, "feedback": "Good answer with relevant examples"}}
+        """
+        
+        response = get_llm_gateway().chat(
+            operation="score_answer",
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an expert interviewer evaluating candidate responses."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=200,
+            temperature=0.3
+        )
+        
+        result_text = response.content.strip()
+        result = json.loads(result_text)
+        return result.get('score', 5), result.get('feedback', 'No feedback available')
+        
+    except Exception as e:
+        logger.error("Error scoring answer: %s", e)
+        stage_errors.inc(stage='ai.score_answer', error=type(e).__name__)
+        return 10, str(e)
+
+
+# Built once so the per-call prompt is only the question and answer
+FOLLOWUP_SYSTEM_PROMPT = (
+    "You are a phone interviewer. Given an interview question and the candidate's spoken answer, "
+    "ask ONE short follow-up question (under 25 words) that probes a vague or interesting point in the answer. "
+    "Reply with the question only. If the answer needs no follow-up, reply with NONE."
+)
+
+@span('ai.followup_question')
+def generate_followup_question(question, answer_transcript, deadline):
+    """Return a follow-up question for an answer, or None if not needed or not ready within `deadline` seconds"""
+    try:
+        response = get_llm_gateway().chat(
+            operation="followup_question",
+            model=settings.ADAPTIVE_FOLLOWUP_MODEL,
+            messages=[
+                {"role": "system", "content": FOLLOWUP_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Question: {question}\nAnswer: {answer_transcript}"}
+            ],
+            max_tokens=settings.ADAPTIVE_FOLLOWUP_MAX_TOKENS,
+            temperature=0.3,
+            timeout=deadline,
+            deadline=deadline
+        )
+    except LLMError as e:
+        logger.info("Follow-up question skipped: %s", e)
+        stage_errors.inc(stage='ai.followup_question', error=type(e).__name__)
+        return None
+
+    followup = response.content.strip().strip('"')
+    if not followup or followup.upper().startswith('NONE'):
+        return None
+    return followup
+
+
+@span('ai.final_recommendation')
+def generate_final_recommendation(interview):
+    """Generate final recommendation based on all answers"""
+    try:
+        questions_answers = []
+        total_score = 0
+        answer_count = 0
+        
+        for question in interview.question_list:
+            answer = interview.get_answer(question)
+            if answer:
+                questions_answers.append({
+                    'question': question.question_text,
+                    'answer': answer.transcript or "No transcript available",
+                    'score': answer.score if answer.score is not None else "Not evaluated"
+                })
+                if answer.score is not None:
+                    total_score += answer.score
+                    answer_count += 1
+        
+        if answer_count == 0:
+            return NO_ANSWERS_RECOMMENDATION
+        
+        avg_score = total_score / answer_count
+        
+        prompt = f"""
+        You are evaluating an interview based on transcripts.
+
+        Average Score: {avg_score:.2f}/10
+        Total Questions Answered: {answer_count}
+
+        Here are the interview transcripts with scores:
+        {json.dumps(questions_answers, indent=2)}
+
+        Based on the above, provide a final recommendation in 2-3 sentences 
+        on whether the candidate should proceed to the next round.
+        """
+        
+        response = get_llm_gateway().chat(
+            operation="final_recommendation",
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an HR professional providing interview recommendations."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=300,
+            temperature=0.3
+        )
+        
+        return response.content.strip()
+        
+    except Exception as e:
+        logger.error("Error generating recommendation: %s", e)
+        stage_errors.inc(stage='ai.final_recommendation', error=type(e).__name__)
+        return FAILED_RECOMMENDATION
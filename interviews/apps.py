@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class InterviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'interviews'
+
+    def ready(self):
+        from . import events, response_cache, search, webhooks
+        from .tracing import configure
+        search.connect_signals()
+        response_cache.connect_signals()
+        response_cache.check_shared_cache()
+        events.connect_signals()
+        webhooks.connect_signals()
+        configure()
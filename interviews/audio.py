@@ -0,0 +1,145 @@
+"""Local audio validation, conversion and diagnostics"""
+import logging
+import os
+from .clients import get_audio_segment
+from .metrics import span
+
+logger = logging.getLogger(__name__)
+
+def validate_audio_file(file_path):
+    """Validate that a file is a valid audio file"""
+    try:
+        if not os.path.exists(file_path):
+            return False, "File does not exist"
+        
+        file_size = os.path.getsize(file_path)
+        if file_size == 0:
+            return False, "File is empty"
+        
+        if file_size < 1024:  # Less than 1KB
+            return False, "File is too small to be valid audio"
+        
+        # Try to load with pydub to validate it's audio
+        try:
+            sound = get_audio_segment().from_file(file_path)
+            if len(sound) < 100:  # Less than 100ms
+                return False, "Audio duration is too short"
+            return True, f"Valid audio file: {len(sound)}ms, {sound.channels} channels, {sound.frame_rate}Hz"
+        except Exception as e:
+            return False, f"Not a valid audio file: {str(e)}"
+            
+    except Exception as e:
+        return False, f"Error validating file: {str(e)}"
+
+@span('audio.convert_wav')
+def convert_to_wav_local(input_path, output_path):
+    """Convert any audio file to WAV PCM16 16kHz mono"""
+    try:
+        logger.debug("Converting %s to %s", input_path, output_path)
+        
+        # Check if input file exists and has content
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        
+        file_size = os.path.getsize(input_path)
+        if file_size == 0:
+            raise ValueError(f"Input file is empty: {input_path}")
+        
+        logger.debug("Input file size: %d bytes", file_size)
+        
+        # Try to load the audio file
+        sound = get_audio_segment().from_file(input_path)
+        logger.debug("Audio loaded - duration: %dms, channels: %d, frame_rate: %d", len(sound), sound.channels, sound.frame_rate)
+        
+        # Convert to mono, 16kHz, 16-bit
+        sound = sound.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+        logger.debug("Converted audio - duration: %dms, channels: %d, frame_rate: %d", len(sound), sound.channels, sound.frame_rate)
+        
+        # Export to WAV
+        sound.export(output_path, format="wav")
+        
+        # Verify output file
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            logger.debug("Converted to %s (%d bytes)", output_path, os.path.getsize(output_path))
+            return output_path
+        else:
+            raise ValueError(f"Output file creation failed: {output_path}")
+            
+    except Exception as e:
+        logger.exception("Error in convert_to_wav_local: %s", e)
+        raise
+
+@span('audio.convert_mp3')
+def convert_to_mp3_local(input_path, output_path):
+    """Convert any audio file to MP3 format"""
+    try:
+        logger.debug("Converting %s to MP3: %s", input_path, output_path)
+        
+        # Check if input file exists and has content
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        
+        file_size = os.path.getsize(input_path)
+        if file_size == 0:
+            raise ValueError(f"Input file is empty: {input_path}")
+        
+        logger.debug("Input file size: %d bytes", file_size)
+        
+        # Try to load the audio file
+        sound = get_audio_segment().from_file(input_path)
+        logger.debug("Audio loaded - duration: %dms, channels: %d, frame_rate: %d", len(sound), sound.channels, sound.frame_rate)
+        
+        # Convert to mono, 44.1kHz for better compatibility
+        sound = sound.set_channels(1).set_frame_rate(44100)
+        logger.debug("Converted audio - duration: %dms, channels: %d, frame_rate: %d", len(sound), sound.channels, sound.frame_rate)
+        
+        # Export to MP3 with good quality
+        sound.export(output_path, format="mp3", bitrate="128k")
+        
+        # Verify output file
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            logger.debug("Converted to MP3: %s (%d bytes)", output_path, os.path.getsize(output_path))
+            return output_path
+        else:
+            raise ValueError(f"MP3 file creation failed: {output_path}")
+            
+    except Exception as e:
+        logger.exception("Error in convert_to_mp3_local: %s", e)
+        raise
+
+def debug_audio_file(answer_obj):
+    """Log diagnostics for an answer's audio file (at DEBUG level; a no-op otherwise)"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    try:
+        if not answer_obj.audio_file:
+            logger.debug("No audio file attached to answer")
+            return
+
+        audio_path = answer_obj.audio_file.path
+        exists = os.path.exists(audio_path)
+        logger.debug("Audio file %s exists: %s", audio_path, exists)
+
+        if exists:
+            # Check file header for common audio file signatures
+            with open(audio_path, 'rb') as f:
+                header = f.read(16)
+            if header.startswith(b'RIFF'):
+                detected = "WAV"
+            elif header.startswith(b'ID3') or header.startswith(b'\xff\xfb'):
+                detected = "MP3"
+            elif header.startswith(b'OggS'):
+                detected = "OGG"
+            else:
+                detected = "unknown"
+            logger.debug(
+                "Audio file size: %d bytes, permissions: %s, header: %s (%s)",
+                os.path.getsize(audio_path), oct(os.stat(audio_path).st_mode)[-3:], header.hex(), detected
+            )
+
+        # Try to validate with pydub
+        is_valid, validation_msg = validate_audio_file(audio_path)
+        logger.debug("Pydub validation: %s", validation_msg)
+
+    except Exception as e:
+        logger.exception("Error in debug_audio_file: %s", e)
@@ -0,0 +1,80 @@
+"""Helpers shared by the benchmark management commands"""
+import contextlib
+import math
+import os
+import tempfile
+import time
+
+from django.db import connection
+
+
+@contextlib.contextmanager
+def benchmark_database(verbosity=0, on_disk=False):
+    """Run a benchmark against a throwaway test database instead of the real one.
+
+    SQLite test databases live in memory unless `on_disk` is set; use it when
+    several threads write concurrently, as in a load test.
+    """
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    saved_name = test_settings.get('NAME')
+    if on_disk and connection.vendor == 'sqlite':
+        test_settings['NAME'] = os.path.join(tempfile.mkdtemp(prefix='benchmark-db-'), 'db.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        test_settings['NAME'] = saved_name
+
+
+class Stopwatch:
+    """Collect wall-clock samples (in seconds) from repeated `with stopwatch:` blocks"""
+
+    def __init__(self):
+        self.samples = []
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.samples.append(time.perf_counter() - self._start)
+        return False
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    """Summary statistics for a list of durations in seconds, reported in milliseconds"""
+    total = sum(samples)
+    return {
+        'count': len(samples),
+        'total_ms': total * 1000,
+        'mean_ms': (total / len(samples) * 1000) if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def format_table(rows, columns):
+    """Render a list of dicts as a fixed-width text table"""
+    def cell(value):
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    widths = {c: max(len(c), *(len(cell(r.get(c, ''))) for r in rows)) for c in columns}
+    lines = ['  '.join(c.ljust(widths[c]) for c in columns)]
+    lines.append('  '.join('-' * widths[c] for c in columns))
+    for row in rows:
+        lines.append('  '.join(
+            cell(row.get(c, '')).ljust(widths[c]) if isinstance(row.get(c), str) else cell(row.get(c, '')).rjust(widths[c])
+            for c in columns
+        ))
+    return '\n'.join(lines)
@@ -0,0 +1,55 @@
+"""Lazy accessors for provider clients and heavy parsing libraries.
+
+Importing `interviews.utils` (and through it the views and serializers) must
+stay cheap, so the Twilio client and the PDF/DOCX/audio libraries are only
+imported and built the first time something actually needs them.
+"""
+import functools
+
+from django.conf import settings
+
+
+TWILIO_API_URL = 'https://api.twilio.com'
+
+
+@functools.lru_cache(maxsize=None)
+def get_twilio_client():
+    """Twilio REST client, built once per process"""
+    from twilio.rest import Client
+    http_client = None
+    if settings.TWILIO_API_BASE_URL:
+        from twilio.http.http_client import TwilioHttpClient
+
+        class RedirectingHttpClient(TwilioHttpClient):
+            """Sends API requests to settings.TWILIO_API_BASE_URL (e.g. a fake Twilio server)"""
+
+            def request(self, method, url, *args, **kwargs):
+                if url.startswith(TWILIO_API_URL):
+                    url = settings.TWILIO_API_BASE_URL.rstrip('/') + url[len(TWILIO_API_URL):]
+                return super().request(method, url, *args, **kwargs)
+
+        http_client = RedirectingHttpClient()
+    return Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN, http_client=http_client)
+
+
+def get_audio_segment():
+    """pydub's AudioSegment class"""
+    from pydub import AudioSegment
+    return AudioSegment
+
+
+def get_pdf_reader(file):
+    """PyPDF2 reader for a PDF file object"""
+    import PyPDF2
+    return PyPDF2.PdfReader(file)
+
+
+def get_docx_document(file):
+    """python-docx Document for a DOCX file object"""
+    from docx import Document
+    return Document(file)
+
+
+def reset_clients():
+    """Drop cached clients so the next access picks up changed settings"""
+    get_twilio_client.cache_clear()
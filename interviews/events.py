@@ -0,0 +1,226 @@
+"""Live interview progress events over a lightweight publish/subscribe broker.
+
+Saving an Interview or Answer publishes events on the ``interview:<id>``
+channel once the transaction commits:
+
+- ``status``: the interview status changed (``{'status'}``)
+- ``transcript_ready``: an answer was transcribed (``{'answer_id', 'question_id', 'transcript'}``)
+- ``score_ready``: an answer was scored (``{'answer_id', 'question_id', 'score', 'feedback'}``)
+- ``recommendation``: the final recommendation was stored (``{'recommendation'}``)
+
+`InterviewEventsView` streams them to clients as server-sent events, starting
+with a ``snapshot`` of the interview so nothing saved before the connection is
+missed. The default `InProcessBroker` only reaches subscribers in the
+publishing process, so like Media Streams it needs a single ASGI process;
+``settings.EVENTS['BACKEND']`` takes a dotted path to another broker.
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils.module_loading import import_string
+
+from .metrics import registry
+from .models import Answer, Interview
+
+logger = logging.getLogger(__name__)
+
+events_published = registry.counter('interview_events_published_total', 'Interview progress events published by type')
+events_dropped = registry.counter(
+    'interview_events_dropped_total', 'Events not queued for a slow subscriber, which is re-sent a snapshot'
+)
+
+# Events after which an interview's stream ends
+FINAL_EVENTS = {'recommendation'}
+FINAL_STATUSES = {'failed'}
+
+
+def channel_for(interview_id):
+    return f"interview:{interview_id}"
+
+
+class Subscription:
+    """Events on one channel for one consumer running in an asyncio event loop"""
+
+    def __init__(self, broker, channel, max_queued):
+        self.broker = broker
+        self.channel = channel
+        self.max_queued = max_queued
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        # Set when events were dropped; the consumer should resynchronize from a snapshot
+        self.overflowed = False
+
+    def deliver(self, event):
+        """Queue `event`; safe to call from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The consumer's loop is closed
+            self.close()
+
+    def _put(self, event):
+        if self.queue.qsize() >= self.max_queued:
+            self.overflowed = True
+            events_dropped.inc()
+            return
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """The next event, or None if none arrives within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def clear(self):
+        """Forget queued events and the overflow flag (after resynchronizing)"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.overflowed = False
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Deliver events to subscriptions in this process"""
+
+    def __init__(self, max_queued=100):
+        self.max_queued = max_queued
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        """Subscribe from inside a running event loop"""
+        subscription = Subscription(self, channel, self.max_queued)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def has_subscribers(self, channel):
+        with self._lock:
+            return bool(self._subscriptions.get(channel))
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker, building it from settings.EVENTS on first use"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            options = settings.EVENTS
+            _broker = import_string(options['BACKEND'])(max_queued=options['MAX_QUEUED'])
+        return _broker
+
+
+def reset_broker(broker=None):
+    """Discard the current broker (e.g. after changing settings in tests), optionally installing `broker`"""
+    global _broker
+    with _broker_lock:
+        _broker = broker
+        return _broker
+
+
+def publish(interview_id, event):
+    events_published.inc(type=event['type'])
+    get_broker().publish(channel_for(interview_id), event)
+
+
+def interview_snapshot(interview_id):
+    """A ``snapshot`` event with the interview's current status, answers and recommendation"""
+    interview = Interview.objects.only('id', 'status', 'recommendation').get(id=interview_id)
+    answers = Answer.objects.filter(interview_id=interview_id).only(
+        'id', 'question_id', 'transcript', 'score', 'feedback'
+    )
+    return {
+        'type': 'snapshot',
+        'status': interview.status,
+        'recommendation': interview.recommendation or None,
+        'answers': [
+            {
+                'answer_id': str(answer.id),
+                'question_id': str(answer.question_id),
+                'transcript': answer.transcript or None,
+                'score': answer.score,
+                'feedback': answer.feedback or None,
+            }
+            for answer in answers
+        ],
+    }
+
+
+def is_final(event):
+    """Whether nothing more will happen to the interview after `event`"""
+    if event['type'] == 'snapshot':
+        return bool(event['recommendation']) or event['status'] in FINAL_STATUSES
+    if event['type'] == 'status':
+        return event['status'] in FINAL_STATUSES
+    return event['type'] in FINAL_EVENTS
+
+
+def _changed(update_fields, field):
+    return update_fields is None or field in update_fields
+
+
+def _answer_events(answer, update_fields):
+    ids = {'answer_id': str(answer.id), 'question_id': str(answer.question_id)}
+    if answer.transcript and _changed(update_fields, 'transcript'):
+        yield {'type': 'transcript_ready', **ids, 'transcript': answer.transcript}
+    if answer.score is not None and _changed(update_fields, 'score'):
+        yield {'type': 'score_ready', **ids, 'score': answer.score, 'feedback': answer.feedback}
+
+
+def _interview_events(interview, update_fields):
+    if _changed(update_fields, 'status'):
+        yield {'type': 'status', 'status': interview.status}
+    if interview.recommendation and _changed(update_fields, 'recommendation'):
+        yield {'type': 'recommendation', 'recommendation': interview.recommendation}
+
+
+def _on_save(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw or (created and sender is Interview):
+        # Nobody can be subscribed to an interview that did not exist
+        return
+    if sender is Answer:
+        interview_id = instance.interview_id
+        events = list(_answer_events(instance, update_fields))
+    else:
+        interview_id = instance.pk
+        events = list(_interview_events(instance, update_fields))
+    if not events:
+        return
+
+    def send():
+        # Checked after commit; clients subscribing later see the change in their snapshot
+        if not get_broker().has_subscribers(channel_for(interview_id)):
+            return
+        for event in events:
+            publish(interview_id, event)
+    transaction.on_commit(send)
+
+
+def connect_signals():
+    post_save.connect(_on_save, sender=Answer, dispatch_uid='events_answer')
+    post_save.connect(_on_save, sender=Interview, dispatch_uid='events_interview')
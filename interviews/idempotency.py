@@ -0,0 +1,90 @@
+"""Deduplicate Twilio webhook deliveries.
+
+Twilio retries a webhook that doesn't answer within 15 seconds, with the same
+CallSid and RecordingSid. The first delivery of a key claims it in the cache;
+its response is stored there and replayed to every retry. Error responses
+(marked ``Cache-Control: no-store``) are not stored: the claim is released so
+a retry handles the request again. A retry that arrives while the first
+delivery is still running is answered at once without blocking a worker (see
+`views.idempotent_webhook`). Recording downloads are claimed separately per
+RecordingSid, so each recording is ingested once.
+
+Claims live in the cache named by ``CACHE_ALIAS``: per process with the
+default local-memory cache, shared between workers with CACHE_REDIS_URL.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import registry
+from .models import Answer
+
+twilio_webhook_duplicates = registry.counter(
+    'twilio_webhook_duplicates_total',
+    'Retried Twilio webhook deliveries absorbed, by webhook and outcome (replayed, in_flight, recording_skipped)'
+)
+
+_PROCESSING = 'processing'
+
+
+def get_cache():
+    return caches[settings.TWILIO_WEBHOOK_IDEMPOTENCY['CACHE_ALIAS']]
+
+
+def delivery_key(webhook, path, *values):
+    digest = hashlib.sha1('\n'.join([path, *values]).encode()).hexdigest()
+    return f"twilio-webhook:{webhook}:{digest}"
+
+
+def claim(key):
+    """None if this delivery is the first with `key`, else the first delivery's stored response.
+
+    Stored responses are dicts with 'content' and 'content_type'. While the
+    first delivery is still running the result is {'content': None}.
+    """
+    cache = get_cache()
+    timeout = settings.TWILIO_WEBHOOK_IDEMPOTENCY['IN_FLIGHT_TIMEOUT']
+    if cache.add(key, _PROCESSING, timeout):
+        return None
+    stored = cache.get(key)
+    # None: the first delivery failed and released the key in between; take it over
+    if stored is None and cache.add(key, _PROCESSING, timeout):
+        return None
+    if stored is None or stored == _PROCESSING:
+        return {'content': None}
+    return stored
+
+
+def store(key, content, content_type):
+    """Keep the response to the first delivery of `key` for retries"""
+    get_cache().set(
+        key, {'content': content, 'content_type': content_type},
+        settings.TWILIO_WEBHOOK_IDEMPOTENCY['RESPONSE_TTL']
+    )
+
+
+def release(key):
+    """Forget a claim whose delivery failed, so a retry processes the request"""
+    get_cache().delete(key)
+
+
+def _recording_key(recording_sid):
+    return f"twilio-recording:{recording_sid}"
+
+
+def claim_recording(recording_sid):
+    """Whether to download `recording_sid`: False if it was already saved or another delivery is downloading it"""
+    if not recording_sid or not settings.TWILIO_WEBHOOK_IDEMPOTENCY['ENABLED']:
+        return True
+    if Answer.objects.filter(recording_sid=recording_sid).exclude(audio_file='').exists():
+        return False
+    return get_cache().add(
+        _recording_key(recording_sid), True, settings.TWILIO_WEBHOOK_IDEMPOTENCY['IN_FLIGHT_TIMEOUT']
+    )
+
+
+def release_recording(recording_sid):
+    """Let a later delivery retry a download that failed"""
+    if recording_sid:
+        get_cache().delete(_recording_key(recording_sid))
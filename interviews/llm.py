@@ -0,0 +1,349 @@
+"""Shared gateway for all chat-completion calls.
+
+Every LLM call goes through one `LLMGateway` per process. The gateway owns an
+event loop running on a daemon thread, so synchronous Django code can call
+`chat()` while the requests themselves share one `AsyncOpenAI` client, one
+concurrency limit and one pair of token buckets (requests and tokens per minute).
+"""
+import asyncio
+import concurrent.futures
+import functools
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from .metrics import registry, span
+
+logger = logging.getLogger(__name__)
+
+llm_requests = registry.counter('llm_requests_total', 'LLM calls by operation and outcome')
+llm_retries = registry.counter('llm_retries_total', 'LLM call retries by operation and reason')
+llm_tokens = registry.counter('llm_tokens_total', 'LLM tokens by operation and kind (prompt/completion)')
+llm_latency = registry.histogram('llm_request_seconds', 'LLM call latency including retries and rate limiting')
+
+@functools.lru_cache(maxsize=None)
+def retryable_errors():
+    """Errors worth retrying; `openai` is imported on first call to keep module import cheap"""
+    import openai
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+        asyncio.TimeoutError,
+    )
+
+
+class LLMError(Exception):
+    """Raised when an LLM call fails: a non-retryable backend error, or a transient one after all retries"""
+
+
+class LLMDeadlineExceeded(LLMError):
+    """Raised when a call with a `deadline` has not completed in time"""
+
+
+@dataclass
+class ChatResult:
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    attempts: int = 1
+
+
+def estimate_tokens(messages, max_tokens):
+    """Rough token budget for a call: ~4 characters per prompt token plus the completion limit"""
+    prompt_chars = sum(len(message.get('content', '')) for message in messages)
+    return prompt_chars // 4 + max_tokens
+
+
+class TokenBucket:
+    """Continuously refilled token bucket; `acquire` waits until enough tokens are available"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class OpenAIBackend:
+    """Chat completions through `AsyncOpenAI`; retries are handled by the gateway"""
+
+    # Idle connections stay pooled this long (httpx defaults to 5s), so one
+    # opened by warm_up() is still there for the call it was opened for
+    KEEPALIVE_SECONDS = 60
+
+    def __init__(self, api_key=None, base_url=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.client = None
+
+    def _get_client(self):
+        if self.client is None:
+            # Created on first use so the client binds to the gateway's event loop
+            import httpx
+            import openai
+            self.client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0,
+                http_client=openai.DefaultAsyncHttpxClient(limits=httpx.Limits(
+                    max_connections=1000, max_keepalive_connections=100, keepalive_expiry=self.KEEPALIVE_SECONDS
+                ))
+            )
+        return self.client
+
+    async def warm_up(self, model):
+        """Open a pooled connection (TCP and TLS handshakes) with a cheap model lookup"""
+        try:
+            await self._get_client().models.retrieve(model, timeout=5)
+        except Exception as e:
+            # An error response still leaves the connection in the pool
+            logger.debug("LLM warm-up request failed: %s", e)
+
+    async def complete(self, *, model, messages, max_tokens, temperature, timeout):
+        response = await self._get_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout,
+        )
+        usage = response.usage
+        return ChatResult(
+            content=response.choices[0].message.content or '',
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+        )
+
+
+class FakeBackend:
+    """Offline backend for tests and local runs.
+
+    Returns queued `responses` first (strings, or exceptions to raise), then
+    falls back to `handler(messages)` or a canned answer shaped like what each
+    prompt in `interviews.utils` expects.
+    """
+
+    def __init__(self, responses=None, handler=None, latency=0.0):
+        self.responses = list(responses or [])
+        self.handler = handler
+        self.latency = latency
+        self.calls = []
+
+    async def complete(self, *, model, messages, max_tokens, temperature, timeout):
+        self.calls.append({'model': model, 'messages': messages, 'max_tokens': max_tokens})
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.responses:
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            content = response
+        elif self.handler:
+            content = self.handler(messages)
+        else:
+            content = self.default_response(messages)
+        return ChatResult(
+            content=content,
+            prompt_tokens=estimate_tokens(messages, 0),
+            completion_tokens=len(content) // 4,
+        )
+
+    @staticmethod
+    def default_response(messages):
+        prompt = messages[-1]['content']
+        if 'JSON array of questions' in prompt:
+            return json.dumps([f"Fake interview question {i}?" for i in range(1, 8)])
+        if prompt.startswith('Question:') and '\nAnswer:' in prompt:
+            return 'Can you give a specific example of that?'
+        if '"score"' in prompt:
+            return json.dumps({'score': 7, 'feedback': 'Fake feedback.'})
+        return 'Fake recommendation: proceed to the next round.'
+
+
+BACKENDS = {
+    'openai': lambda: OpenAIBackend(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL),
+    'fake': FakeBackend,
+}
+
+
+class LLMGateway:
+    def __init__(self, backend, requests_per_minute, tokens_per_minute, max_concurrency,
+                 timeout, max_retries, retry_base_delay=0.5, retry_max_delay=20.0):
+        self.backend = backend
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._limits = (requests_per_minute, tokens_per_minute, max_concurrency)
+        self._warmed_at = float('-inf')
+        self._warm_up_lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name='llm-gateway', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        requests_per_minute, tokens_per_minute, max_concurrency = self._limits
+        # Primitives are created on the loop that uses them
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._ready.set()
+        self._loop.run_forever()
+
+    def chat(self, operation, messages, model, max_tokens, temperature, timeout=None, deadline=None):
+        """Blocking chat completion; safe to call from any thread.
+
+        With `deadline` (seconds), the call is cancelled and `LLMDeadlineExceeded`
+        raised if it has not finished in time, including retries and rate limiting.
+        """
+        with span('llm.chat', operation=operation) as current:
+            future = asyncio.run_coroutine_threadsafe(
+                self.achat(operation, messages, model, max_tokens, temperature, timeout),
+                self._loop
+            )
+            try:
+                result = future.result(timeout=deadline)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                llm_requests.inc(operation=operation, outcome='deadline')
+                raise LLMDeadlineExceeded(f"{operation} did not finish within {deadline:.2f}s")
+            current.annotate(
+                model=model, attempts=result.attempts,
+                prompt_tokens=result.prompt_tokens, completion_tokens=result.completion_tokens
+            )
+            return result
+
+    def warm_up(self, model, min_interval=20.0):
+        """Open the backend's connection ahead of a latency-sensitive call to `model`.
+
+        Returns immediately, and sends at most one warm-up request per
+        `min_interval` seconds, so it is cheap to call on every audio frame.
+        """
+        warm_up = getattr(self.backend, 'warm_up', None)
+        if warm_up is None:
+            return
+        now = time.monotonic()
+        with self._warm_up_lock:
+            if now - self._warmed_at < min_interval:
+                return
+            self._warmed_at = now
+        asyncio.run_coroutine_threadsafe(warm_up(model), self._loop)
+
+    async def achat(self, operation, messages, model, max_tokens, temperature, timeout=None):
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    await self.request_bucket.acquire(1)
+                    await self.token_bucket.acquire(estimate_tokens(messages, max_tokens))
+                    async with self.semaphore:
+                        result = await asyncio.wait_for(
+                            self.backend.complete(
+                                model=model,
+                                messages=messages,
+                                max_tokens=max_tokens,
+                                temperature=temperature,
+                                timeout=timeout,
+                            ),
+                            timeout
+                        )
+                    break
+                except retryable_errors() as e:
+                    if attempt > self.max_retries:
+                        raise LLMError(f"{operation} failed after {attempt} attempts: {e}") from e
+                    llm_retries.inc(operation=operation, reason=type(e).__name__)
+                    await asyncio.sleep(self._retry_delay(attempt, e))
+        except Exception as e:
+            llm_requests.inc(operation=operation, outcome='error')
+            llm_latency.observe(time.perf_counter() - started, operation=operation)
+            if isinstance(e, LLMError):
+                raise
+            # Non-retryable backend errors (bad request, authentication, ...) too, so callers catch one type
+            raise LLMError(f"{operation} failed: {type(e).__name__}: {e}") from e
+
+        result.latency = time.perf_counter() - started
+        result.attempts = attempt
+        llm_requests.inc(operation=operation, outcome='success')
+        llm_latency.observe(result.latency, operation=operation)
+        llm_tokens.inc(result.prompt_tokens, operation=operation, kind='prompt')
+        llm_tokens.inc(result.completion_tokens, operation=operation, kind='completion')
+        return result
+
+    def _retry_delay(self, attempt, error):
+        """Exponential backoff with full jitter, honouring Retry-After on 429s"""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.retry_max_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1)))
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def _build_gateway(backend):
+    return LLMGateway(
+        backend=backend,
+        requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        timeout=settings.LLM_TIMEOUT,
+        max_retries=settings.LLM_MAX_RETRIES,
+    )
+
+
+def get_llm_gateway():
+    """Return the process-wide gateway, building it from settings on first use"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = _build_gateway(BACKENDS[settings.LLM_BACKEND]())
+        return _gateway
+
+
+def reset_llm_gateway(backend=None):
+    """Discard the current gateway (e.g. after changing settings in tests), optionally installing `backend`"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is not None:
+            _gateway.close()
+        _gateway = _build_gateway(backend) if backend is not None else None
+        return _gateway
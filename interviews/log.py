@@ -0,0 +1,175 @@
+"""Structured logging: request-scoped context fields and a non-blocking handler.
+
+Modules log through ``logging.getLogger(__name__)`` with lazy ``%s`` arguments,
+so records below the configured level (``LOG_LEVEL`` / ``LOG_LEVELS`` in
+settings) cost a level check and nothing else. Records that pass are handed to
+a queue; a background thread formats and writes them, so request threads never
+block on stdout.
+
+``interview_id``, ``call_sid`` and ``question_id`` are attached to every record
+from a context variable, set per request by ``LogContextMiddleware`` and per
+background task by ``tasks.enqueue``.
+"""
+import contextlib
+import copy
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+CONTEXT_FIELDS = ('interview_id', 'call_sid', 'question_id')
+
+_context = contextvars.ContextVar('log_context', default={})
+
+
+def get_log_context():
+    return _context.get()
+
+
+def bind(**fields):
+    """Add fields to the log context for the rest of the current request or task"""
+    _context.set({**_context.get(), **{k: str(v) for k, v in fields.items() if v is not None}})
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """Add fields to the log context inside a ``with`` block"""
+    token = _context.set({**_context.get(), **{k: str(v) for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records for a background thread that formats and writes them to `stream`.
+
+    The formatter configured on this handler is used by the writer thread.
+    """
+
+    def __init__(self, stream='ext://sys.stderr'):
+        super().__init__(queue.SimpleQueue())
+        if isinstance(stream, str) and stream.startswith('ext://sys.'):
+            import sys
+            stream = getattr(sys, stream[len('ext://sys.'):])
+        self.target = logging.StreamHandler(stream)
+        self.listener = logging.handlers.QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Runs in the logging thread: resolve what can't cross threads (args may be
+        # mutated later, tracebacks hold frames, context vars are per-thread) and
+        # leave the formatting itself to the writer thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            setattr(record, field, context.get(field))
+        record.context = ' '.join(f"{k}={v}" for k, v in context.items())
+        return record
+
+    def close(self):
+        # Called by logging.shutdown() at exit: drain the queue before closing
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.target.close()
+        super().close()
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with the context fields as top-level keys"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        elif record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class LogContextMiddleware:
+    """Bind interview_id/question_id from the URL and Twilio's CallSid to the request's log context"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _context.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            _context.reset(token)
+
+    async def __acall__(self, request):
+        token = _context.set({})
+        try:
+            return await self.get_response(request)
+        finally:
+            _context.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        fields = {field: view_kwargs.get(field) for field in ('interview_id', 'question_id')}
+        # Twilio posts form-encoded webhooks; don't parse other bodies (uploads) here
+        if request.method == 'POST' and request.content_type == 'application/x-www-form-urlencoded':
+            fields['call_sid'] = request.POST.get('CallSid')
+        bind(**fields)
+        return None
+
+
+def logging_config(level='INFO', module_levels=None, fmt='json'):
+    """Django LOGGING dict: app loggers at `level`, overridden per module by `module_levels`"""
+    loggers = {
+        'interviews': {'level': level},
+        'django': {'level': 'INFO'},
+    }
+    for name, module_level in (module_levels or {}).items():
+        loggers.setdefault(name, {})['level'] = module_level
+    return {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {
+            'json': {'()': 'interviews.log.JSONFormatter'},
+            'text': {'format': '%(asctime)s %(levelname)s %(name)s [%(context)s] %(message)s'},
+        },
+        'handlers': {
+            'queue': {'class': 'interviews.log.QueueHandler', 'formatter': fmt},
+        },
+        'root': {'handlers': ['queue'], 'level': 'WARNING'},
+        'loggers': loggers,
+    }
+
+
+def parse_module_levels(value):
+    """'interviews.audio=DEBUG,interviews.telephony=WARNING' -> {module: level}"""
+    levels = {}
+    for item in value.split(','):
+        if '=' in item:
+            name, level = item.split('=', 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
@@ -0,0 +1,123 @@
+import logging
+import os
+import threading
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from interviews.benchmarking import Stopwatch, benchmark_database, format_table, summarize
+from interviews.log import JSONFormatter, QueueHandler, log_context
+from interviews.models import Candidate, Interview, JobDescription, QuestionSet
+
+QUESTIONS = [f"Tell me about a project where you used skill number {n}." for n in range(1, 6)]
+
+
+def drained_pipe():
+    """A writable stream whose reader discards everything, like stdout piped to a process manager"""
+    read_fd, write_fd = os.pipe()
+
+    def drain():
+        with os.fdopen(read_fd, 'rb') as reader:
+            while reader.read(65536):
+                pass
+
+    threading.Thread(target=drain, daemon=True).start()
+    return os.fdopen(write_fd, 'w', buffering=1)
+
+
+class Command(BaseCommand):
+    help = "Compare per-call logging cost and Twilio webhook latency under print-style and queued logging"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=200, help='Webhook round trips per configuration')
+        parser.add_argument('--calls', type=int, default=20000, help='Log calls per call-cost measurement')
+
+    def handle(self, *args, **options):
+        stream = drained_pipe()
+        app_logger = logging.getLogger('interviews')
+        saved = (app_logger.handlers, app_logger.level, app_logger.propagate)
+
+        def configure(handler, level):
+            app_logger.handlers = [handler] if handler else []
+            app_logger.setLevel(level)
+            app_logger.propagate = False
+
+        sync_handler = logging.StreamHandler(stream)
+        sync_handler.setFormatter(JSONFormatter())
+        queue_handler = QueueHandler(stream)
+        queue_handler.setFormatter(JSONFormatter())
+        configurations = [
+            # Every line written on the request thread, as print() did
+            ('synchronous, DEBUG', sync_handler, logging.DEBUG),
+            ('queued, DEBUG', queue_handler, logging.DEBUG),
+            ('queued, INFO (default)', queue_handler, logging.INFO),
+        ]
+
+        try:
+            self.stdout.write(format_table(
+                self.call_costs(stream, configure, configurations, options['calls']),
+                ['call', 'configuration', 'per_call_us']
+            ))
+            self.stdout.write('')
+            with benchmark_database(), override_settings(
+                TWILIO_MEDIA_STREAMS={'ENABLED': False}, ADAPTIVE_FOLLOWUPS_ENABLED=False
+            ):
+                rows = self.webhook_latency(configure, configurations, options['runs'])
+            self.stdout.write(format_table(rows, ['webhook', 'configuration', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms']))
+        finally:
+            app_logger.handlers, app_logger.level, app_logger.propagate = saved
+            queue_handler.close()
+
+    def call_costs(self, stream, configure, configurations, calls):
+        logger = logging.getLogger('interviews.views')
+        recording_url = 'https://api.twilio.com/2010-04-01/Accounts/AC0/Recordings/RE0'
+        rows = []
+
+        stopwatch = Stopwatch()
+        with stopwatch:
+            for _ in range(calls):
+                print(f"Recording URL: {recording_url}", file=stream)
+        rows.append({'call': 'print()', 'configuration': 'stdout', 'per_call_us': stopwatch.samples[0] / calls * 1e6})
+
+        with log_context(interview_id='0' * 32, call_sid='CA' + '0' * 32):
+            for name, handler, level in configurations:
+                configure(handler, level)
+                stopwatch = Stopwatch()
+                with stopwatch:
+                    for _ in range(calls):
+                        logger.debug("Recording %s", recording_url)
+                rows.append({'call': 'logger.debug()', 'configuration': name,
+                             'per_call_us': stopwatch.samples[0] / calls * 1e6})
+        return rows
+
+    def webhook_latency(self, configure, configurations, runs):
+        job_description = JobDescription.objects.create(
+            title='Backend Engineer', description='Benchmark job description', questions=QUESTIONS
+        )
+        question_set = QuestionSet.objects.create_for_job_description(job_description, QUESTIONS)
+        candidate = Candidate.objects.create(name='Benchmark Candidate', email='bench@example.com', phone='+15550000000')
+        interview = Interview.objects.create(
+            job_description=job_description, candidate=candidate, question_set=question_set
+        )
+        question = question_set.questions.first()
+
+        client = Client()
+        body = urlencode({'CallSid': 'CA' + '0' * 32, 'RecordingDuration': '12'})
+        webhooks = [
+            ('twiml', f'/api/webhook/interview/{interview.id}/twiml/'),
+            ('answer', f'/api/webhook/interview/{interview.id}/answer/{question.id}/'),
+        ]
+        rows = []
+        for webhook, url in webhooks:
+            for name, handler, level in configurations:
+                configure(handler, level)
+                for _ in range(10):  # warm up
+                    client.post(url, body, content_type='application/x-www-form-urlencoded')
+                stopwatch = Stopwatch()
+                for _ in range(runs):
+                    with stopwatch:
+                        client.post(url, body, content_type='application/x-www-form-urlencoded')
+                rows.append({'webhook': webhook, 'configuration': name, **summarize(stopwatch.samples)})
+        return rows
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from django.db.models.functions import Length
+
+from interviews.benchmarking import Stopwatch, benchmark_database, format_table, summarize
+from interviews.models import JobDescription, QuestionSet, Candidate, Interview, Question
+
+
+class Command(BaseCommand):
+    help = "Compare question storage and interview insert time: copied rows vs. shared question sets"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interviews', type=int, default=1000, help='Interviews to create per strategy')
+        parser.add_argument('--questions', type=int, default=7, help='Questions per job description')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            rows = [
+                self.run_strategy('copied rows', self.create_with_copied_questions, options),
+                self.run_strategy('shared set', self.create_with_question_set, options),
+            ]
+        self.stdout.write(format_table(rows, [
+            'strategy', 'interviews', 'question_rows', 'question_bytes',
+            'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'total_ms',
+        ]))
+
+    def run_strategy(self, name, create_interview, options):
+        Question.objects.all().delete()
+        Interview.objects.all().delete()
+        QuestionSet.objects.all().delete()
+
+        questions = [
+            f"Question {i}: describe a project where you applied the skills listed in this job description."
+            for i in range(1, options['questions'] + 1)
+        ]
+        job_description = JobDescription.objects.create(
+            title='Benchmark role', description='Benchmark description', questions=questions
+        )
+        QuestionSet.objects.create_for_job_description(job_description, questions)
+        candidate = Candidate.objects.create(name='Benchmark', email='bench@example.com', phone='+10000000000')
+
+        stopwatch = Stopwatch()
+        for _ in range(options['interviews']):
+            with stopwatch:
+                create_interview(job_description, candidate)
+
+        question_bytes = Question.objects.aggregate(total=Sum(Length('question_text')))['total'] or 0
+        return {
+            'strategy': name,
+            'interviews': options['interviews'],
+            'question_rows': Question.objects.count(),
+            'question_bytes': question_bytes,
+            **summarize(stopwatch.samples),
+        }
+
+    @staticmethod
+    def create_with_copied_questions(job_description, candidate):
+        """The previous behaviour: one Question row per JD question per interview"""
+        interview = Interview.objects.create(job_description=job_description, candidate=candidate)
+        for i, question_text in enumerate(job_description.questions, 1):
+            Question.objects.create(interview=interview, question_text=question_text, question_number=i)
+        return interview
+
+    @staticmethod
+    def create_with_question_set(job_description, candidate):
+        return Interview.objects.create(
+            job_description=job_description,
+            candidate=candidate,
+            question_set=job_description.get_current_question_set()
+        )
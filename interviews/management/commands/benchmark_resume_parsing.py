@@ -0,0 +1,126 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from interviews.benchmarking import Stopwatch, format_table, summarize
+from interviews.clients import get_pdf_reader
+from interviews.resume import extract_pdf_text, get_pool, parse_resume, worker_count
+
+RESUME_LINES = [
+    "Senior Software Engineer - Example Corp (2019 - present)",
+    "Designed and operated Python/Django services handling 20k requests per minute.",
+    "Led migration of batch jobs to an event-driven pipeline, cutting latency by 60%.",
+    "Mentored five engineers; ran design reviews and on-call rotations.",
+    "Skills: Python, Django, PostgreSQL, Redis, Celery, AWS, Docker, Kubernetes.",
+]
+
+
+def _pdf_string(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_text_pdf(path, page_count, lines_per_page=45):
+    """Write a plain-text PDF of `page_count` resume-like pages (no third-party PDF writer needed)"""
+    objects = []  # object bodies; object n is objects[n - 1]
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for page_number in range(page_count):
+        lines = [f"Page {page_number + 1}"] + [
+            RESUME_LINES[i % len(RESUME_LINES)] for i in range(lines_per_page)
+        ]
+        stream = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({_pdf_string(line)}) Tj T*" for line in lines) + " ET"
+        content = add(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode())
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R >>".encode()
+        ))
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages} 0 R >>".encode()
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[pages - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+def concatenate_pages(data):
+    """The previous implementation: in-process, `text += page.extract_text()`"""
+    import io
+    text = ""
+    for page in get_pdf_reader(io.BytesIO(data)).pages:
+        text += page.extract_text()
+    return text.strip()
+
+
+class Command(BaseCommand):
+    help = "Benchmark resume parsing on a generated corpus of small and long PDFs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', default='2,50', help='Comma-separated page counts for the corpus')
+        parser.add_argument('--runs', type=int, default=5, help='Parses per document and strategy')
+        parser.add_argument('--corpus-dir', help='Keep the generated PDFs in this directory')
+
+    def handle(self, *args, **options):
+        corpus_dir = options['corpus_dir'] or tempfile.mkdtemp(prefix='resume-corpus-')
+        os.makedirs(corpus_dir, exist_ok=True)
+        # No page limit here, so long documents are measured in full
+        parse_options = dict(settings.RESUME_PARSING, MAX_PAGES=10 ** 6, TIMEOUT=600)
+
+        corpus = []
+        for page_count in (int(p) for p in options['pages'].split(',')):
+            path = os.path.join(corpus_dir, f'resume_{page_count}_pages.pdf')
+            write_text_pdf(path, page_count)
+            with open(path, 'rb') as f:
+                corpus.append((page_count, f.read()))
+        self.stdout.write(f"Corpus written to {corpus_dir}")
+
+        # Start the worker processes before timing anything
+        list(get_pool().map(int, range(worker_count(parse_options))))
+
+        with override_settings(RESUME_PARSING=parse_options):
+            rows = self.run_corpus(corpus, parse_options, options['runs'])
+        self.stdout.write(format_table(rows, ['pages', 'bytes', 'strategy', 'chars', 'mean_ms', 'p50_ms', 'p95_ms']))
+
+    def run_corpus(self, corpus, parse_options, runs):
+        rows = []
+        for page_count, data in corpus:
+            strategies = [
+                ('concatenate (old)', lambda: concatenate_pages(data)),
+                ('page pool', lambda: extract_pdf_text(data, parse_options)),
+                ('cached', lambda: parse_resume(SimpleUploadedFile('resume.pdf', data))),
+            ]
+            cache.clear()
+            parse_resume(SimpleUploadedFile('resume.pdf', data))  # fill the cache for the 'cached' strategy
+            for name, parse in strategies:
+                stopwatch = Stopwatch()
+                for _ in range(runs):
+                    with stopwatch:
+                        text = parse()
+                rows.append({
+                    'pages': page_count,
+                    'bytes': len(data),
+                    'strategy': name,
+                    'chars': len(text),
+                    **summarize(stopwatch.samples),
+                })
+        return rows
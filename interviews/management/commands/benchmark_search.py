@@ -0,0 +1,69 @@
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from interviews.benchmarking import Stopwatch, benchmark_database, format_table, summarize
+from interviews.models import SearchDocument
+from interviews.search import search
+
+VOCABULARY = (
+    "python django postgres redis kafka docker kubernetes aws react typescript golang rust java spring "
+    "microservices latency throughput scaling migration testing deployment monitoring incident mentoring "
+    "leadership architecture design review api database query index cache queue pipeline analytics "
+    "machine learning model training customer stakeholder roadmap agile sprint delivery budget hiring"
+).split()
+# Filler words make up most of the text, so the vocabulary above has realistic selectivity
+FILLER = [f"w{i}" for i in range(20000)]
+
+
+def fake_text(rng, words):
+    return " ".join(rng.choice(VOCABULARY) if rng.random() < 0.1 else rng.choice(FILLER) for _ in range(words))
+
+
+class Command(BaseCommand):
+    help = "Measure /api/search/ query latency against a throwaway index of N documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Documents to index')
+        parser.add_argument('--words', type=int, default=60, help='Words per document')
+        parser.add_argument('--runs', type=int, default=20, help='Executions per query')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        kinds = [kind for kind, _label in SearchDocument.KIND_CHOICES]
+        with benchmark_database():
+            started = time.perf_counter()
+            with transaction.atomic():
+                for offset in range(0, options['rows'], 5000):
+                    SearchDocument.objects.bulk_create([
+                        SearchDocument(
+                            kind=rng.choice(kinds), object_id=uuid.uuid4(),
+                            title=fake_text(rng, 6), body=fake_text(rng, options['words'])
+                        )
+                        for _ in range(min(5000, options['rows'] - offset))
+                    ])
+            self.stdout.write(
+                f"Indexed {options['rows']} documents on {connection.vendor} in {time.perf_counter() - started:.1f}s"
+            )
+
+            queries = [
+                ('common word', 'python', None),
+                ('two words', 'kafka latency', None),
+                ('rare filler word', 'w12345', None),
+                ('prefix', 'kuber', None),
+                ('type filter', 'django', 'answer'),
+                ('deep page', 'python', None, 50),
+                ('past rank window', 'python', None, 300),
+            ]
+            rows = []
+            for name, query, kind, *page in queries:
+                stopwatch = Stopwatch()
+                for _ in range(options['runs']):
+                    with stopwatch:
+                        results, has_next = search(query, kind=kind, page=page[0] if page else 1)
+                rows.append({'query': name, 'q': query, 'hits': len(results), **summarize(stopwatch.samples)})
+
+        self.stdout.write(format_table(rows, ['query', 'q', 'hits', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms']))
@@ -0,0 +1,61 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interviews.benchmarking import format_table
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+WATCHED_PACKAGES = ['interviews', 'openai', 'twilio', 'pydub', 'PyPDF2', 'docx', 'requests']
+
+
+class Command(BaseCommand):
+    help = "Measure interpreter import time of `manage.py check` using python -X importtime"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Subprocess runs; the fastest is reported')
+        parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports to list')
+
+    def handle(self, *args, **options):
+        runs = [self.measure() for _ in range(options['runs'])]
+        best = min(runs, key=lambda run: run['total_us'])
+
+        self.stdout.write(f"Total import time (best of {options['runs']}): {best['total_us'] / 1000:.1f} ms\n")
+        self.stdout.write(format_table(
+            [{'package': name, 'cumulative_ms': best['packages'].get(name, 0) / 1000} for name in WATCHED_PACKAGES],
+            ['package', 'cumulative_ms']
+        ))
+        self.stdout.write('\nSlowest top-level imports:')
+        self.stdout.write(format_table(
+            [{'module': name, 'cumulative_ms': us / 1000} for name, us in best['top_level'][:options['top']]],
+            ['module', 'cumulative_ms']
+        ))
+
+    def measure(self):
+        manage_py = Path(settings.BASE_DIR) / 'manage.py'
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', str(manage_py), 'check'],
+            capture_output=True, text=True, cwd=settings.BASE_DIR
+        )
+        total_us = 0
+        top_level = []
+        packages = {}
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            cumulative = int(match.group(2))
+            depth = len(match.group(3))
+            module = match.group(4)
+            if depth == 1:
+                total_us += cumulative
+                top_level.append((module, cumulative))
+            # The outermost import of a package carries its full cumulative cost
+            root = module.split('.')[0]
+            if root in WATCHED_PACKAGES:
+                packages[root] = max(packages.get(root, 0), cumulative)
+        top_level.sort(key=lambda item: item[1], reverse=True)
+        return {'total_us': total_us, 'top_level': top_level, 'packages': packages}
@@ -0,0 +1,110 @@
+import math
+import os
+import struct
+import tempfile
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interviews.benchmarking import format_table, summarize
+from interviews.transcription import TranscriptionError, get_transcription_backend
+
+
+def audio_duration(path):
+    """Duration in seconds; WAV is read natively, anything else through pydub"""
+    if path.lower().endswith('.wav'):
+        with wave.open(path, 'rb') as f:
+            return f.getnframes() / f.getframerate()
+    from interviews.clients import get_audio_segment
+    return len(get_audio_segment().from_file(path)) / 1000
+
+
+def write_tone(path, seconds, frame_rate=8000):
+    """Write a mono 16-bit tone, the shape of a Twilio recording, for runs without sample audio"""
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(frame_rate)
+        f.writeframes(b''.join(
+            struct.pack('<h', int(8000 * math.sin(2 * math.pi * 440 * i / frame_rate)))
+            for i in range(int(seconds * frame_rate))
+        ))
+
+
+class Command(BaseCommand):
+    help = "Compare transcription throughput of backends (e.g. local vs. assemblyai) on the same audio"
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help='Audio files to transcribe')
+        parser.add_argument('--backends', default='local,assemblyai', help='Comma-separated backend names')
+        parser.add_argument('--concurrency', type=int, default=4, help='Files submitted in parallel')
+        parser.add_argument('--generate', type=int, default=0, help='Generate N tone WAVs when no files are given')
+        parser.add_argument('--seconds', type=float, default=30, help='Length of generated WAVs')
+
+    def handle(self, *args, **options):
+        files = list(options['files'])
+        tmpdir = None
+        if not files:
+            if not options['generate']:
+                raise CommandError('Pass audio files or --generate N')
+            tmpdir = tempfile.TemporaryDirectory()
+            for i in range(options['generate']):
+                path = os.path.join(tmpdir.name, f'tone_{i}.wav')
+                write_tone(path, options['seconds'])
+                files.append(path)
+
+        audio_seconds = sum(audio_duration(path) for path in files)
+        rows = []
+        try:
+            for name in options['backends'].split(','):
+                rows.append(self.run_backend(name.strip(), files, audio_seconds, options['concurrency']))
+        finally:
+            if tmpdir:
+                tmpdir.cleanup()
+            for name in options['backends'].split(','):
+                close = getattr(get_transcription_backend(name.strip()), 'close', None)
+                if close:
+                    close()
+
+        self.stdout.write(format_table(rows, [
+            'backend', 'files', 'errors', 'wall_s', 'files_per_s', 'audio_x_realtime', 'p50_ms', 'p95_ms',
+        ]))
+
+    def run_backend(self, name, files, audio_seconds, concurrency):
+        backend = get_transcription_backend(name)
+        ok, message = backend.check_connection()
+        if not ok:
+            self.stderr.write(f"{name}: {message}")
+
+        latencies = []
+        errors = 0
+
+        def transcribe(path):
+            started = time.perf_counter()
+            backend.transcribe_file(path)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(transcribe, path) for path in files]
+            for future in futures:
+                try:
+                    latencies.append(future.result())
+                except TranscriptionError as e:
+                    errors += 1
+                    self.stderr.write(f"{name}: {e}")
+        wall = time.perf_counter() - started
+
+        stats = summarize(latencies)
+        return {
+            'backend': name,
+            'files': len(files),
+            'errors': errors,
+            'wall_s': wall,
+            'files_per_s': (len(files) - errors) / wall if wall else 0.0,
+            'audio_x_realtime': audio_seconds / wall if wall and not errors else 0.0,
+            'p50_ms': stats['p50_ms'],
+            'p95_ms': stats['p95_ms'],
+        }
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from interviews.webhooks import WebhookDispatcher
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver outbound webhook events from the outbox; runs until interrupted, "
+        "or with --once delivers what is due and exits (for cron or scheduled tasks)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Deliver the events due now and exit')
+
+    def handle(self, *args, **options):
+        dispatcher = WebhookDispatcher()
+        if options['once']:
+            batches = dispatcher.run_once()
+            self.stdout.write(f"Sent {batches} webhook batches")
+            return
+        self.stdout.write("Dispatching webhooks; Ctrl-C to stop")
+        self.stdout.flush()
+        try:
+            dispatcher.run_forever()
+        except KeyboardInterrupt:
+            pass
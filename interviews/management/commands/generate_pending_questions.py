@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from interviews.models import JobDescription
+from interviews.tasks import generate_job_description_questions
+
+
+class Command(BaseCommand):
+    help = "Generate questions for job descriptions left pending (e.g. after a worker restart)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--include-failed', action='store_true', help='Also retry failed generations')
+
+    def handle(self, *args, **options):
+        statuses = ['pending', 'failed'] if options['include_failed'] else ['pending']
+        job_descriptions = JobDescription.objects.filter(questions_status__in=statuses).order_by('created_at')
+        for job_description in job_descriptions:
+            generate_job_description_questions(job_description.id)
+            job_description.refresh_from_db(fields=['questions_status'])
+            self.stdout.write(f"{job_description.id}: {job_description.questions_status}")
@@ -0,0 +1,360 @@
+import contextlib
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from interviews import transcription
+from interviews.benchmarking import benchmark_database, format_table, summarize
+from interviews.llm import FakeBackend, OpenAIBackend, reset_llm_gateway
+from interviews.models import Answer, Candidate, Interview, JobDescription, QuestionSet
+from interviews.testing import FakeAssemblyAI, FakeOpenAI, FakeTwilio, Latency
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'benchmarks', 'webhooks.json')
+FORM = 'application/x-www-form-urlencoded'
+QUESTIONS = [
+    "Tell me about a system you designed end to end.",
+    "How do you debug a production incident?",
+    "Describe a time you disagreed with a teammate.",
+    "How do you decide what to test?",
+    "What would you improve in your last project?",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate concurrent interviews against the TwiML, answer and status webhooks and report "
+        "latency, throughput and queries per endpoint, compared with a stored baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interviews', type=int, default=20, help='Interviews (simulated calls) in total')
+        parser.add_argument('--concurrency', type=int, default=10, help='Calls in progress at the same time')
+        parser.add_argument('--questions', type=int, default=5, help='Questions per interview')
+        parser.add_argument('--answer-seconds', type=float, nargs=2, default=(10.0, 60.0), metavar=('MIN', 'MAX'),
+                            help='Range of simulated answer lengths (call time between webhooks)')
+        parser.add_argument('--time-scale', type=float, default=0.005,
+                            help='Multiplier on simulated call time (1 = real time)')
+        parser.add_argument('--providers', choices=['stub', 'http'], default='stub',
+                            help='stub: in-process fake LLM and transcription; '
+                                 'http: fake OpenAI and AssemblyAI servers from interviews.testing')
+        parser.add_argument('--llm-latency', type=float, default=0.2, help='Seconds per fake LLM call')
+        parser.add_argument('--transcription-latency', type=float, default=0.5, help='Seconds per fake transcription')
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='With --providers http, fraction of provider requests failing with 500')
+        parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                            help='With --providers http, fraction of provider requests failing with 429')
+        parser.add_argument('--retry-rate', type=float, default=0.0,
+                            help='Fraction of answer webhooks Twilio delivers twice, the retry arriving '
+                                 'while the first delivery is still running')
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+        parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs to make; latencies are compared using the median across runs')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p95 slowdown over the baseline, as a fraction')
+        parser.add_argument('--slack-ms', type=float, default=50.0,
+                            help='p95 slowdowns smaller than this are never regressions (scheduling noise)')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError("--repeat must be at least 1")
+        runs = []
+        for n in range(options['repeat']):
+            if options['repeat'] > 1:
+                self.stdout.write(f"Run {n + 1}/{options['repeat']}")
+            runs.append(self.run(dict(options, seed=options['seed'] + n)))
+        results = runs[0] if len(runs) == 1 else self.combine(runs, options)
+        self.compare(results, options)
+
+    def run(self, options):
+        """Simulate the calls once on a fresh database and return the reported results"""
+        rng = random.Random(options['seed'])
+        media_root = tempfile.mkdtemp(prefix='load-test-media-')
+        with contextlib.ExitStack() as stack:
+            twilio_api = stack.enter_context(FakeTwilio(seed=options['seed']))
+            transcription_options, llm_backend = self.providers(stack, options)
+            stack.enter_context(override_settings(
+                MEDIA_ROOT=media_root,
+                TRANSCRIPTION=dict(settings.TRANSCRIPTION, CHUNK_THRESHOLD_SECONDS=0, **transcription_options),
+                TWILIO_MEDIA_STREAMS=dict(settings.TWILIO_MEDIA_STREAMS, ENABLED=False),
+                ADAPTIVE_FOLLOWUPS_ENABLED=False,
+                TTS=dict(settings.TTS, PRERENDER_ENABLED=False),
+                BACKGROUND_TASKS_EAGER=False,
+            ))
+            stack.enter_context(benchmark_database(on_disk=True))
+            transcription.reset_transcription_backends()
+            reset_llm_gateway(llm_backend)
+            try:
+                interview_ids = self.create_interviews(options['interviews'], options['questions'])
+                samples, wall_time = self.run_calls(interview_ids, twilio_api, rng, options)
+                downloads = twilio_api.count('GET', r'/Recordings/')
+                drain_time, unfinished = self.wait_for_evaluations(interview_ids)
+            finally:
+                reset_llm_gateway()
+                transcription.reset_transcription_backends()
+                shutil.rmtree(media_root, ignore_errors=True)
+
+        return self.report(samples, wall_time, drain_time, unfinished, downloads, options)
+
+    def providers(self, stack, options):
+        """Transcription settings and LLM backend for --providers, starting fake servers on `stack`"""
+        if options['providers'] == 'stub':
+            return (
+                {'BACKEND': 'stub', 'STUB_LATENCY': options['transcription_latency']},
+                FakeBackend(latency=options['llm_latency']),
+            )
+        faults = {
+            'error_rate': options['error_rate'],
+            'rate_limit_rate': options['rate_limit_rate'],
+            'seed': options['seed'],
+        }
+        openai_api = stack.enter_context(FakeOpenAI(latency=Latency(options['llm_latency'], 0.3), **faults))
+        assemblyai_api = stack.enter_context(FakeAssemblyAI(
+            latency=Latency(0.02), processing_time=Latency(options['transcription_latency'], 0.3), **faults
+        ))
+        stack.callback(lambda: self.stdout.write("Provider requests by status: " + ", ".join(
+            f"{server.name} " + " ".join(
+                f"{status}x{server.count(status=status)}" for status in sorted({s for *_, s in server.requests})
+            ) for server in (openai_api, assemblyai_api)
+        )))
+        return (
+            {
+                'BACKEND': 'assemblyai',
+                'ASSEMBLYAI_API_KEY': 'fake',
+                'ASSEMBLYAI_BASE_URL': assemblyai_api.base_url,
+                'POLL_INTERVAL': 0.1,
+            },
+            OpenAIBackend(api_key='fake', base_url=openai_api.base_url),
+        )
+
+    def create_interviews(self, count, question_count):
+        job_description = JobDescription.objects.create(
+            title='Load test', description='Load test job description', questions=QUESTIONS[:question_count]
+        )
+        question_set = QuestionSet.objects.create_for_job_description(job_description, QUESTIONS[:question_count])
+        interview_ids = []
+        for n in range(count):
+            candidate = Candidate.objects.create(
+                name=f'Candidate {n}', email=f'candidate{n}@example.com', phone=f'+1555{n:07d}',
+                resume_text='Python engineer with distributed systems experience.'
+            )
+            interview = Interview.objects.create(
+                job_description=job_description, candidate=candidate, question_set=question_set,
+                status='in_progress'
+            )
+            interview_ids.append(interview.id)
+        return interview_ids
+
+    def run_calls(self, interview_ids, twilio_api, rng, options):
+        samples = defaultdict(list)  # endpoint -> [(seconds, queries, status)]
+        samples_lock = threading.Lock()
+        # Per-call random streams, so results don't depend on thread scheduling
+        seeds = [rng.random() for _ in interview_ids]
+
+        def call(interview_id, seed):
+            call_rng = random.Random(seed)
+            client = Client()
+            call_sid = 'CA' + interview_id.hex
+            question_ids = list(
+                Interview.objects.get(id=interview_id).questions.values_list('id', flat=True)
+            )
+
+            def post(endpoint, url, data, client=client):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = client.post(url, urlencode(data), content_type=FORM)
+                    seconds = time.perf_counter() - started
+                with samples_lock:
+                    samples[endpoint].append((seconds, len(queries), response.status_code))
+            
+            def post_retried(url, data):
+                try:
+                    post('answer_retry', url, data, Client())
+                finally:
+                    connection.close()
+
+            def pause(low, high):
+                time.sleep(call_rng.uniform(low, high) * options['time_scale'])
+
+            try:
+                pause(1, 3)  # ringing
+                post('twiml', f'/api/webhook/interview/{interview_id}/twiml/', {'CallSid': call_sid})
+                for n, question_id in enumerate(question_ids):
+                    duration = call_rng.uniform(*options['answer_seconds'])
+                    pause(duration, duration)
+                    recording_sid = f'RE{interview_id.hex[:24]}{n:08d}'
+                    url = f'/api/webhook/interview/{interview_id}/answer/{question_id}/'
+                    data = {
+                        'CallSid': call_sid,
+                        'RecordingSid': recording_sid,
+                        'RecordingUrl': twilio_api.recording_url(recording_sid),
+                        'RecordingDuration': str(int(duration)),
+                    }
+                    retry = None
+                    if call_rng.random() < options['retry_rate']:
+                        retry = threading.Thread(target=post_retried, args=(url, data))
+                        retry.start()
+                    post('answer', url, data)
+                    if retry:
+                        retry.join()
+                pause(1, 2)  # goodbye and hang-up
+                post('status', f'/api/webhook/interview/{interview_id}/status/', {
+                    'CallSid': call_sid, 'CallStatus': 'completed', 'CallDuration': '300',
+                })
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            for future in [executor.submit(call, i, seed) for i, seed in zip(interview_ids, seeds)]:
+                future.result()
+        return samples, time.perf_counter() - started
+
+    def wait_for_evaluations(self, interview_ids, stall_timeout=30):
+        """Wait for background scoring and recommendations after the last call.
+
+        Returns (seconds, unfinished); gives up once nothing has progressed for
+        `stall_timeout` seconds, since failed tasks are not retried.
+        """
+        started = last_progress = time.perf_counter()
+        previous = None
+        while True:
+            unfinished = (
+                Answer.objects.filter(interview_id__in=interview_ids, score__isnull=True).count()
+                + Interview.objects.filter(id__in=interview_ids, recommendation='').count()
+            )
+            now = time.perf_counter()
+            if unfinished == 0 or now - last_progress > stall_timeout:
+                return now - started, unfinished
+            if unfinished != previous:
+                previous, last_progress = unfinished, now
+            time.sleep(0.05)
+
+    def report(self, samples, wall_time, drain_time, unfinished, downloads, options):
+        results = {}
+        rows = []
+        for endpoint in ('twiml', 'answer', 'answer_retry', 'status'):
+            entries = samples.get(endpoint, [])
+            if not entries:
+                continue
+            stats = summarize([seconds for seconds, _queries, _status in entries])
+            queries = [q for _seconds, q, _status in entries]
+            result = {
+                'requests': len(entries),
+                'errors': sum(1 for *_rest, status in entries if status >= 400),
+                'throughput_rps': round(len(entries) / wall_time, 2),
+                'p50_ms': round(stats['p50_ms'], 2),
+                'p95_ms': round(stats['p95_ms'], 2),
+                'p99_ms': round(stats['p99_ms'], 2),
+                'queries_mean': round(sum(queries) / len(queries), 2),
+                'queries_max': max(queries),
+            }
+            results[endpoint] = result
+            rows.append({'endpoint': endpoint, **result})
+
+        self.stdout.write(
+            f"{options['interviews']} interviews x {options['questions']} questions, "
+            f"concurrency {options['concurrency']}: calls took {wall_time:.1f}s, "
+            f"evaluations settled {drain_time:.1f}s after the last call; "
+            f"{downloads} recordings downloaded for {len(samples.get('answer', []))} answers"
+        )
+        if unfinished:
+            self.stdout.write(self.style.WARNING(
+                f"{unfinished} answer scores or recommendations never completed; see the error log"
+            ))
+        self.stdout.write(format_table(rows, [
+            'endpoint', 'requests', 'errors', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms',
+            'queries_mean', 'queries_max',
+        ]))
+        return {
+            'config': {key: options[key] for key in (
+                'interviews', 'concurrency', 'questions', 'time_scale', 'providers', 'llm_latency',
+                'transcription_latency', 'error_rate', 'rate_limit_rate', 'retry_rate', 'repeat',
+            )},
+            'endpoints': results,
+            'evaluation_drain_seconds': round(drain_time, 2),
+            'unfinished_evaluations': unfinished,
+        }
+
+    def combine(self, runs, options):
+        """One result per endpoint: median latencies and throughput, worst query counts and errors"""
+        endpoints = {}
+        rows = []
+        for endpoint in runs[0]['endpoints']:
+            entries = [run['endpoints'][endpoint] for run in runs if endpoint in run['endpoints']]
+            combined = {
+                key: round(statistics.median(entry[key] for entry in entries), 2)
+                for key in ('requests', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_mean')
+            }
+            combined['errors'] = max(entry['errors'] for entry in entries)
+            combined['queries_max'] = max(entry['queries_max'] for entry in entries)
+            endpoints[endpoint] = combined
+            rows.append({'endpoint': endpoint, **combined})
+
+        self.stdout.write(f"Median of {len(runs)} runs:")
+        self.stdout.write(format_table(rows, [
+            'endpoint', 'requests', 'errors', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms',
+            'queries_mean', 'queries_max',
+        ]))
+        return {
+            'config': runs[0]['config'],
+            'endpoints': endpoints,
+            'evaluation_drain_seconds': round(statistics.median(run['evaluation_drain_seconds'] for run in runs), 2),
+            'unfinished_evaluations': max(run['unfinished_evaluations'] for run in runs),
+        }
+
+    def compare(self, results, options):
+        path = options['baseline']
+        if options['save_baseline']:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(f"Baseline saved to {path}")
+            return
+        if not os.path.exists(path):
+            self.stdout.write(f"No baseline at {path}; run with --save-baseline to create one")
+            return
+
+        with open(path) as f:
+            baseline = json.load(f)
+        if baseline.get('config') != results['config']:
+            self.stdout.write(self.style.WARNING("Baseline was recorded with different options; comparison is approximate"))
+
+        regressions = []
+        for endpoint, current in results['endpoints'].items():
+            previous = baseline['endpoints'].get(endpoint)
+            if previous is None:
+                continue
+            allowed = max(previous['p95_ms'] * (1 + options['tolerance']), previous['p95_ms'] + options['slack_ms'])
+            if current['p95_ms'] > allowed:
+                regressions.append(f"{endpoint}: p95 {current['p95_ms']:.1f}ms vs baseline {previous['p95_ms']:.1f}ms")
+            if current['queries_max'] > previous['queries_max']:
+                regressions.append(
+                    f"{endpoint}: up to {current['queries_max']} queries vs baseline {previous['queries_max']}"
+                )
+            if current['errors'] > previous['errors']:
+                regressions.append(f"{endpoint}: {current['errors']} errors vs baseline {previous['errors']}")
+        if results['unfinished_evaluations'] > baseline.get('unfinished_evaluations', 0):
+            regressions.append(
+                f"{results['unfinished_evaluations']} unfinished evaluations vs baseline "
+                f"{baseline.get('unfinished_evaluations', 0)}"
+            )
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path}"))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from interviews.models import Answer, Candidate, JobDescription, SearchDocument
+from interviews.search import INDEXED_MODELS, document_fields
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from answers, candidates and job descriptions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        querysets = [
+            Answer.objects.select_related('question').exclude(transcript=''),
+            Candidate.objects.all(),
+            JobDescription.objects.all(),
+        ]
+        with transaction.atomic():
+            SearchDocument.objects.all().delete()
+            for queryset in querysets:
+                kind, _fields = INDEXED_MODELS[queryset.model]
+                batch = []
+                count = 0
+                for instance in queryset.iterator(chunk_size=batch_size):
+                    title, body = document_fields(instance)
+                    batch.append(SearchDocument(kind=kind, object_id=instance.pk, title=title, body=body))
+                    if len(batch) >= batch_size:
+                        SearchDocument.objects.bulk_create(batch)
+                        count += len(batch)
+                        batch = []
+                SearchDocument.objects.bulk_create(batch)
+                count += len(batch)
+                self.stdout.write(f"Indexed {count} {kind} documents")
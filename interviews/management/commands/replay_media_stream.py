@@ -0,0 +1,106 @@
+import asyncio
+import base64
+import json
+import time
+import wave
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from interviews.media_streams import media_stream_app
+from interviews.transcription.streaming import (
+    FRAME_MS, SAMPLE_RATE, claim_stream_transcript, close_stream_session, pcm16_to_ulaw
+)
+
+
+def frames_from_wav(path, call_sid):
+    """Build the Twilio message sequence for a WAV file, as if it had been spoken on a call"""
+    with wave.open(path, 'rb') as f:
+        native = f.getnchannels() == 1 and f.getsampwidth() == 2 and f.getframerate() == SAMPLE_RATE
+        pcm16 = f.readframes(f.getnframes()) if native else None
+    if pcm16 is None:
+        from interviews.clients import get_audio_segment
+        sound = get_audio_segment().from_file(path).set_channels(1).set_frame_rate(SAMPLE_RATE).set_sample_width(2)
+        pcm16 = sound.raw_data
+
+    ulaw = pcm16_to_ulaw(pcm16)
+    frame_size = SAMPLE_RATE * FRAME_MS // 1000
+    messages = [
+        {'event': 'connected', 'protocol': 'Call', 'version': '1.0.0'},
+        {'event': 'start', 'start': {'callSid': call_sid, 'streamSid': f'MZ{call_sid}', 'customParameters': {}}},
+    ]
+    for i in range(0, len(ulaw), frame_size):
+        messages.append({
+            'event': 'media',
+            'media': {'track': 'inbound', 'payload': base64.b64encode(ulaw[i:i + frame_size]).decode()},
+        })
+    messages.append({'event': 'stop'})
+    return [json.dumps(message) for message in messages]
+
+
+class Command(BaseCommand):
+    help = "Replay recorded Twilio Media Stream frames (or a WAV file) through the streaming transcriber"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Frames recorded under TWILIO_MEDIA_STREAMS_RECORD_DIR (.jsonl) or a .wav file')
+        parser.add_argument('--backend', help='Transcription backend (defaults to the configured streaming backend)')
+        parser.add_argument('--realtime', action='store_true', help='Pace media frames at 20ms like a live call')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if path.lower().endswith('.wav'):
+            messages = frames_from_wav(path, call_sid='CAreplay')
+        else:
+            with open(path) as f:
+                messages = [line for line in f if line.strip()]
+
+        call_sid = next(
+            (json.loads(text)['start']['callSid'] for text in messages if json.loads(text).get('event') == 'start'),
+            None
+        )
+        if call_sid is None:
+            raise CommandError(f"No 'start' event in {path}")
+
+        # Recorded tokens have expired and WAV replays have none
+        stream_options = dict(settings.TWILIO_MEDIA_STREAMS, ENABLED=True, RECORD_DIR=None, AUTHENTICATE=False)
+        if options['backend']:
+            stream_options['BACKEND'] = options['backend']
+
+        with override_settings(TWILIO_MEDIA_STREAMS=stream_options):
+            media_frames = sum(1 for text in messages if '"media"' in text)
+            started = time.perf_counter()
+            asyncio.run(self.replay(messages, options['realtime']))
+            streamed_at = time.perf_counter()
+            # What the answer webhook does once the recording is posted
+            claimed = claim_stream_transcript(call_sid, timeout=settings.TRANSCRIPTION.get('TIMEOUT', 300))
+            finished = time.perf_counter()
+            close_stream_session(call_sid)
+
+        if claimed is None:
+            raise CommandError("No transcript was produced for the stream")
+        transcript, segments = claimed
+        self.stdout.write(f"Call {call_sid}: {media_frames} frames ({media_frames * FRAME_MS / 1000:.1f}s of audio)")
+        self.stdout.write(f"Stream replayed in {(streamed_at - started) * 1000:.0f} ms")
+        self.stdout.write(f"Transcript ready {(finished - streamed_at) * 1000:.0f} ms after the stream ended")
+        for segment in segments:
+            self.stdout.write(f"  [{segment['start']:7.2f} - {segment['end']:7.2f}] {segment['text']}")
+        self.stdout.write(self.style.SUCCESS(transcript))
+
+    async def replay(self, messages, realtime):
+        queue = asyncio.Queue()
+        await queue.put({'type': 'websocket.connect'})
+        for text in messages:
+            await queue.put({'type': 'websocket.receive', 'text': text})
+        await queue.put({'type': 'websocket.disconnect'})
+
+        async def receive():
+            message = await queue.get()
+            if realtime and '"media"' in message.get('text', ''):
+                await asyncio.sleep(FRAME_MS / 1000)
+            return message
+
+        async def send(message):
+            pass
+
+        await media_stream_app({'type': 'websocket', 'path': settings.TWILIO_MEDIA_STREAMS['PATH']}, receive, send)
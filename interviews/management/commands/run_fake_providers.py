@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from interviews.testing import FakeAssemblyAI, FakeOpenAI, FakeTwilio, Latency
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve fake OpenAI, AssemblyAI and Twilio APIs on localhost with injected latency and faults, "
+        "and print the settings that point the app at them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--openai-port', type=int, default=8101)
+        parser.add_argument('--assemblyai-port', type=int, default=8102)
+        parser.add_argument('--twilio-port', type=int, default=8103)
+        parser.add_argument('--openai-latency', type=Latency.parse, default=Latency(0.8, 0.5),
+                            help='Chat completion latency, MEDIAN[,SIGMA] seconds (log-normal)')
+        parser.add_argument('--assemblyai-latency', type=Latency.parse, default=Latency(0.15, 0.3),
+                            help='Latency of each AssemblyAI request, MEDIAN[,SIGMA]')
+        parser.add_argument('--assemblyai-processing', type=Latency.parse, default=Latency(4.0, 0.4),
+                            help='Time until a transcript completes, MEDIAN[,SIGMA]')
+        parser.add_argument('--twilio-latency', type=Latency.parse, default=Latency(0.2, 0.3),
+                            help='Latency of each Twilio request, MEDIAN[,SIGMA]')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+        parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                            help='Fraction of requests answered with 429')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        faults = {
+            'error_rate': options['error_rate'],
+            'rate_limit_rate': options['rate_limit_rate'],
+            'seed': options['seed'],
+        }
+        servers = [
+            FakeOpenAI(latency=options['openai_latency'], port=options['openai_port'], **faults),
+            FakeAssemblyAI(
+                latency=options['assemblyai_latency'], processing_time=options['assemblyai_processing'],
+                port=options['assemblyai_port'], **faults
+            ),
+            FakeTwilio(latency=options['twilio_latency'], port=options['twilio_port'], **faults),
+        ]
+        openai_api, assemblyai_api, twilio_api = servers
+        for server in servers:
+            server.start()
+
+        self.stdout.write("Fake providers running; start the app with:\n")
+        self.stdout.write(f"  OPENAI_BASE_URL={openai_api.base_url}")
+        self.stdout.write(f"  ASSEMBLYAI_BASE_URL={assemblyai_api.base_url}")
+        self.stdout.write(f"  TWILIO_API_BASE_URL={twilio_api.url}")
+        self.stdout.write("  OPENAI_API_KEY=fake ASSEMBLYAI_API_KEY=fake TWILIO_ACCOUNT_SID=AC0 TWILIO_AUTH_TOKEN=fake")
+        self.stdout.write(f"\nRecording URLs for answer webhooks: {twilio_api.recording_url('RE<sid>')}")
+        self.stdout.flush()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for server in servers:
+                server.stop()
+            self.stdout.write(
+                "Requests served: " + ", ".join(f"{server.name} {len(server.requests)}" for server in servers)
+            )
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from interviews.transcription import get_transcription_backend, transcribe_chunked
+
+
+class Command(BaseCommand):
+    help = "Transcribe a long recording (e.g. a full call) in parallel chunks and print timestamped segments"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Audio file to transcribe')
+        parser.add_argument('--backend', help='Backend name (defaults to TRANSCRIPTION["BACKEND"])')
+        parser.add_argument('--workers', type=int, help='Chunks transcribed in parallel')
+
+    def handle(self, *args, **options):
+        backend = get_transcription_backend(options['backend'])
+        started = time.perf_counter()
+        result = transcribe_chunked(options['path'], backend, workers=options['workers'])
+        elapsed = time.perf_counter() - started
+
+        for segment in result.segments or [{'start': 0, 'end': 0, 'text': result.text}]:
+            self.stdout.write(f"[{segment['start']:8.2f} - {segment['end']:8.2f}] {segment['text']}")
+        self.stdout.write(f"\n{len(result.segments)} segments via {result.backend} in {elapsed:.2f}s")
@@ -0,0 +1,127 @@
+"""ASGI websocket endpoint for Twilio Media Streams.
+
+Twilio connects once per call (see `generate_interview_twiml`) and sends JSON
+messages: ``connected``, ``start`` (with the CallSid), one ``media`` message
+per 20ms of base64 μ-law audio, and ``stop``. Audio is fed to the call's
+`StreamingSession`; the answer webhook claims the transcript for each question.
+
+The ``start`` message must carry the signed ``token`` parameter issued in the
+TwiML for that interview and CallSid (`media_stream_token`); other
+connections are closed before any audio is buffered. Connections are refused
+outright while ``TWILIO_MEDIA_STREAMS['ENABLED']`` is off, and malformed
+messages are logged and skipped.
+"""
+import base64
+import json
+import logging
+import os
+
+from django.conf import settings
+
+from .llm import get_llm_gateway
+from .log import bind
+from .telephony import verify_media_stream_token
+from .transcription.streaming import open_stream_session
+
+logger = logging.getLogger(__name__)
+
+
+class FrameRecorder:
+    """Append raw stream messages to RECORD_DIR/<call_sid>.jsonl for offline replay.
+
+    Messages before ``start`` (which names the file) are held in memory; Twilio
+    sends only ``connected`` before it, so at most MAX_BUFFERED are kept.
+    """
+    MAX_BUFFERED = 10
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.buffered = []
+        self.file = None
+
+    def write(self, text):
+        if self.file is None:
+            if len(self.buffered) < self.MAX_BUFFERED:
+                self.buffered.append(text)
+        else:
+            self.file.write(text.strip() + '\n')
+
+    def open(self, call_sid):
+        os.makedirs(self.directory, exist_ok=True)
+        self.file = open(os.path.join(self.directory, f"{call_sid}.jsonl"), 'a')
+        for text in self.buffered:
+            self.file.write(text.strip() + '\n')
+        self.buffered = []
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+async def media_stream_app(scope, receive, send):
+    """Raw ASGI websocket application; one connection per call"""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    if not settings.TWILIO_MEDIA_STREAMS['ENABLED']:
+        # Closing before accepting rejects the handshake (HTTP 403)
+        await send({'type': 'websocket.close'})
+        return
+    await send({'type': 'websocket.accept'})
+
+    record_dir = settings.TWILIO_MEDIA_STREAMS.get('RECORD_DIR')
+    recorder = FrameRecorder(record_dir) if record_dir else None
+    session = None
+    call_sid = None
+    disconnected = False
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                disconnected = True
+                break
+            if message['type'] != 'websocket.receive' or not message.get('text'):
+                continue
+
+            if recorder:
+                recorder.write(message['text'])
+            try:
+                data = json.loads(message['text'])
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                logger.warning("Skipping a malformed media stream message: %.100r", message['text'])
+                continue
+            event = data.get('event')
+
+            if event == 'start':
+                call_sid = data['start']['callSid']
+                parameters = data['start'].get('customParameters', {})
+                interview_id = parameters.get('interview_id')
+                bind(call_sid=call_sid, interview_id=interview_id)
+                if settings.TWILIO_MEDIA_STREAMS['AUTHENTICATE'] and not verify_media_stream_token(
+                    parameters.get('token'), interview_id, call_sid
+                ):
+                    logger.warning("Media stream rejected: missing or invalid token")
+                    await send({'type': 'websocket.close', 'code': 1008})
+                    return
+                logger.info("Media stream started")
+                session = open_stream_session(call_sid)
+                if recorder:
+                    recorder.open(call_sid)
+            elif event == 'media' and session is not None:
+                session.feed_ulaw(base64.b64decode(data['media']['payload']))
+                if settings.ADAPTIVE_FOLLOWUPS_ENABLED:
+                    # The follow-up request comes seconds after the answer ends; keep its connection open
+                    get_llm_gateway().warm_up(settings.ADAPTIVE_FOLLOWUP_MODEL)
+            elif event == 'stop':
+                logger.info("Media stream stopped")
+                break
+    finally:
+        if recorder:
+            recorder.close()
+
+    # The session stays registered until the status webhook reports the call
+    # completed, since the last answer webhook can arrive after the stream stops
+    if not disconnected:
+        await send({'type': 'websocket.close'})
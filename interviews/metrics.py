@@ -0,0 +1,235 @@
+"""In-process counters, histograms and timing spans for pipeline stages and external calls.
+
+Everything lives in memory in the process that recorded it: ``/api/metrics/``
+returns a JSON snapshot and ``/metrics`` the Prometheus text format.
+``collect_spans()`` captures finished spans for assertions in tests.
+"""
+import contextlib
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from . import tracing
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Counter:
+    """Monotonic counter, one value per label combination"""
+    type = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self):
+        with self._lock:
+            return [{'labels': dict(key), 'value': value} for key, value in self._values.items()]
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label combination"""
+    type = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['count'] += 1
+            series['sum'] += value
+
+    def count(self, **labels):
+        series = self._series.get(_label_key(labels))
+        return series['count'] if series else 0
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {
+                    'labels': dict(key),
+                    'count': series['count'],
+                    'sum': series['sum'],
+                    'buckets': dict(zip(self.buckets, series['buckets'])),
+                }
+                for key, series in self._series.items()
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """Named collection of metrics; `counter`/`histogram` return the existing metric on repeat calls"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name, help_text):
+        return self._get_or_create(Counter, name, help_text)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {_escape_help(metric.help_text)}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for series in metric.snapshot():
+                labels = series['labels']
+                if metric.type == 'counter':
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(series['value'])}")
+                    continue
+                for bound, count in series['buckets'].items():
+                    lines.append(f"{name}_bucket{_format_labels(labels, le=_format_value(bound))} {count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, le='+Inf')} {series['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(series['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text):
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items())) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
+
+
+registry = MetricsRegistry()
+
+stage_latency = registry.histogram(
+    'stage_seconds', 'Latency of pipeline stages and external calls by stage', buckets=STAGE_BUCKETS
+)
+stage_errors = registry.counter('stage_errors_total', 'Pipeline stages and external calls that raised, by stage and error')
+
+
+@dataclass
+class FinishedSpan:
+    stage: str
+    labels: dict
+    seconds: float
+    error: str = None  # exception class name if the stage raised
+
+
+_collectors = []
+_collectors_lock = threading.Lock()
+
+
+class span(contextlib.ContextDecorator):
+    """Time a pipeline stage or external call: ``with span('assemblyai.upload'):`` or as a decorator.
+
+    Feeds the stage_seconds histogram and, if the block raises, stage_errors_total.
+    With tracing enabled the stage is also an OpenTelemetry span; `annotate`
+    adds attributes to it that are too detailed to be metric labels.
+    """
+
+    def __init__(self, stage, **labels):
+        self.stage = stage
+        self.labels = labels
+
+    def _recreate_cm(self):
+        # A fresh instance per decorated call, so concurrent calls don't share a start time
+        return span(self.stage, **self.labels)
+
+    def __enter__(self):
+        self._trace = tracing.start_span(self.stage, self.labels)
+        self._trace_span = self._trace.__enter__() if self._trace is not None else None
+        self._started = time.perf_counter()
+        return self
+
+    def annotate(self, **attributes):
+        if self._trace_span is not None:
+            self._trace_span.set_attributes(tracing.clean_attributes(attributes))
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._started
+        if self._trace is not None:
+            self._trace.__exit__(exc_type, exc, tb)
+        stage_latency.observe(seconds, stage=self.stage, **self.labels)
+        error = exc_type.__name__ if exc_type else None
+        if error:
+            stage_errors.inc(stage=self.stage, error=error, **self.labels)
+        if _collectors:
+            finished = FinishedSpan(self.stage, self.labels, seconds, error)
+            with _collectors_lock:
+                for collector in _collectors:
+                    collector.append(finished)
+        return False
+
+
+@contextlib.contextmanager
+def collect_spans():
+    """Collect spans finished (in any thread) inside the block into the yielded list"""
+    collected = []
+    with _collectors_lock:
+        _collectors.append(collected)
+    try:
+        yield collected
+    finally:
+        with _collectors_lock:
+            _collectors.remove(collected)
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:51
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def backfill_answer_interview(apps, schema_editor):
+    Answer = apps.get_model('interviews', 'Answer')
+    for answer in Answer.objects.filter(interview__isnull=True).select_related('question'):
+        answer.interview_id = answer.question.interview_id
+        answer.save(update_fields=['interview'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_alter_answer_transcript'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='interview',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='interviews.interview'),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='interview',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='question_overrides', to='interviews.interview'),
+        ),
+        migrations.CreateModel(
+            name='QuestionSet',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job_description', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_sets', to='interviews.jobdescription')),
+            ],
+            options={
+                'ordering': ['-version'],
+            },
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='question_set',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='interviews', to='interviews.questionset'),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='question_set',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='questions', to='interviews.questionset'),
+        ),
+        migrations.AddConstraint(
+            model_name='questionset',
+            constraint=models.UniqueConstraint(fields=('job_description', 'version'), name='unique_question_set_version'),
+        ),
+        migrations.RunPython(backfill_answer_interview, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:52
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_question_sets'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionGenerationCache',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('description_hash', models.CharField(max_length=64, unique=True)),
+                ('questions', models.JSONField(default=list)),
+                ('model', models.CharField(max_length=100)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0006_job_description_questions_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='transcript_segments',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
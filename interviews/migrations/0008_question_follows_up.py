@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0007_answer_transcript_segments'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='question',
+            options={'ordering': ['question_number', 'created_at']},
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='follows_up',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='followups', to='interviews.question'),
+        ),
+    ]
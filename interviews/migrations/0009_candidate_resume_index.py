@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0008_question_follows_up'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_index',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:08
+
+from django.db import migrations, models
+
+# Full-text index over interviews_searchdocument(title, body); see interviews/search.py
+SQLITE_CREATE = [
+    """CREATE VIRTUAL TABLE interviews_search_fts USING fts5(
+        title, body, content='interviews_searchdocument', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER interviews_search_fts_insert AFTER INSERT ON interviews_searchdocument BEGIN
+        INSERT INTO interviews_search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    """CREATE TRIGGER interviews_search_fts_delete AFTER DELETE ON interviews_searchdocument BEGIN
+        INSERT INTO interviews_search_fts(interviews_search_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    """CREATE TRIGGER interviews_search_fts_update AFTER UPDATE ON interviews_searchdocument BEGIN
+        INSERT INTO interviews_search_fts(interviews_search_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO interviews_search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS interviews_search_fts_insert",
+    "DROP TRIGGER IF EXISTS interviews_search_fts_delete",
+    "DROP TRIGGER IF EXISTS interviews_search_fts_update",
+    "DROP TABLE IF EXISTS interviews_search_fts",
+]
+POSTGRES_CREATE = [
+    """CREATE INDEX interviews_searchdocument_fts ON interviews_searchdocument
+        USING GIN (to_tsvector('english', title || ' ' || body))""",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS interviews_searchdocument_fts",
+]
+
+
+def _run(schema_editor, statements_by_vendor):
+    # Other databases fall back to LIKE queries in interviews/search.py
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_full_text_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE})
+
+
+def drop_full_text_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0009_candidate_resume_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('answer', 'Answer'), ('candidate', 'Candidate'), ('job_description', 'Job Description')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('title', models.CharField(blank=True, max_length=300)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
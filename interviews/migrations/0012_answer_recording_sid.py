@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0011_webhooks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='recording_sid',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
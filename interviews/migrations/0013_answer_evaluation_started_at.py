@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0012_answer_recording_sid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='evaluation_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
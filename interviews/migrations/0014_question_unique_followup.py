@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0013_answer_evaluation_started_at'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='question',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('follows_up__isnull', False)), fields=('interview', 'follows_up'), name='unique_followup'
+            ),
+        ),
+    ]
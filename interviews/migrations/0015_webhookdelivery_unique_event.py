@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+def delete_duplicate_deliveries(apps, schema_editor):
+    """Keep the oldest delivery of each (interview, endpoint, event) so the constraint can be added"""
+    WebhookDelivery = apps.get_model('interviews', 'WebhookDelivery')
+    seen = set()
+    duplicates = []
+    for delivery in WebhookDelivery.objects.order_by('created_at', 'pk').only('pk', 'interview_id', 'endpoint_id', 'event'):
+        key = (delivery.interview_id, delivery.endpoint_id, delivery.event)
+        if key in seen:
+            duplicates.append(delivery.pk)
+        else:
+            seen.add(key)
+    WebhookDelivery.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0014_question_unique_followup'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_deliveries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='webhookdelivery',
+            constraint=models.UniqueConstraint(fields=('interview', 'endpoint', 'event'), name='unique_webhook_event'),
+        ),
+    ]
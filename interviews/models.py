@@ -1,4 +1,7 @@
-from django.db import models
+from collections import defaultdict
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
 import uuid
 import os
 
@@ -10,16 +13,77 @@ def get_upload_path(instance, filename):
 
 class JobDescription(models.Model):
     """Model to store job descriptions and generated questions"""
+    QUESTIONS_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=200)
     description = models.TextField()
     questions = models.JSONField(default=list)  # Store generated questions
+    questions_status = models.CharField(max_length=20, choices=QUESTIONS_STATUS_CHOICES, default='pending')
+    callback_url = models.URLField(max_length=500, blank=True)  # Notified when questions are ready
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.title} - {self.created_at.strftime('%Y-%m-%d')}"
 
+    def get_current_question_set(self):
+        """Return the latest question set, creating one from `questions` for older rows"""
+        question_set = self.question_sets.order_by('-version').first()
+        if question_set is None and self.questions:
+            question_set = QuestionSet.objects.create_for_job_description(self, self.questions)
+        return question_set
+
+class QuestionGenerationCache(models.Model):
+    """Full list of generated questions, keyed by a hash of the normalized job description"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    description_hash = models.CharField(max_length=64, unique=True)
+    questions = models.JSONField(default=list)
+    model = models.CharField(max_length=100)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.description_hash[:12]} - {len(self.questions)} questions"
+
+class QuestionSetManager(models.Manager):
+    def create_for_job_description(self, job_description, question_texts):
+        """Create the next version of a job description's shared question set"""
+        with transaction.atomic():
+            latest = job_description.question_sets.order_by('-version').first()
+            question_set = self.create(
+                job_description=job_description,
+                version=latest.version + 1 if latest else 1
+            )
+            Question.objects.bulk_create([
+                Question(question_set=question_set, question_text=text, question_number=i)
+                for i, text in enumerate(question_texts, 1)
+            ])
+        return question_set
+
+class QuestionSet(models.Model):
+    """Versioned set of questions shared by every interview for a job description"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job_description = models.ForeignKey(JobDescription, on_delete=models.CASCADE, related_name='question_sets')
+    version = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = QuestionSetManager()
+
+    class Meta:
+        ordering = ['-version']
+        constraints = [
+            models.UniqueConstraint(fields=['job_description', 'version'], name='unique_question_set_version'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_description.title} - v{self.version}"
+
 class Candidate(models.Model):
     """Model to store candidate information"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -28,12 +92,26 @@ class Candidate(models.Model):
     phone = models.CharField(max_length=20)  # E.164 format
     resume = models.FileField(upload_to=get_upload_path, null=True, blank=True)
     resume_text = models.TextField(blank=True)  # Parsed resume text
+    resume_index = models.JSONField(default=dict, blank=True)  # Section chunks + BM25 stats, see resume_index.py
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.name} - {self.email}"
 
+    def resume_context(self, query):
+        """Resume chunks most relevant to `query`, indexing older candidates on first use"""
+        from django.conf import settings
+        from .resume_index import build_resume_index, format_chunks, top_chunks
+
+        if not self.resume_text:
+            return ""
+        options = settings.RESUME_PARSING
+        if not self.resume_index:
+            self.resume_index = build_resume_index(self.resume_text, options['CHUNK_CHARS'])
+            Candidate.objects.filter(pk=self.pk).update(resume_index=self.resume_index)
+        return format_chunks(top_chunks(self.resume_index, query, options['CONTEXT_CHUNKS']))
+
 class Interview(models.Model):
     """Model to store interview sessions"""
     STATUS_CHOICES = [
@@ -46,6 +124,7 @@ class Interview(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     job_description = models.ForeignKey(JobDescription, on_delete=models.CASCADE)
     candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE)
+    question_set = models.ForeignKey(QuestionSet, on_delete=models.PROTECT, null=True, blank=True, related_name='interviews')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     twilio_call_sid = models.CharField(max_length=100, null=True, blank=True)
     call_duration = models.IntegerField(null=True, blank=True)  # in seconds
@@ -57,16 +136,99 @@ class Interview(models.Model):
     def __str__(self):
         return f"Interview {self.id} - {self.candidate.name}"
 
+    @property
+    def questions(self):
+        """Questions asked in this interview.
+
+        Shared questions come from the referenced question set; rows attached
+        directly to the interview override the shared question with the same
+        number. Interviews without a question set only use their own rows.
+        """
+        if self.question_set_id is None:
+            return Question.objects.filter(interview=self)
+        # Follow-ups share their parent's number but are asked in addition to it
+        overridden_numbers = Question.objects.filter(interview=self, follows_up__isnull=True).values('question_number')
+        return Question.objects.filter(
+            Q(interview=self) |
+            (Q(question_set_id=self.question_set_id) & ~Q(question_number__in=overridden_numbers))
+        )
+
+    @cached_property
+    def question_list(self):
+        """`questions` evaluated once per instance; filled in bulk by `prefetch_questions`"""
+        return list(self.questions)
+
+    def override_question(self, question_number, question_text):
+        """Replace a shared question for this interview only"""
+        question, _ = Question.objects.update_or_create(
+            interview=self,
+            question_number=question_number,
+            follows_up=None,
+            defaults={'question_text': question_text}
+        )
+        return question
+
+    def get_answer(self, question):
+        """Return this interview's answer to a (possibly shared) question"""
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('answers')
+        if prefetched is not None:
+            # Loaded with prefetch_related('answers'): no query per question
+            return next((answer for answer in prefetched if answer.question_id == question.id), None)
+        return question.answers.filter(interview=self).first()
+
+    def add_followup(self, question, question_text):
+        """Ask an extra question generated from the answer to `question`, right after it.
+
+        There is at most one follow-up per question; an existing one is returned unchanged.
+        """
+        followup, _ = Question.objects.get_or_create(
+            interview=self,
+            follows_up=question,
+            defaults={'question_number': question.question_number, 'question_text': question_text}
+        )
+        return followup
+
+def prefetch_questions(interviews):
+    """Fill `question_list` of many interviews with one query instead of one per interview"""
+    interviews = list(interviews)
+    if not interviews:
+        return interviews
+    question_set_ids = {interview.question_set_id for interview in interviews if interview.question_set_id}
+    shared, own = defaultdict(list), defaultdict(list)
+    for question in Question.objects.filter(Q(interview__in=interviews) | Q(question_set_id__in=question_set_ids)):
+        if question.interview_id:
+            own[question.interview_id].append(question)
+        else:
+            shared[question.question_set_id].append(question)
+
+    # Same rules as Interview.questions
+    for interview in interviews:
+        questions = list(own[interview.id])
+        if interview.question_set_id is not None:
+            overridden_numbers = {q.question_number for q in questions if q.follows_up_id is None}
+            questions += [q for q in shared[interview.question_set_id] if q.question_number not in overridden_numbers]
+        questions.sort(key=lambda q: (q.question_number, q.created_at))
+        interview.question_list = questions
+    return interviews
+
 class Question(models.Model):
-    """Model to store interview questions"""
+    """Model to store interview questions (shared via a question set, interview-specific overrides or follow-ups)"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='questions')
+    question_set = models.ForeignKey(QuestionSet, on_delete=models.CASCADE, null=True, blank=True, related_name='questions')
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, null=True, blank=True, related_name='question_overrides')
+    follows_up = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='followups')
     question_text = models.TextField()
     question_number = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ['question_number']
+        # Follow-ups have their parent's number and sort after it by creation time
+        ordering = ['question_number', 'created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['interview', 'follows_up'], condition=Q(follows_up__isnull=False), name='unique_followup'
+            ),
+        ]
 
     def __str__(self):
         return f"Q{self.question_number}: {self.question_text[:50]}..."
@@ -74,14 +236,103 @@ class Question(models.Model):
 class Answer(models.Model):
     """Model to store candidate answers"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, null=True, blank=True, related_name='answers')
     question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers')
     audio_file = models.FileField(upload_to=get_upload_path, null=True, blank=True)
     audio_duration = models.IntegerField(null=True, blank=True)  # Duration in seconds
+    recording_sid = models.CharField(max_length=64, blank=True, db_index=True)  # Twilio RecordingSid of audio_file
     transcript = models.TextField(blank=True)
+    transcript_segments = models.JSONField(default=list, blank=True)  # [{"start": s, "end": s, "text": ...}]
     score = models.FloatField(null=True, blank=True)
     feedback = models.TextField(blank=True)
+    evaluation_started_at = models.DateTimeField(null=True, blank=True)  # claim held by the worker evaluating it
     created_at = models.DateTimeField(auto_now_add=True)
 
 
     def __str__(self):
         return f"Answer to Q{self.question.question_number} - {self.transcript[:50]}..."
+
+class SearchDocument(models.Model):
+    """Denormalized searchable text of an answer, candidate or job description.
+
+    Kept in sync by signals in `interviews.search`; the database's full-text
+    index (SQLite FTS5 or a Postgres GIN index) is built over title and body.
+    """
+    KIND_CHOICES = [
+        ('answer', 'Answer'),
+        ('candidate', 'Candidate'),
+        ('job_description', 'Job Description'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    title = models.CharField(max_length=300, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title[:50]}"
+
+class WebhookEndpoint(models.Model):
+    """A client URL subscribed to outbound interview events (see `interviews.webhooks`)"""
+    EVENT_CHOICES = [
+        ('interview.completed', 'Interview completed'),
+        ('interview.evaluated', 'Interview evaluated'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    url = models.URLField(max_length=500)
+    secret = models.CharField(max_length=64)  # HMAC-SHA256 key for the X-Webhook-Signature header
+    events = models.JSONField(default=list)  # subscribed event names; empty = all
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def subscribes_to(self, event):
+        return not self.events or event in self.events
+
+    def __str__(self):
+        return self.url
+
+class WebhookDelivery(models.Model):
+    """Outbox row: one event waiting to be (or already) delivered to one endpoint.
+
+    Rows are written in the transaction that changed the interview, so an event
+    is never lost or sent for a rolled-back change. The dispatcher leases due
+    rows in batches, so several processes can dispatch without sending a row twice.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('delivered', 'Delivered'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # sent as the event id
+    endpoint = models.ForeignKey(WebhookEndpoint, on_delete=models.CASCADE, related_name='deliveries')
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='webhook_deliveries')
+    event = models.CharField(max_length=50)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    lease_token = models.UUIDField(null=True, blank=True)
+    leased_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='webhook_delivery_due'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['interview', 'endpoint', 'event'], name='unique_webhook_event'),
+        ]
+
+    def __str__(self):
+        return f"{self.event} to {self.endpoint_id} ({self.status})"
@@ -0,0 +1,151 @@
+"""Per-request database query budgets and N+1 detection.
+
+`QueryBudgetMiddleware` records every query a request runs on the default
+connection. Queries are grouped by shape (the SQL with literals and IN lists
+collapsed); a shape repeated ``N_PLUS_ONE_THRESHOLD`` times in one request is
+reported as an N+1 pattern, and a request running more queries than its
+view's budget in ``settings.QUERY_BUDGETS['VIEWS']`` (keyed by URL name) is
+over budget. Violations are logged and counted; in DEBUG the counts are also
+returned in ``X-Query-*`` response headers, and with ``RAISE`` the request
+fails with `QueryBudgetExceeded` so tests catch regressions.
+"""
+import logging
+import re
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+request_queries = registry.histogram(
+    'request_queries', 'Database queries per request by view', buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+query_budget_violations = registry.counter(
+    'query_budget_violations_total', 'Requests over their query budget or with N+1 patterns, by view and kind'
+)
+
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERALS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request or block ran more queries than its budget, or repeated a query shape (N+1)"""
+
+
+def query_shape(sql):
+    """SQL with literals and IN (...) lists collapsed, so the same query with different ids compares equal"""
+    sql = _STRING_LITERALS.sub('?', sql)
+    sql = _NUMBER_LITERALS.sub('?', sql)
+    sql = _IN_LISTS.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """Record the queries run on the default connection inside a ``with`` block"""
+
+    def __init__(self):
+        self.queries = []  # (sql, seconds)
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def seconds(self):
+        return sum(seconds for _sql, seconds in self.queries)
+
+    def repeated(self, threshold):
+        """[(shape, count)] of query shapes run at least `threshold` times, most repeated first"""
+        counts = Counter(query_shape(sql) for sql, _seconds in self.queries)
+        return [(shape, count) for shape, count in counts.most_common() if count >= threshold]
+
+    def violations(self, budget=None, n_plus_one_threshold=None):
+        """Human-readable problems: over `budget` queries, or shapes repeated `n_plus_one_threshold` times"""
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f"{self.count} queries, budget {budget}")
+        if n_plus_one_threshold:
+            for shape, count in self.repeated(n_plus_one_threshold):
+                problems.append(f"N+1: {count}x {shape[:200]}")
+        return problems
+
+
+class QueryBudgetMiddleware:
+    """Enforce settings.QUERY_BUDGETS per view; see the module docstring.
+
+    Runs in async mode under ASGI so async views (the SSE stream) aren't
+    moved to a thread; their ORM calls still run on this request's connection.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.QUERY_BUDGETS['ENABLED']:
+            return self.get_response(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.check(request, response, recorder)
+
+    async def __acall__(self, request):
+        if not settings.QUERY_BUDGETS['ENABLED']:
+            return await self.get_response(request)
+        with QueryRecorder() as recorder:
+            response = await self.get_response(request)
+        return self.check(request, response, recorder)
+
+    def check(self, request, response, recorder):
+        options = settings.QUERY_BUDGETS
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else 'unresolved'
+        budget = options['VIEWS'].get(view, options['DEFAULT'])
+        repeated = recorder.repeated(options['N_PLUS_ONE_THRESHOLD'])
+        request_queries.observe(recorder.count, view=view)
+
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(recorder.count)
+            response['X-Query-Time-Ms'] = f"{recorder.seconds * 1000:.1f}"
+            if budget is not None:
+                response['X-Query-Budget'] = str(budget)
+            if repeated:
+                response['X-Query-N-Plus-One'] = '; '.join(f"{count}x {shape[:80]}" for shape, count in repeated[:3])
+
+        problems = recorder.violations(budget, options['N_PLUS_ONE_THRESHOLD'])
+        if problems:
+            if budget is not None and recorder.count > budget:
+                query_budget_violations.inc(view=view, kind='budget')
+            if repeated:
+                query_budget_violations.inc(view=view, kind='n_plus_one')
+            logger.warning("Query budget exceeded by %s %s: %s", request.method, view, '; '.join(problems))
+            if options['RAISE']:
+                raise QueryBudgetExceeded(f"{request.method} {request.path} ({view}): " + '; '.join(problems))
+        return response
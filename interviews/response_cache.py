@@ -0,0 +1,138 @@
+"""Cached API responses, invalidated when the rows behind them change.
+
+Serialized response data is stored in the default cache (local memory per
+process, or Redis with CACHE_REDIS_URL) under a key that includes the
+current version of its scope: ``interview:<id>`` for one interview's results
+and audio files, ``interviews``, ``candidates`` and ``job_descriptions`` for
+the list endpoints. Saving or deleting an Answer, Interview, Question,
+Candidate or JobDescription replaces the version of every scope it appears
+in (after the transaction commits), so stale entries are never read again and
+simply expire. The version doubles as the Last-Modified time of the scope, so
+it is a whole second and every change moves it to a later second: a client
+holding an If-Modified-Since date from before a change never gets a 304.
+"""
+import hashlib
+import json
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .metrics import registry
+from .models import Answer, Candidate, Interview, JobDescription, Question
+
+logger = logging.getLogger(__name__)
+
+response_cache_requests = registry.counter(
+    'response_cache_requests_total', 'Cacheable API responses by view and result (hit, miss, not_modified)'
+)
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE['CACHE_ALIAS']]
+
+
+def _version_key(scope):
+    return f"response-cache:version:{scope}"
+
+
+def scope_version(scope):
+    """Current version of `scope`: the time it last changed (or was first cached), in whole seconds"""
+    cache = get_cache()
+    version = cache.get(_version_key(scope))
+    if version is None:
+        version = math.ceil(time.time())
+        # add() so concurrent first requests agree on one version
+        if not cache.add(_version_key(scope), version, None):
+            version = cache.get(_version_key(scope), version)
+    return version
+
+
+def invalidate(*scopes):
+    """Start new versions of `scopes`; entries cached under the old ones are never read again"""
+    cache = get_cache()
+    now = math.ceil(time.time())
+    current = cache.get_many([_version_key(scope) for scope in scopes])
+    # At least a second past the old version, even for two changes within one second
+    cache.set_many({
+        _version_key(scope): max(now, math.floor(current.get(_version_key(scope), 0)) + 1) for scope in scopes
+    }, None)
+
+
+def check_shared_cache():
+    """Refuse to start when several worker processes would each cache responses in their own memory.
+
+    Invalidations would only reach the worker that made the change, and the
+    others would keep serving stale responses (and 304s) until TIMEOUT.
+    """
+    options = settings.RESPONSE_CACHE
+    if options['ENABLED'] and settings.WEB_CONCURRENCY > 1 and isinstance(get_cache(), LocMemCache):
+        raise ImproperlyConfigured(
+            f"RESPONSE_CACHE uses the local-memory cache {options['CACHE_ALIAS']!r} with "
+            f"WEB_CONCURRENCY={settings.WEB_CONCURRENCY}; set CACHE_REDIS_URL or RESPONSE_CACHE_ENABLED=False"
+        )
+
+
+def get_or_build(scope, view, path, build):
+    """(entry, hit) for a response cached under `scope`; `build()` returns the data or None to skip caching.
+
+    Entries are {'data', 'etag', 'last_modified'}.
+    """
+    cache = get_cache()
+    version = scope_version(scope)
+    key = f"response-cache:{scope}:{version}:{view}:{hashlib.sha1(path.encode()).hexdigest()}"
+    entry = cache.get(key)
+    if entry is not None:
+        return entry, True
+
+    data = build()
+    if data is None:
+        return None, False
+    body = json.dumps(data, sort_keys=True, default=str).encode()
+    entry = {
+        'data': data,
+        'etag': f'"{hashlib.sha1(body).hexdigest()}"',
+        'last_modified': version,
+    }
+    cache.set(key, entry, settings.RESPONSE_CACHE['TIMEOUT'])
+    return entry, False
+
+
+def scopes_for(instance):
+    """Cache scopes whose responses include `instance`"""
+    if isinstance(instance, Interview):
+        return ['interviews', f'interview:{instance.pk}']
+    if isinstance(instance, Answer):
+        return ['interviews'] + ([f'interview:{instance.interview_id}'] if instance.interview_id else [])
+    if isinstance(instance, Question):
+        if instance.interview_id:
+            return ['interviews', f'interview:{instance.interview_id}']
+        # Shared questions appear in every interview using the set; sets rarely change
+        interview_ids = Interview.objects.filter(question_set_id=instance.question_set_id).values_list('pk', flat=True)
+        return ['interviews'] + [f'interview:{pk}' for pk in interview_ids]
+    if isinstance(instance, Candidate):
+        interview_ids = Interview.objects.filter(candidate_id=instance.pk).values_list('pk', flat=True)
+        return ['candidates', 'interviews'] + [f'interview:{pk}' for pk in interview_ids]
+    # Interviews embed their job description and its questions
+    interview_ids = Interview.objects.filter(job_description_id=instance.pk).values_list('pk', flat=True)
+    return ['job_descriptions', 'interviews'] + [f'interview:{pk}' for pk in interview_ids]
+
+
+def _on_change(sender, instance, raw=False, **kwargs):
+    if raw or not settings.RESPONSE_CACHE['ENABLED']:
+        return
+    scopes = scopes_for(instance)
+    # After commit, so a request racing the write can't cache the old rows under the new version
+    transaction.on_commit(lambda: invalidate(*scopes))
+
+
+def connect_signals():
+    for model in (Answer, Interview, Question, Candidate, JobDescription):
+        post_save.connect(_on_change, sender=model, dispatch_uid=f'response_cache_{model.__name__}')
+        post_delete.connect(_on_change, sender=model, dispatch_uid=f'response_cache_delete_{model.__name__}')
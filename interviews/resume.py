@@ -0,0 +1,162 @@
+"""Resume text extraction.
+
+PDFs are parsed page by page. Long documents are split into page ranges that
+are extracted in a process pool, and every parse is bounded by the page, byte
+and time limits in ``settings.RESUME_PARSING``. Results are cached by a hash
+of the file contents, so re-uploading the same resume is free.
+"""
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .clients import get_pdf_reader, get_docx_document
+from .metrics import span
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _extract_page_range(data, start, stop, deadline=None):
+    """Worker: text of pages [start, stop) of a PDF given as bytes.
+
+    With a `deadline` (time.monotonic()), stops between pages once it has passed.
+    """
+    reader = get_pdf_reader(io.BytesIO(data))
+    texts = []
+    for page in reader.pages[start:stop]:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        try:
+            texts.append(page.extract_text() or "")
+        except Exception as e:
+            logger.warning("Error extracting resume page: %s", e)
+            texts.append("")
+    return texts
+
+
+def worker_count(options=None):
+    options = options or settings.RESUME_PARSING
+    return options['WORKERS'] or os.cpu_count() or 1
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=worker_count(),
+                # spawn: forking a threaded Django process is unsafe
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def _terminate_pool(pool):
+    """Kill a pool's workers, which may be stuck in a page, and start a new pool on next use.
+
+    Cancelling a future does not stop a running worker, so a pathological PDF
+    would otherwise keep the pool busy for the resumes queued behind it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pdf_text(data, options=None):
+    """Text of a PDF, limited to MAX_PAGES pages and TIMEOUT seconds.
+
+    If the time limit is hit, the text of the leading pages finished so far is
+    returned. Small PDFs are parsed in this process and checked against the
+    limit between pages; large ones are parsed in the pool, whose workers are
+    terminated when the limit is hit.
+    """
+    options = options or settings.RESUME_PARSING
+    deadline = time.monotonic() + options['TIMEOUT']
+    reader = get_pdf_reader(io.BytesIO(data))
+    page_count = min(len(reader.pages), options['MAX_PAGES'])
+    if page_count < len(reader.pages):
+        logger.info("Resume has %d pages; parsing the first %d", len(reader.pages), page_count)
+
+    workers = worker_count(options)
+    if page_count < options['PARALLEL_MIN_PAGES'] or workers == 1:
+        pages = _extract_page_range(data, 0, page_count, deadline)
+        if len(pages) < page_count:
+            logger.warning(
+                "Resume parsing hit the %ss limit; keeping %d of %d pages", options['TIMEOUT'], len(pages), page_count
+            )
+        return "\n".join(pages).strip()
+
+    step = -(-page_count // workers)
+    pool = get_pool()
+    futures = [pool.submit(_extract_page_range, data, start, min(start + step, page_count))
+               for start in range(0, page_count, step)]
+    _done, not_done = wait(futures, timeout=max(0, deadline - time.monotonic()))
+
+    pages = []
+    for future in futures:
+        if future in not_done:
+            logger.warning(
+                "Resume parsing hit the %ss limit; keeping %d of %d pages", options['TIMEOUT'], len(pages), page_count
+            )
+            break
+        pages.extend(future.result())
+    if not_done:
+        _terminate_pool(pool)
+    return "\n".join(pages).strip()
+
+
+def extract_docx_text(data):
+    doc = get_docx_document(io.BytesIO(data))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
+
+
+def parse_resume(file):
+    """Parse resume file (PDF or DOCX) and extract text"""
+    options = settings.RESUME_PARSING
+    try:
+        name = file.name.lower()
+        if not name.endswith(('.pdf', '.docx')):
+            return ""
+
+        if getattr(file, 'size', None) and file.size > options['MAX_BYTES']:
+            logger.warning("Resume is %d bytes, over the %d byte limit; skipping parsing", file.size, options['MAX_BYTES'])
+            return ""
+        data = file.read()
+        file.seek(0)  # the upload is saved to storage afterwards
+        if len(data) > options['MAX_BYTES']:
+            logger.warning("Resume is %d bytes, over the %d byte limit; skipping parsing", len(data), options['MAX_BYTES'])
+            return ""
+
+        cache_key = f"resume_text:{options['MAX_PAGES']}:{hashlib.sha256(data).hexdigest()}"
+        text = cache.get(cache_key)
+        if text is not None:
+            return text
+
+        started = time.perf_counter()
+        with span('resume.parse', format=name.rsplit('.', 1)[1]):
+            if name.endswith('.pdf'):
+                text = extract_pdf_text(data, options)
+            else:
+                text = extract_docx_text(data)
+        logger.info("Parsed resume %s (%d bytes) in %.2fs", file.name, len(data), time.perf_counter() - started)
+
+        cache.set(cache_key, text, options['CACHE_TIMEOUT'])
+        return text
+
+    except Exception as e:
+        logger.exception("Error parsing resume: %s", e)
+        return ""
@@ -0,0 +1,122 @@
+"""Section-aware chunking and a BM25 index over a single resume.
+
+The index is small, plain JSON (stored on `Candidate.resume_index`) and built
+on the CPU when the resume is parsed. Scoring an answer then sends the
+resume chunks most relevant to the question instead of an arbitrary prefix.
+"""
+import math
+import re
+from collections import Counter
+
+SECTION_HEADINGS = {
+    'summary', 'profile', 'objective', 'about', 'experience', 'work experience', 'professional experience',
+    'employment', 'employment history', 'work history', 'education', 'skills', 'technical skills',
+    'projects', 'certifications', 'certificates', 'awards', 'publications', 'languages', 'interests',
+    'achievements', 'volunteering', 'courses', 'training',
+}
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'i', 'in', 'is', 'it',
+    'my', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'we', 'were', 'with', 'you', 'your',
+}
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def _stem(token):
+    """Crude suffix stripping so 'indexes', 'indexing' and 'indexed' match 'index'"""
+    for suffix in ('ing', 'es', 'ed', 's'):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    tokens = (token.rstrip('.') for token in TOKEN_RE.findall(text.lower()))
+    return [_stem(token) for token in tokens if token not in STOPWORDS]
+
+
+def _heading(line):
+    """Section name if `line` looks like a heading, else None"""
+    cleaned = line.strip().strip(':').strip()
+    if not cleaned or len(cleaned) > 40:
+        return None
+    if cleaned.lower() in SECTION_HEADINGS or (cleaned.isupper() and len(cleaned.split()) <= 4):
+        return cleaned.title()
+    return None
+
+
+def chunk_resume(text, chunk_chars=400):
+    """Split resume text into [{'section': ..., 'text': ...}] chunks of at most ~chunk_chars"""
+    chunks = []
+    section = 'General'
+    current = []
+
+    def flush():
+        if current:
+            chunks.append({'section': section, 'text': ' '.join(current)})
+            current.clear()
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        heading = _heading(line)
+        if heading:
+            flush()
+            section = heading
+            continue
+        if current and sum(len(part) + 1 for part in current) + len(line) > chunk_chars:
+            flush()
+        current.append(line)
+    flush()
+    return chunks
+
+
+def build_resume_index(text, chunk_chars=400):
+    """BM25 statistics for the chunks of a resume, as JSON-serializable data"""
+    chunks = chunk_resume(text, chunk_chars)
+    term_freqs = [dict(Counter(tokenize(f"{chunk['section']} {chunk['text']}"))) for chunk in chunks]
+    lengths = [sum(tf.values()) for tf in term_freqs]
+    doc_freqs = Counter(term for tf in term_freqs for term in tf)
+    return {
+        'chunks': chunks,
+        'term_freqs': term_freqs,
+        'lengths': lengths,
+        'avg_length': (sum(lengths) / len(lengths)) if lengths else 0.0,
+        'doc_freqs': dict(doc_freqs),
+    }
+
+
+def top_chunks(index, query, k=3):
+    """The `k` chunks scoring highest for `query` under BM25, in resume order.
+
+    Falls back to the first `k` chunks when nothing in the resume matches.
+    """
+    chunks = index.get('chunks') or []
+    if not chunks:
+        return []
+    n = len(chunks)
+    avg_length = index['avg_length'] or 1.0
+    query_terms = set(tokenize(query))
+
+    scores = []
+    for i, tf in enumerate(index['term_freqs']):
+        score = 0.0
+        for term in query_terms:
+            freq = tf.get(term)
+            if not freq:
+                continue
+            df = index['doc_freqs'][term]
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * index['lengths'][i] / avg_length)
+            score += idf * freq * (BM25_K1 + 1) / (freq + norm)
+        scores.append((score, i))
+
+    best = sorted(i for score, i in sorted(scores, reverse=True)[:k] if score > 0)
+    return [chunks[i] for i in best] if best else chunks[:k]
+
+
+def format_chunks(chunks):
+    return "\n".join(f"[{chunk['section']}] {chunk['text']}" for chunk in chunks)
@@ -0,0 +1,209 @@
+"""Full-text search over answer transcripts, resumes and job descriptions.
+
+Each searchable object is mirrored into a `SearchDocument` row when it is
+saved. The database indexes those rows (SQLite FTS5 virtual table kept in
+sync by triggers, or a Postgres GIN expression index; both created in
+migration 0010), so queries never scan the source tables. Other databases
+fall back to `icontains`.
+"""
+import re
+import uuid
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+
+from .models import Answer, Candidate, JobDescription, SearchDocument
+
+# Model -> (kind, fields whose change requires reindexing)
+INDEXED_MODELS = {
+    Answer: ('answer', {'transcript'}),
+    Candidate: ('candidate', {'name', 'email', 'phone', 'resume_text'}),
+    JobDescription: ('job_description', {'title', 'description'}),
+}
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def document_fields(instance):
+    """(title, body) to index for a model instance"""
+    if isinstance(instance, Answer):
+        return instance.question.question_text[:300], instance.transcript or ""
+    if isinstance(instance, Candidate):
+        return instance.name[:300], f"{instance.email} {instance.phone}\n{instance.resume_text}"
+    return instance.title[:300], instance.description
+
+
+def index_instance(instance):
+    kind, _fields = INDEXED_MODELS[type(instance)]
+    title, body = document_fields(instance)
+    if isinstance(instance, Answer) and not body:
+        # Nothing to find until the answer is transcribed
+        SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+        return
+    SearchDocument.objects.update_or_create(
+        kind=kind, object_id=instance.pk, defaults={'title': title, 'body': body}
+    )
+
+
+def _on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    _kind, fields = INDEXED_MODELS[sender]
+    if update_fields is not None and not fields.intersection(update_fields):
+        return
+    index_instance(instance)
+
+
+def _on_delete(sender, instance, **kwargs):
+    kind, _fields = INDEXED_MODELS[sender]
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def connect_signals():
+    for model in INDEXED_MODELS:
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'search_index_{model.__name__}')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'search_unindex_{model.__name__}')
+
+
+def _fts5_query(text):
+    """Quote each word (FTS5 syntax is not user input) and prefix-match the last one for type-ahead"""
+    words = WORD_RE.findall(text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' AND '.join(terms)
+
+
+_FTS5_PAGE_SQL = """
+    SELECT d.kind, d.object_id, d.title,
+           snippet(interviews_search_fts, 1, '[', ']', '...', 16),
+           bm25(interviews_search_fts)
+    FROM interviews_search_fts
+    JOIN interviews_searchdocument d ON d.id = interviews_search_fts.rowid
+    WHERE interviews_search_fts MATCH %s AND interviews_search_fts.rowid {bound} %s {kind_filter}
+    ORDER BY {order}
+    LIMIT %s OFFSET %s
+"""
+
+
+def _fts5_page(match, kind, bound, rowid, order, limit, offset):
+    sql = _FTS5_PAGE_SQL.format(bound=bound, order=order, kind_filter='AND d.kind = %s' if kind else '')
+    params = [match, rowid] + ([kind] if kind else []) + [limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        # bm25() is lower-is-better; report higher-is-better like Postgres
+        return [(k, o, t, s, -rank) for k, o, t, s, rank in cursor.fetchall()]
+
+
+def _rank_window_start(match, kind, window):
+    """Rowid just below the newest `window` matches of `kind`, or None if there are no more matches than that"""
+    if kind:
+        sql = (
+            "SELECT interviews_search_fts.rowid FROM interviews_search_fts "
+            "JOIN interviews_searchdocument d ON d.id = interviews_search_fts.rowid "
+            "WHERE interviews_search_fts MATCH %s AND d.kind = %s "
+            "ORDER BY interviews_search_fts.rowid DESC LIMIT 1 OFFSET %s"
+        )
+        params = [match, kind, window]
+    else:
+        sql = (
+            "SELECT rowid FROM interviews_search_fts WHERE interviews_search_fts MATCH %s "
+            "ORDER BY rowid DESC LIMIT 1 OFFSET %s"
+        )
+        params = [match, window]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _search_sqlite(query, kind, limit, offset):
+    match = _fts5_query(query)
+    if match is None:
+        return []
+    # bm25() has to be computed for every match before sorting, so for very
+    # common terms only the newest RANK_WINDOW matches are sorted by rank.
+    # Older matches are still returned after them, newest first.
+    window = settings.SEARCH_RANK_WINDOW
+    window_start = _rank_window_start(match, kind, window)
+    if window_start is None:
+        return _fts5_page(match, kind, '>', 0, 'bm25(interviews_search_fts)', limit, offset)
+
+    rows = []
+    if offset < window:
+        rows = _fts5_page(
+            match, kind, '>', window_start, 'bm25(interviews_search_fts)', min(limit, window - offset), offset
+        )
+    if len(rows) < limit:
+        rows += _fts5_page(
+            match, kind, '<=', window_start, 'interviews_search_fts.rowid DESC',
+            limit - len(rows), max(0, offset - window)
+        )
+    return rows
+
+
+def _search_postgres(query, kind, limit, offset):
+    # Rank and limit first, then build headlines for the page only
+    sql = """
+        SELECT kind, object_id, title,
+               ts_headline('english', body, q, 'StartSel=[, StopSel=], MaxWords=32, MinWords=8'),
+               rank
+        FROM (
+            SELECT d.kind, d.object_id, d.title, d.body, q,
+                   ts_rank(to_tsvector('english', d.title || ' ' || d.body), q) AS rank
+            FROM interviews_searchdocument d, websearch_to_tsquery('english', %s) q
+            WHERE to_tsvector('english', d.title || ' ' || d.body) @@ q {kind_filter}
+            ORDER BY rank DESC
+            LIMIT %s OFFSET %s
+        ) page
+        ORDER BY rank DESC
+    """
+    params = [query]
+    if kind:
+        params.append(kind)
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(kind_filter='AND d.kind = %s' if kind else ''), params + [limit, offset])
+        return cursor.fetchall()
+
+
+def _search_fallback(query, kind, limit, offset):
+    documents = SearchDocument.objects.filter(body__icontains=query)
+    if kind:
+        documents = documents.filter(kind=kind)
+    return [
+        (d.kind, d.object_id, d.title, d.body[:200], 0.0)
+        for d in documents.order_by('-updated_at')[offset:offset + limit]
+    ]
+
+
+def _uuid(value):
+    # SQLite stores UUIDField as 32 hex characters, which raw queries return as-is
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
+
+
+BACKENDS = {
+    'sqlite': _search_sqlite,
+    'postgresql': _search_postgres,
+}
+
+
+def search(query, kind=None, page=1, page_size=20):
+    """One page of hits as ([{'type', 'id', 'title', 'snippet', 'rank'}], has_next).
+
+    Fetches one extra row instead of counting all matches, so deep result sets stay cheap.
+    """
+    backend = BACKENDS.get(connection.vendor, _search_fallback)
+    rows = backend(query, kind, page_size + 1, (page - 1) * page_size)
+    results = [
+        {'type': k, 'id': str(_uuid(object_id)), 'title': title, 'snippet': snippet, 'rank': round(float(rank), 4)}
+        for k, object_id, title, snippet, rank in rows[:page_size]
+    ]
+    return results, len(rows) > page_size
+
+
+def search_object_ids(query, kind, limit=1000):
+    """Ids of the best-matching objects of one kind (used by the admin search box)"""
+    backend = BACKENDS.get(connection.vendor, _search_fallback)
+    return [_uuid(object_id) for _k, object_id, _t, _s, _r in backend(query, kind, limit, 0)]
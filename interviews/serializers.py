@@ -1,11 +1,16 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
-from .models import JobDescription, Candidate, Interview, Question, Answer
+from .models import JobDescription, Candidate, Interview, Question, Answer, WebhookEndpoint
 
 class JobDescriptionSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobDescription
-        fields = ['id', 'title', 'description', 'questions', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'questions', 'created_at', 'updated_at']
+        fields = [
+            'id', 'title', 'description', 'questions', 'questions_status', 'callback_url',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'questions', 'questions_status', 'created_at', 'updated_at']
 
 class CandidateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -36,7 +41,7 @@ class AnswerSerializer(serializers.ModelSerializer):
         return None
 
 class InterviewSerializer(serializers.ModelSerializer):
-    questions = QuestionSerializer(many=True, read_only=True)
+    questions = QuestionSerializer(source='question_list', many=True, read_only=True)
     candidate = CandidateSerializer(read_only=True)
     job_description = JobDescriptionSerializer(read_only=True)
     
@@ -57,8 +62,32 @@ class InterviewCreateSerializer(serializers.ModelSerializer):
         model = Interview
         fields = ['job_description', 'candidate']
 
+class WebhookEndpointSerializer(serializers.ModelSerializer):
+    """Webhook subscription; the signing secret is only returned when the endpoint is created"""
+    class Meta:
+        model = WebhookEndpoint
+        fields = ['id', 'url', 'events', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate_url(self, value):
+        from .tasks import validate_callback_url
+        try:
+            # The host is resolved and checked again before every delivery
+            validate_callback_url(value, resolve=False, allowed_hosts=settings.WEBHOOKS['ALLOWED_HOSTS'])
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return value
+    
+    def validate_events(self, value):
+        known = {event for event, _label in WebhookEndpoint.EVENT_CHOICES}
+        if not isinstance(value, list) or not all(isinstance(event, str) for event in value):
+            raise serializers.ValidationError("events must be a list of event names")
+        unknown = sorted(set(value) - known)
+        if unknown:
+            raise serializers.ValidationError(f"Unknown events: {', '.join(unknown)}")
+        return value
+
 
-from .utils import generate_transcript_from_audio
 class InterviewResultSerializer(serializers.ModelSerializer):
     candidate_name = serializers.CharField(source='candidate.name', read_only=True)
     questions = serializers.SerializerMethodField()
@@ -71,8 +100,8 @@ class InterviewResultSerializer(serializers.ModelSerializer):
         questions_data = []
         request = self.context.get("request")
 
-        for question in obj.questions.all():
-            answer = question.answers.first()
+        for question in obj.question_list:
+            answer = obj.get_answer(question)
 
             transcript = None
             if answer:
@@ -0,0 +1,273 @@
+"""Background tasks run outside the request/response cycle in a shared worker pool"""
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import ipaddress
+import logging
+import socket
+import threading
+import time
+import weakref
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import tracing
+from .log import get_log_context, log_context
+from .metrics import registry, span
+from .models import JobDescription, QuestionSet, Interview, Answer
+
+logger = logging.getLogger(__name__)
+
+answer_evaluations = registry.counter('answer_evaluations_total', 'Per-answer evaluations by outcome')
+interview_finalize_latency = registry.histogram(
+    'interview_finalize_seconds', 'Time from call completion to the final recommendation being saved'
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide worker pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_TASK_WORKERS,
+                thread_name_prefix='interviews-task'
+            )
+        return _executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        # The log context carries the enqueuing request's interview id
+        with tracing.task_span(f"task {func.__name__}", get_log_context().get('interview_id')):
+            return func(*args, **kwargs)
+    except Exception as e:
+        logger.exception("Background task %s failed: %s", func.__name__, e)
+    finally:
+        close_old_connections()
+
+
+def enqueue(func, *args, **kwargs):
+    """Run `func` in the worker pool once the current transaction commits.
+
+    The task keeps the caller's log context (interview, call and question ids).
+    """
+    context = contextvars.copy_context()
+    if settings.BACKGROUND_TASKS_EAGER:
+        transaction.on_commit(lambda: context.run(_run, func, args, kwargs))
+    else:
+        transaction.on_commit(lambda: get_executor().submit(context.run, _run, func, args, kwargs))
+
+
+def generate_job_description_questions(job_description_id):
+    """Generate questions for a pending job description and notify its callback URL"""
+    from .ai import generate_questions_from_jd
+
+    job_description = JobDescription.objects.get(id=job_description_id)
+    try:
+        # No generic fallback questions here: a failed generation is reported and can be retried
+        questions = generate_questions_from_jd(job_description.description, fallback=False)
+        with transaction.atomic():
+            job_description.questions = questions
+            job_description.questions_status = 'ready'
+            job_description.save(update_fields=['questions', 'questions_status', 'updated_at'])
+            QuestionSet.objects.create_for_job_description(job_description, questions)
+    except Exception as e:
+        logger.error("Error generating questions for job description %s: %s", job_description_id, e)
+        job_description.questions_status = 'failed'
+        job_description.save(update_fields=['questions_status', 'updated_at'])
+
+    if job_description.callback_url:
+        notify_job_description_callback(job_description)
+
+    if job_description.questions_status == 'ready' and settings.TTS['PRERENDER_ENABLED']:
+        prerender_job_description_prompts(job_description_id)
+
+
+def prerender_job_description_prompts(job_description_id):
+    """Synthesize the shared prompts and the job description's questions ahead of any call"""
+    from .tts import BOILERPLATE_PROMPTS, question_prompt, render_prompt
+
+    job_description = JobDescription.objects.get(id=job_description_id)
+    question_set = job_description.get_current_question_set()
+    questions = question_set.questions.all() if question_set else []
+    texts = BOILERPLATE_PROMPTS + [question_prompt(question) for question in questions]
+    rendered = 0
+    for text in texts:
+        try:
+            render_prompt(text)
+            rendered += 1
+        except Exception as e:
+            # Unrendered prompts are spoken with <Say> instead
+            logger.warning("Error rendering prompt %r: %s", text[:40], e)
+    logger.info("Pre-rendered %d/%d prompts for job description %s", rendered, len(texts), job_description_id)
+
+
+def validate_callback_url(url, resolve=True, allowed_hosts=None):
+    """Raise ValidationError unless `url` is https and its host resolves only to public addresses.
+
+    Callback and webhook URLs come from API clients, so this keeps the server
+    from being used to reach internal services. Hosts in `allowed_hosts`
+    (default JOB_DESCRIPTION_CALLBACK_ALLOWED_HOSTS) are trusted as is (http allowed).
+    Without `resolve` only the URL itself is checked (an IP literal must still
+    be public), so request handlers never wait on DNS; the host is resolved
+    again right before each send.
+    """
+    URLValidator(schemes=['http', 'https'])(url)
+    parts = urlsplit(url)
+    if allowed_hosts is None:
+        allowed_hosts = settings.JOB_DESCRIPTION_CALLBACK_ALLOWED_HOSTS
+    if parts.hostname in allowed_hosts:
+        return
+    if parts.scheme != 'https':
+        raise ValidationError("URL must use https")
+    try:
+        addresses = {str(ipaddress.ip_address(parts.hostname))}
+    except ValueError:
+        if not resolve:
+            return
+        try:
+            addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, parts.port or 443, proto=socket.IPPROTO_TCP)}
+        except (socket.gaierror, UnicodeError):
+            raise ValidationError("URL host does not resolve")
+    for address in addresses:
+        if not ipaddress.ip_address(address.split('%')[0]).is_global:
+            raise ValidationError("URL must not point to a private, loopback or reserved address")
+
+
+def notify_job_description_callback(job_description):
+    """POST the job description to the client's callback URL once questions are settled"""
+    from .serializers import JobDescriptionSerializer
+
+    try:
+        # Checked again at send time: the host may resolve differently than when it was submitted
+        validate_callback_url(job_description.callback_url)
+        with span('callback.job_description'):
+            response = requests.post(
+                job_description.callback_url,
+                json=JobDescriptionSerializer(job_description).data,
+                timeout=settings.JOB_DESCRIPTION_CALLBACK_TIMEOUT,
+                allow_redirects=False
+            )
+        logger.info("Job description callback returned %s for %s", response.status_code, job_description.id)
+    except Exception as e:
+        logger.warning("Error calling job description callback for %s: %s", job_description.id, e)
+
+
+# The webhook-triggered evaluation and finalize_interview must never transcribe
+# or score the same answer twice. Threads of one process wait on a per-answer
+# lock; other processes see the claim in Answer.evaluation_started_at.
+_answer_locks = weakref.WeakValueDictionary()
+_answer_locks_lock = threading.Lock()
+_CLAIM_POLL_INTERVAL = 0.5  # seconds between checks of another process's claim
+
+
+def _answer_lock(answer_id):
+    with _answer_locks_lock:
+        lock = _answer_locks.get(answer_id)
+        if lock is None:
+            lock = _answer_locks[answer_id] = threading.Lock()
+        return lock
+
+
+def _claim_evaluation(answer_id):
+    """Claim an unscored answer for this worker; False if it is scored or another worker's claim is live"""
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.ANSWER_EVALUATION_LEASE)
+    return bool(
+        Answer.objects.filter(pk=answer_id, score__isnull=True)
+        .filter(Q(evaluation_started_at__isnull=True) | Q(evaluation_started_at__lt=expired))
+        .update(evaluation_started_at=now)
+    )
+
+
+def evaluate_answer(answer_id, wait=0):
+    """Transcribe (if needed) and score one answer; safe to call repeatedly.
+
+    If another process is evaluating the answer, waits up to `wait` seconds
+    for it to finish, then returns None without evaluating.
+    """
+    with _answer_lock(answer_id):
+        deadline = time.monotonic() + wait
+        claimed = _claim_evaluation(answer_id)
+        while not claimed:
+            if Answer.objects.filter(pk=answer_id, score__isnull=False).exists():
+                break
+            if time.monotonic() >= deadline:
+                answer_evaluations.inc(outcome='in_progress')
+                return None
+            time.sleep(_CLAIM_POLL_INTERVAL)
+            claimed = _claim_evaluation(answer_id)
+        try:
+            answer = Answer.objects.select_related('question', 'interview__candidate').get(id=answer_id)
+            with log_context(interview_id=answer.interview_id, question_id=answer.question_id):
+                return _evaluate(answer)
+        finally:
+            if claimed:
+                Answer.objects.filter(pk=answer_id).update(evaluation_started_at=None)
+
+
+def _evaluate(answer):
+    from .ai import score_answer
+    from .transcription import generate_transcript_from_audio
+
+    if not answer.transcript and answer.audio_file:
+        with span('evaluate.transcribe'):
+            generate_transcript_from_audio(answer)
+    if not answer.transcript:
+        answer_evaluations.inc(outcome='no_transcript')
+        return None
+    if answer.score is not None:
+        answer_evaluations.inc(outcome='already_scored')
+        return answer.score
+
+    score, feedback = score_answer(
+        answer.question.question_text,
+        answer.transcript,
+        answer.interview.candidate.resume_context(f"{answer.question.question_text} {answer.transcript}")
+    )
+    answer.score = score
+    answer.feedback = feedback
+    answer.save(update_fields=['score', 'feedback'])
+    answer_evaluations.inc(outcome='scored')
+    logger.info("Answer %s scored %s/10", answer.id, score)
+    return score
+
+
+def finalize_interview(interview_id):
+    """Evaluate any answers not yet scored, then store the final recommendation"""
+    from .ai import generate_final_recommendation
+
+    started = time.perf_counter()
+    # Answers are prefetched for generate_final_recommendation, which reads one per question
+    interviews = Interview.objects.select_related('candidate').prefetch_related('answers')
+    interview = interviews.get(id=interview_id)
+    # Answers evaluated while the call was running are skipped; ones still in
+    # flight, in this process or another, are waited for
+    unscored = [answer.id for answer in interview.answers.all() if answer.score is None]
+    for answer_id in unscored:
+        try:
+            evaluate_answer(answer_id, wait=settings.ANSWER_EVALUATION_LEASE)
+        except Exception as e:
+            logger.exception("Error evaluating answer %s: %s", answer_id, e)
+    if unscored:
+        interview = interviews.get(id=interview_id)
+
+    with span('finalize.recommendation'):
+        interview.recommendation = generate_final_recommendation(interview)
+    with transaction.atomic():
+        # Outbound webhook events commit with the recommendation
+        interview.save(update_fields=['recommendation', 'updated_at'])
+    interview_finalize_latency.observe(time.perf_counter() - started)
+    logger.info("Interview %s finalized in %.2fs", interview_id, time.perf_counter() - started)
@@ -0,0 +1,154 @@
+"""Twilio calls, TwiML generation and phone number handling"""
+import logging
+import re
+from django.conf import settings
+from django.core import signing
+from twilio.twiml.voice_response import VoiceResponse, Start
+from .clients import get_twilio_client
+from .metrics import span
+from .tts import WELCOME_PROMPT, question_prompt, say, say_or_play
+
+logger = logging.getLogger(__name__)
+
+def validate_phone_number(phone):
+    """Validate and format phone number to E.164"""
+    try:
+        # Remove all non-digit characters
+        digits = re.sub(r'\D', '', phone)
+        
+        # Handle different formats
+        if len(digits) == 10:
+            # 10-digit number - add country code (assuming India)
+            digits = '91' + digits
+        elif len(digits) == 12 and digits.startswith('91'):
+            # 12-digit number starting with 91 (India)
+            pass
+        elif len(digits) == 11 and digits.startswith('1'):
+            # 11-digit number starting with 1 (US)
+            pass
+        elif len(digits) == 12 and digits.startswith('1'):
+            # 12-digit number starting with 1 (US)
+            pass
+        elif phone.startswith('+'):
+            # Already in E.164 format
+            return phone
+        else:
+            logger.info("Invalid phone number format: %s", phone)
+            return None
+        
+        return f"+{digits}"
+    except Exception as e:
+        logger.warning("Error validating phone number %s: %s", phone, e)
+        return None
+
+def is_whitelisted_number(phone):
+    """Check if phone number is whitelisted for testing"""
+    # Allow all numbers if "*" is in the whitelist
+    if "*" in settings.WHITELISTED_NUMBERS:
+        return True
+    return phone in settings.WHITELISTED_NUMBERS
+
+def create_twilio_call(interview):
+    """Create a Twilio call for the interview"""
+    try:
+        # Generate TwiML for the interview
+        twiml_url = f"{settings.BASE_URL}/api/webhook/interview/{interview.id}/twiml/"
+        status_callback_url = f"{settings.BASE_URL}/api/webhook/interview/{interview.id}/status/"
+        
+        logger.debug("Creating Twilio call from %s, TwiML URL %s", settings.TWILIO_PHONE_NUMBER, twiml_url)
+        
+        with span('twilio.create_call'):
+            call = get_twilio_client().calls.create(
+                url=twiml_url,
+                to=interview.candidate.phone,
+                from_=settings.TWILIO_PHONE_NUMBER,
+                record=True,
+                status_callback=status_callback_url,
+                status_callback_event=['completed']
+            )
+        
+        logger.info("Twilio call created: %s", call.sid)
+        return call.sid
+        
+    except Exception as e:
+        logger.exception("Error creating Twilio call: %s", e)
+        return None
+
+def media_stream_url():
+    """Websocket URL Twilio Media Streams connect to, derived from BASE_URL"""
+    base_url = settings.BASE_URL.rstrip('/')
+    if base_url.startswith('https://'):
+        base_url = 'wss://' + base_url[len('https://'):]
+    elif base_url.startswith('http://'):
+        base_url = 'ws://' + base_url[len('http://'):]
+    return f"{base_url}{settings.TWILIO_MEDIA_STREAMS['PATH']}"
+
+MEDIA_STREAM_TOKEN_SALT = 'interviews.media_stream'
+
+def media_stream_token(interview_id, call_sid):
+    """Signed token allowing one call's Media Stream to feed audio for `interview_id`"""
+    return signing.dumps([str(interview_id), call_sid or ''], salt=MEDIA_STREAM_TOKEN_SALT)
+
+def verify_media_stream_token(token, interview_id, call_sid):
+    """Whether `token` was issued by `media_stream_token` for this interview and call and hasn't expired"""
+    if not token or not call_sid:
+        return False
+    try:
+        signed = signing.loads(
+            token, salt=MEDIA_STREAM_TOKEN_SALT, max_age=settings.TWILIO_MEDIA_STREAMS['TOKEN_MAX_AGE']
+        )
+    except signing.BadSignature:
+        return False
+    return signed == [str(interview_id), call_sid]
+
+def generate_interview_twiml(interview, call_sid=None):
+    """Generate TwiML for the interview call; `call_sid` is the CallSid of the TwiML request"""
+    try:
+        response = VoiceResponse()
+        
+        if settings.TWILIO_MEDIA_STREAMS['ENABLED']:
+            # Fork the caller's audio to our websocket so answers are transcribed while they speak
+            start = Start()
+            stream = start.stream(url=media_stream_url(), track='inbound_track')
+            stream.parameter(name='interview_id', value=str(interview.id))
+            # The websocket is public; only streams presenting this token for this call are transcribed
+            stream.parameter(name='token', value=media_stream_token(interview.id, call_sid))
+            response.append(start)
+        
+        # Welcome message; the greeting is personal, the rest is shared and can be pre-rendered
+        say(response, f"Hello {interview.candidate.name}.")
+        say_or_play(response, WELCOME_PROMPT)
+        
+        # Get questions
+        questions = interview.questions.all().order_by('question_number')
+        if not questions.exists():
+            say(response, "No questions found for this interview. Please contact support.")
+            return str(response)
+        
+        # Only add the first question to the initial TwiML
+        # Subsequent questions will be handled by the answer webhook
+        first_question = questions.first()
+        
+        say_or_play(response, question_prompt(first_question))
+        response.pause(length=1)
+        
+        # Record answer for first question
+        record_action = f"/api/webhook/interview/{interview.id}/answer/{first_question.id}/"
+        
+        response.record(
+            action=record_action,
+            maxLength=120,  # 2 minutes max
+            playBeep=True,
+            trim='trim-silence'
+        )
+        logger.debug("Generated TwiML with first question %s", first_question.id)
+        
+        return str(response)
+        
+    except Exception as e:
+        logger.exception("Error generating TwiML: %s", e)
+        
+        # Return a simple error TwiML
+        error_response = VoiceResponse()
+        say(error_response, "We are sorry, an error occurred while generating the interview. Please try again later.")
+        return str(error_response)
@@ -0,0 +1,24 @@
+"""Local stand-ins for the OpenAI, AssemblyAI and Twilio APIs.
+
+Each fake is a real HTTP server on 127.0.0.1, so requests go through the
+production clients (the `openai` SDK, the pooled AssemblyAI session, the
+Twilio REST client) and their retry and timeout handling. Latency
+distributions, error rates and 429s are configurable per server:
+
+    with FakeOpenAI(latency=Latency(0.4, 0.5), rate_limit_rate=0.05) as openai_api:
+        with override_settings(OPENAI_BASE_URL=openai_api.base_url):
+            ...
+
+Settings take the servers' URLs through OPENAI_BASE_URL,
+TRANSCRIPTION['ASSEMBLYAI_BASE_URL'] and TWILIO_API_BASE_URL;
+`manage.py run_fake_providers` starts all three for a dev server or CI job.
+`FakeWebhookReceiver` stands in for a client system subscribed to outbound
+webhooks.
+
+`assert_query_budget` fails a block that runs too many queries or an N+1
+pattern (see `interviews.queries`).
+"""
+from .providers import FakeAssemblyAI, FakeOpenAI, FakeTwilio, FakeWebhookReceiver, silent_wav
+from .queries import assert_query_budget
+from .server import FakeRequest, FakeResponse, FakeServer, Latency, route
+
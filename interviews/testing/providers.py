@@ -0,0 +1,210 @@
+import io
+import itertools
+import threading
+import time
+import uuid
+import wave
+
+from ..llm import FakeBackend
+from ..webhooks import SIGNATURE_HEADER, sign
+from .server import FakeResponse, FakeServer, Latency, route
+
+
+def silent_wav(seconds=3, rate=8000):
+    """A mono 16-bit WAV shaped like a Twilio call recording, with a faint tone so it isn't empty"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b''.join(
+            (800 if (i // 20) % 2 else -800).to_bytes(2, 'little', signed=True) for i in range(rate * seconds)
+        ))
+    return buffer.getvalue()
+
+
+class FakeOpenAI(FakeServer):
+    """Chat completions, Whisper transcriptions and speech, served at `url + '/v1'`.
+
+    Chat replies come from `handler(messages)` if given, otherwise
+    `FakeBackend.default_response`, so the pipeline's JSON parsing works.
+    """
+    name = 'openai'
+
+    def __init__(self, handler=None, transcript_text='Fake Whisper transcript of the answer.', **options):
+        super().__init__(**options)
+        self.handler = handler or FakeBackend.default_response
+        self.transcript_text = transcript_text
+
+    @property
+    def base_url(self):
+        return self.url + '/v1'
+
+    def error_body(self, status, message):
+        kind = 'rate_limit_exceeded' if status == 429 else 'server_error'
+        return {'error': {'message': message, 'type': kind, 'code': kind}}
+
+    @route('POST', r'/v1/chat/completions')
+    def chat_completion(self, request):
+        payload = request.json()
+        messages = payload.get('messages', [])
+        content = self.handler(messages)
+        prompt_tokens = sum(len(message.get('content') or '') for message in messages) // 4
+        return FakeResponse.json({
+            'id': f'chatcmpl-{uuid.uuid4().hex[:24]}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'gpt-4o-mini'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': len(content) // 4,
+                'total_tokens': prompt_tokens + len(content) // 4,
+            },
+        })
+
+    @route('POST', r'/v1/audio/transcriptions')
+    def transcription(self, request):
+        return FakeResponse.json({'text': self.transcript_text})
+
+    @route('POST', r'/v1/audio/speech')
+    def speech(self, request):
+        return FakeResponse(body=silent_wav(1), content_type='audio/mpeg')
+
+
+class FakeAssemblyAI(FakeServer):
+    """Upload, transcript request and status polling, served at `url + '/v2'`.
+
+    A transcript reports "processing" until a `processing_time` sample has
+    elapsed, then "completed" (or "error", at `transcript_error_rate`).
+    """
+    name = 'assemblyai'
+
+    def __init__(self, processing_time=None, transcript_error_rate=0.0,
+                 transcript_text='Fake AssemblyAI transcript of the answer.', **options):
+        super().__init__(**options)
+        self.processing_time = (
+            processing_time if isinstance(processing_time, Latency) else Latency(processing_time or 0.0)
+        )
+        self.transcript_error_rate = transcript_error_rate
+        self.transcript_text = transcript_text
+        self.transcripts = {}
+
+    @property
+    def base_url(self):
+        return self.url + '/v2'
+
+    @route('POST', r'/v2/upload')
+    def upload(self, request):
+        return FakeResponse.json({'upload_url': f'{self.url}/v2/files/{uuid.uuid4().hex}'})
+
+    @route('POST', r'/v2/transcript')
+    def create_transcript(self, request):
+        transcript_id = uuid.uuid4().hex
+        with self._lock:
+            ready_at = time.monotonic() + self.processing_time.sample(self._rng)
+            failed = self._rng.random() < self.transcript_error_rate
+        self.transcripts[transcript_id] = (ready_at, failed, request.json().get('audio_url'))
+        return FakeResponse.json({'id': transcript_id, 'status': 'queued'})
+
+    @route('GET', r'/v2/transcript/(?P<transcript_id>\w+)')
+    def get_transcript(self, request):
+        transcript_id = request.params['transcript_id']
+        if transcript_id not in self.transcripts:
+            return FakeResponse.json({'error': 'Transcript not found'}, 404)
+        ready_at, failed, audio_url = self.transcripts[transcript_id]
+        body = {'id': transcript_id, 'audio_url': audio_url, 'status': 'processing', 'text': None}
+        if time.monotonic() >= ready_at:
+            if failed:
+                body.update(status='error', error='Injected transcription error')
+            else:
+                body.update(status='completed', text=self.transcript_text)
+        return FakeResponse.json(body)
+
+    @route('GET', r'/v2/transcript')
+    def list_transcripts(self, request):
+        return FakeResponse.json({'transcripts': [], 'page_details': {'limit': int(request.query.get('limit', 10))}})
+
+
+class FakeTwilio(FakeServer):
+    """Outbound calls and call recordings, served at `url` in place of https://api.twilio.com.
+
+    Created calls are kept in `calls` with the request parameters (Url,
+    StatusCallback, To, ...) so a test can drive the webhooks itself.
+    """
+    name = 'twilio'
+
+    def __init__(self, account_sid='AC' + '0' * 32, recording=None, **options):
+        super().__init__(**options)
+        self.account_sid = account_sid
+        self.recording = recording or silent_wav()
+        self.calls = []
+        self._call_numbers = itertools.count(1)
+
+    def recording_url(self, recording_sid):
+        """The RecordingUrl Twilio would post to the answer webhook"""
+        return f"{self.url}/2010-04-01/Accounts/{self.account_sid}/Recordings/{recording_sid}"
+
+    def error_body(self, status, message):
+        return {'code': 20429 if status == 429 else 20500, 'message': message, 'status': status}
+
+    @route('POST', r'/2010-04-01/Accounts/(?P<account_sid>\w+)/Calls\.json')
+    def create_call(self, request):
+        params = request.form()
+        call_sid = f"CA{next(self._call_numbers):032x}"
+        self.calls.append({'sid': call_sid, **params})
+        now = time.strftime('%a, %d %b %Y %H:%M:%S +0000', time.gmtime())
+        return FakeResponse.json({
+            'sid': call_sid,
+            'account_sid': request.params['account_sid'],
+            'to': params.get('To'),
+            'from': params.get('From'),
+            'status': 'queued',
+            'direction': 'outbound-api',
+            'date_created': now,
+            'date_updated': now,
+            'uri': f"/2010-04-01/Accounts/{request.params['account_sid']}/Calls/{call_sid}.json",
+        }, 201)
+
+    @route('GET', r'/2010-04-01/Accounts/(?P<account_sid>\w+)/Recordings/(?P<recording_sid>\w+)(?:\.wav)?')
+    def recording_media(self, request):
+        return FakeResponse(body=self.recording, content_type='audio/x-wav')
+
+
+class FakeWebhookReceiver(FakeServer):
+    """A client system receiving outbound webhooks at `endpoint_url`.
+
+    Batches signed with something other than `secret` (when set) get a 401.
+    Accepted events are kept in `events` by id, deduplicated as real receivers
+    should; `deliveries` counts every event received, duplicates included.
+    """
+    name = 'webhooks'
+
+    def __init__(self, secret=None, **options):
+        super().__init__(**options)
+        self.secret = secret
+        self.events = {}
+        self.deliveries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def endpoint_url(self):
+        return f"{self.url}/hooks"
+
+    @route('POST', r'/hooks')
+    def receive(self, request):
+        if self.secret:
+            signature = request.headers.get(SIGNATURE_HEADER.lower(), '')
+            timestamp = dict(part.split('=', 1) for part in signature.split(',') if '=' in part).get('t')
+            if signature != sign(self.secret, request.body, timestamp):
+                return FakeResponse.json(self.error_body(401, 'Bad signature'), 401)
+        deliveries = request.json()['deliveries']
+        with self._lock:
+            self.deliveries += len(deliveries)
+            for event in deliveries:
+                self.events[event['id']] = event
+        return FakeResponse.json({'received': len(deliveries)})
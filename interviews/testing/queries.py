@@ -0,0 +1,23 @@
+import contextlib
+
+from django.conf import settings
+
+from ..queries import QueryBudgetExceeded, QueryRecorder
+
+
+@contextlib.contextmanager
+def assert_query_budget(max_queries=None, n_plus_one_threshold=None):
+    """Fail with QueryBudgetExceeded if the block runs more than `max_queries` queries or an N+1 pattern.
+
+        with assert_query_budget(max_queries=6):
+            client.get('/api/interviews/', HTTP_X_API_KEY=key)
+
+    `n_plus_one_threshold` defaults to QUERY_BUDGETS['N_PLUS_ONE_THRESHOLD'].
+    """
+    if n_plus_one_threshold is None:
+        n_plus_one_threshold = settings.QUERY_BUDGETS['N_PLUS_ONE_THRESHOLD']
+    with QueryRecorder() as recorder:
+        yield recorder
+    problems = recorder.violations(max_queries, n_plus_one_threshold)
+    if problems:
+        raise QueryBudgetExceeded('; '.join(problems) + '\n' + '\n'.join(sql for sql, _seconds in recorder.queries))
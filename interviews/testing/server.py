@@ -0,0 +1,196 @@
+import inspect
+import json
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class Latency:
+    """Per-request delay: log-normal around `median` seconds, or fixed when `sigma` is 0.
+
+    Real API latencies are right-skewed; sigma=0.5 gives a p95 about 2.3x the median.
+    """
+    median: float = 0.0
+    sigma: float = 0.0
+
+    @classmethod
+    def parse(cls, value):
+        """'0.3' (fixed) or '0.3,0.5' (median, sigma)"""
+        median, _, sigma = str(value).partition(',')
+        return cls(float(median), float(sigma or 0))
+
+    def sample(self, rng):
+        if self.median <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.median
+        return rng.lognormvariate(0, self.sigma) * self.median
+
+
+@dataclass
+class FakeRequest:
+    method: str
+    path: str
+    query: dict
+    headers: dict
+    body: bytes
+    params: dict = field(default_factory=dict)  # named groups from the route
+
+    def json(self):
+        return json.loads(self.body or b'{}')
+
+    def form(self):
+        return {key: values[-1] for key, values in parse_qs(self.body.decode()).items()}
+
+
+@dataclass
+class FakeResponse:
+    status: int = 200
+    body: bytes = b''
+    content_type: str = 'application/json'
+    headers: dict = field(default_factory=dict)
+
+    @classmethod
+    def json(cls, data, status=200, **headers):
+        return cls(status, json.dumps(data).encode(), 'application/json', headers)
+
+
+def route(method, pattern):
+    """Mark a FakeServer method as the handler for `method` requests whose path matches `pattern`"""
+    def decorator(func):
+        func.route = (method, re.compile(pattern + '$'))
+        return func
+    return decorator
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on slow responses when their timeouts expire; that's expected here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FakeServer:
+    """A local HTTP server standing in for a provider API, with injected latency and faults.
+
+    Each request waits for a `latency` sample, then fails with a 429 (with
+    Retry-After) at `rate_limit_rate` or a 500 at `error_rate`, and otherwise
+    reaches the matching `@route` handler. Requests are recorded in `requests`
+    as (method, path, status). Use as a context manager, or `start()`/`stop()`.
+    """
+    name = 'fake'
+
+    def __init__(self, latency=None, error_rate=0.0, rate_limit_rate=0.0, retry_after=1, seed=None, port=0):
+        self.latency = latency if isinstance(latency, Latency) else Latency(latency or 0.0)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.requests = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes = [
+            (func.route, getattr(self, name)) for name, func in inspect.getmembers(type(self))
+            if hasattr(func, 'route')
+        ]
+        self.server = _HTTPServer(('127.0.0.1', port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name=f'{self.name}-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, method=None, path_pattern=None, status=None):
+        """Number of recorded requests matching all the given filters"""
+        return sum(
+            1 for m, path, s in list(self.requests)
+            if (method is None or m == method)
+            and (path_pattern is None or re.search(path_pattern, path))
+            and (status is None or s == status)
+        )
+
+    def error_body(self, status, message):
+        return {'error': message}
+
+    def handle(self, request):
+        with self._lock:
+            delay = self.latency.sample(self._rng)
+            fault = self._rng.random()
+        if delay:
+            time.sleep(delay)
+
+        if fault < self.rate_limit_rate:
+            response = FakeResponse.json(
+                self.error_body(429, 'Rate limit exceeded'), 429, **{'Retry-After': str(self.retry_after)}
+            )
+        elif fault < self.rate_limit_rate + self.error_rate:
+            response = FakeResponse.json(self.error_body(500, 'Injected server error'), 500)
+        else:
+            response = self._dispatch(request)
+
+        with self._lock:
+            self.requests.append((request.method, request.path, response.status))
+        return response
+
+    def _dispatch(self, request):
+        for (method, pattern), handler in self._routes:
+            match = pattern.match(request.path)
+            if method == request.method and match:
+                request.params = match.groupdict()
+                return handler(request)
+        return FakeResponse.json(self.error_body(404, f"No route for {request.method} {request.path}"), 404)
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, like the real APIs behind pooled clients
+
+            def _serve(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                request = FakeRequest(
+                    method=self.command,
+                    path=url.path,
+                    query={key: values[-1] for key, values in parse_qs(url.query).items()},
+                    headers={key.lower(): value for key, value in self.headers.items()},
+                    body=self.rfile.read(length) if length else b'',
+                )
+                response = fake.handle(request)
+                self.send_response(response.status)
+                self.send_header('Content-Type', response.content_type)
+                self.send_header('Content-Length', str(len(response.body)))
+                for key, value in response.headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(response.body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -1,3 +1,946 @@
-from django.test import TestCase
+import asyncio
+import base64
+import html
+import importlib
+import json
+import math
+import os
+import re
+import socket
+import tempfile
+import time
+import wave
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import openai
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import events, idempotency, response_cache
+from .ai import FAILED_RECOMMENDATION, generate_questions_from_jd, get_cached_questions, score_answer
+from .llm import FakeBackend, LLMError, LLMGateway, reset_llm_gateway
+from .media_streams import FrameRecorder, media_stream_app
+from .metrics import collect_spans, registry, span, stage_errors, stage_latency
+from .models import (
+    Answer, Candidate, Interview, JobDescription, Question, QuestionGenerationCache, QuestionSet, WebhookDelivery,
+    WebhookEndpoint,
+)
+from .queries import QueryBudgetExceeded
+from .search import search
+from .tasks import finalize_interview
+from .telephony import media_stream_token
+from .transcription.base import TranscriptionBackend, TranscriptionError, TranscriptionResult
+from .transcription.chunking import transcribe_chunked
+from .transcription.routing import RoutingBackend
+from .testing import FakeTwilio, FakeWebhookReceiver, assert_query_budget
+from .webhooks import WebhookDispatcher, record_event
+
+
+def make_gateway(backend, max_retries=2):
+    """A gateway with fast retries that doesn't replace the process-wide one"""
+    return LLMGateway(
+        backend, requests_per_minute=1000, tokens_per_minute=1_000_000, max_concurrency=4,
+        timeout=5, max_retries=max_retries, retry_base_delay=0.01, retry_max_delay=0.02
+    )
+
+
+class LLMGatewayTests(TestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        reset_llm_gateway(self.backend)
+        self.addCleanup(reset_llm_gateway)
+
+    def test_generates_questions_once_per_job_description(self):
+        questions = generate_questions_from_jd("Senior Python developer, Django and PostgreSQL")
+        self.assertTrue(5 <= len(questions) <= 7)
+        self.assertTrue(all(question.startswith("Fake interview question") for question in questions))
+
+        # Re-posts with different whitespace and case are served from the cache
+        self.assertEqual(generate_questions_from_jd("senior python developer,  Django and PostgreSQL"), questions)
+        self.assertEqual(len(self.backend.calls), 1)
+
+    def test_generation_failure_is_raised_without_fallback(self):
+        self.backend.responses = ['not a JSON array', 'not a JSON array']
+        with self.assertRaises(ValueError):
+            generate_questions_from_jd("Data engineer", fallback=False)
+        self.assertEqual(len(generate_questions_from_jd("Data engineer")), 5)
+
+    def test_scores_answers(self):
+        self.assertEqual(score_answer("Why Kafka?", "Ordering and replay."), (7, 'Fake feedback.'))
+        self.assertEqual(self.backend.calls[0]['model'], 'gpt-4o-mini')
+
+    def test_retries_retryable_errors(self):
+        gateway = make_gateway(FakeBackend(responses=[asyncio.TimeoutError(), 'ok']))
+        self.addCleanup(gateway.close)
+        result = gateway.chat('test', [{'role': 'user', 'content': 'hi'}], 'gpt-4o-mini', 10, 0)
+        self.assertEqual((result.content, result.attempts), ('ok', 2))
+
+    def test_wraps_non_retryable_errors(self):
+        request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+        error = openai.BadRequestError("bad request", response=httpx.Response(400, request=request), body=None)
+        gateway = make_gateway(FakeBackend(responses=[error]))
+        self.addCleanup(gateway.close)
+        with self.assertRaises(LLMError) as raised:
+            gateway.chat('test', [{'role': 'user', 'content': 'hi'}], 'gpt-4o-mini', 10, 0)
+        self.assertIs(raised.exception.__cause__, error)
+
+    def test_gives_up_after_max_retries(self):
+        gateway = make_gateway(FakeBackend(responses=[asyncio.TimeoutError()] * 3), max_retries=1)
+        self.addCleanup(gateway.close)
+        with self.assertRaises(LLMError):
+            gateway.chat('test', [{'role': 'user', 'content': 'hi'}], 'gpt-4o-mini', 10, 0)
+
+
+class QuestionCacheTests(TestCase):
+    description = "Senior Python developer, Django and PostgreSQL"
+
+    def setUp(self):
+        self.backend = FakeBackend()
+        reset_llm_gateway(self.backend)
+        self.addCleanup(reset_llm_gateway)
+
+    def test_miss_generates_and_stores_the_full_list(self):
+        self.assertIsNone(get_cached_questions(self.description))
+        self.backend.responses = ['["Q1?", "Q2?", "Q3?", "Q4?", "Q5?", "Q6?", "Q7?", "Q8?"]']
+        questions = generate_questions_from_jd(self.description)
+        cached = QuestionGenerationCache.objects.get()
+        self.assertEqual(len(cached.questions), 8)
+        self.assertEqual(questions, cached.questions[:len(questions)])
+        self.assertEqual(cached.hit_count, 0)
+
+    def test_hit_is_counted_and_selects_the_same_questions(self):
+        questions = generate_questions_from_jd(self.description)
+        self.assertEqual(get_cached_questions(f"  {self.description.upper()}\n"), questions)
+        self.assertEqual(get_cached_questions(self.description), questions)
+        self.assertEqual(QuestionGenerationCache.objects.get().hit_count, 2)
+        self.assertEqual(len(self.backend.calls), 1)
+
+    def test_prompt_version_change_misses(self):
+        generate_questions_from_jd(self.description)
+        with mock.patch('interviews.ai.QUESTION_PROMPT_VERSION', 2):
+            self.assertIsNone(get_cached_questions(self.description))
+            generate_questions_from_jd(self.description)
+        self.assertEqual(QuestionGenerationCache.objects.count(), 2)
+
+    def test_failures_are_not_cached(self):
+        self.backend.responses = ['not JSON']
+        with self.assertLogs('interviews.ai', 'ERROR'):
+            fallback = generate_questions_from_jd(self.description)
+        self.assertEqual(len(fallback), 5)
+        self.assertFalse(QuestionGenerationCache.objects.exists())
+
+
+class QuestionSetTests(TestCase):
+    def setUp(self):
+        self.job_description = JobDescription.objects.create(title='Engineer', description='d', questions=['Old q1?', 'Old q2?'])
+        self.candidate = Candidate.objects.create(name='Ann', email='ann@example.com', phone='+15550001111')
+
+    def interview(self, question_set):
+        return Interview.objects.create(job_description=self.job_description, candidate=self.candidate, question_set=question_set)
+
+    def test_rows_without_a_set_get_version_one_from_their_questions(self):
+        question_set = self.job_description.get_current_question_set()
+        self.assertEqual(question_set.version, 1)
+        self.assertEqual([q.question_text for q in question_set.questions.order_by('question_number')], ['Old q1?', 'Old q2?'])
+        self.assertEqual(self.job_description.get_current_question_set(), question_set)
+
+    def test_interviews_keep_the_version_they_were_created_with(self):
+        first = QuestionSet.objects.create_for_job_description(self.job_description, ['Why Kafka?', 'Why Django?'])
+        interview = self.interview(first)
+        second = QuestionSet.objects.create_for_job_description(self.job_description, ['Why Rust?'])
+        self.assertEqual((first.version, second.version), (1, 2))
+        self.assertEqual(self.job_description.get_current_question_set(), second)
+        self.assertEqual([q.question_text for q in interview.question_list], ['Why Kafka?', 'Why Django?'])
+        self.assertEqual([q.question_text for q in self.interview(second).question_list], ['Why Rust?'])
+
+    def test_overrides_replace_a_shared_question_for_one_interview(self):
+        question_set = QuestionSet.objects.create_for_job_description(self.job_description, ['Why Kafka?', 'Why Django?'])
+        interview, other = self.interview(question_set), self.interview(question_set)
+        interview.override_question(2, 'Why Flask?')
+        self.assertEqual([q.question_text for q in Interview.objects.get(pk=interview.pk).question_list], ['Why Kafka?', 'Why Flask?'])
+        self.assertEqual([q.question_text for q in other.question_list], ['Why Kafka?', 'Why Django?'])
+
+    def test_migration_backfills_the_answer_interview(self):
+        interview = self.interview(None)
+        question = Question.objects.create(interview=interview, question_text='Why Kafka?', question_number=1)
+        answer = Answer.objects.create(question=question, transcript='Replay.')
+        migration = importlib.import_module('interviews.migrations.0004_question_sets')
+        migration.backfill_answer_interview(apps, None)
+        answer.refresh_from_db()
+        self.assertEqual(answer.interview_id, interview.pk)
+        self.assertEqual(interview.get_answer(question), answer)
+
+
+def write_wav(*parts):
+    """A 16kHz WAV of `parts`: ('tone', ms) for a loud 440Hz tone, ('silence', ms) for silence"""
+    frames = bytearray()
+    for kind, ms in parts:
+        for i in range(16 * ms):
+            sample = int(8000 * math.sin(2 * math.pi * 440 * i / 16000)) if kind == 'tone' else 0
+            frames += sample.to_bytes(2, 'little', signed=True)
+    fd, path = tempfile.mkstemp(suffix='.wav')
+    with open(fd, 'wb') as file, wave.open(file, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(bytes(frames))
+    return path
+
+
+class ScriptedBackend(TranscriptionBackend):
+    """Returns each file's duration as its text, or raises `error`; records the files it was given"""
+
+    def __init__(self, name, error=None):
+        super().__init__()
+        self.name = name
+        self.error = error
+        self.durations = []
+
+    def _transcribe(self, path):
+        if self.error:
+            raise TranscriptionError(self.error)
+        with wave.open(path) as f:
+            duration = f.getnframes() / f.getframerate()
+        self.durations.append(duration)
+        return TranscriptionResult(text=f"{duration:.1f}s", backend=self.name)
+
+
+class TranscriptionChunkingTests(TestCase):
+    def setUp(self):
+        self.backend = ScriptedBackend('scripted')
+
+    def transcribe(self, *parts):
+        path = write_wav(*parts)
+        self.addCleanup(os.remove, path)
+        return transcribe_chunked(path, self.backend, workers=2)
+
+    def test_splits_long_recordings_in_silences(self):
+        result = self.transcribe(('tone', 20000), ('silence', 1000), ('tone', 20000), ('silence', 1000), ('tone', 20000))
+        # Speech is merged until a chunk reaches 30s, then cut in the next pause (plus 300ms kept each side)
+        self.assertEqual(result.backend, 'scripted+chunked')
+        boundaries = [(round(s['start'], 1), round(s['end'], 1)) for s in result.segments]
+        self.assertEqual(boundaries, [(0.0, 41.3), (41.7, 62.0)])
+        self.assertEqual(result.text, '41.3s 20.3s')
+
+    def test_short_recordings_are_sent_whole(self):
+        result = self.transcribe(('tone', 5000), ('silence', 1000), ('tone', 5000))
+        self.assertEqual((result.backend, self.backend.durations), ('scripted', [11.0]))
+
+    def test_speech_without_pauses_is_cut_at_the_maximum(self):
+        with self.settings(TRANSCRIPTION={**settings.TRANSCRIPTION, 'CHUNK_MAX_SECONDS': 25}):
+            result = self.transcribe(('tone', 60000))
+        # Each cut keeps 300ms of the previous chunk
+        self.assertEqual([s['start'] for s in result.segments], [0.0, 24.7, 49.7])
+
+
+class RoutingBackendTests(TestCase):
+    def setUp(self):
+        self.path = write_wav(('tone', 100))
+        self.addCleanup(os.remove, self.path)
+
+    def test_prefers_the_fastest_backend(self):
+        fast, slow = ScriptedBackend('fast'), ScriptedBackend('slow')
+        router = RoutingBackend([slow, fast], explore_ratio=0)
+        router.record_latency('slow', 3.0)
+        router.record_latency('fast', 0.5)
+        self.assertEqual(router.transcribe_file(self.path).backend, 'fast')
+        self.assertEqual((len(fast.durations), len(slow.durations)), (1, 0))
+
+    def test_falls_back_and_demotes_a_failing_backend(self):
+        broken, working = ScriptedBackend('broken', error="503"), ScriptedBackend('working')
+        router = RoutingBackend([broken, working], explore_ratio=0)
+        router.record_latency('broken', 0.1)
+        router.record_latency('working', 2.0)
+        self.assertEqual(router.transcribe_file(self.path).backend, 'working')
+        self.assertEqual([b.name for b in router.ranked_backends()], ['working', 'broken'])
+        self.assertGreater(router.latencies['broken'], router.latencies['working'])
+
+    def test_raises_when_every_backend_fails(self):
+        router = RoutingBackend([ScriptedBackend('a', error="down"), ScriptedBackend('b', error="down")], explore_ratio=0)
+        with self.assertRaisesRegex(TranscriptionError, 'All transcription backends failed: a: down; b: down'):
+            router.transcribe_file(self.path)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+
+    def test_span_records_latency_and_errors(self):
+        with collect_spans() as spans:
+            with span('test.stage', kind='ok'):
+                pass
+            with self.assertRaises(RuntimeError), span('test.stage', kind='failing'):
+                raise RuntimeError("boom")
+
+        self.assertEqual([(s.stage, s.labels, s.error) for s in spans], [
+            ('test.stage', {'kind': 'ok'}, None),
+            ('test.stage', {'kind': 'failing'}, 'RuntimeError'),
+        ])
+        self.assertEqual(stage_latency.count(stage='test.stage', kind='ok'), 1)
+        self.assertEqual(stage_errors.value(stage='test.stage', kind='failing', error='RuntimeError'), 1)
+
+    def test_prometheus_endpoint(self):
+        with span('test.stage'):
+            pass
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION=f"Bearer {settings.API_KEY}")
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE stage_seconds histogram', body)
+        self.assertIn('stage_seconds_count{stage="test.stage"} 1', body)
+
+
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False})
+class QueryBudgetTests(TestCase):
+    """List and results views run a fixed number of queries however many rows they return"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.job_description = JobDescription.objects.create(title='Engineer', description='d', questions=['q1', 'q2', 'q3'])
+        cls.question_set = QuestionSet.objects.create_for_job_description(cls.job_description, ['q1', 'q2', 'q3'])
+        cls.interview = cls.add_interviews(2)[0]
+
+    def setUp(self):
+        self.backend = FakeBackend()
+        reset_llm_gateway(self.backend)
+        self.addCleanup(reset_llm_gateway)
+
+    @classmethod
+    def add_interviews(cls, count):
+        interviews = []
+        for n in range(count):
+            candidate = Candidate.objects.create(name=f'Candidate {n}', email=f'c{n}@example.com', phone='+15550001111')
+            interview = Interview.objects.create(
+                job_description=cls.job_description, candidate=candidate, question_set=cls.question_set,
+                status='completed', recommendation='Proceed.'
+            )
+            interview.override_question(2, 'Custom question two?')
+            for question in interview.questions:
+                Answer.objects.create(interview=interview, question=question, transcript='An answer', score=6)
+            interviews.append(interview)
+        return interviews
+
+    def get(self, url):
+        response = self.client.get(url, HTTP_X_API_KEY=settings.API_KEY)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list_views_within_budget(self):
+        budgets = settings.QUERY_BUDGETS['VIEWS']
+        self.add_interviews(8)
+        for url, view in [
+            ('/api/interviews/', 'list_interviews'),
+            ('/api/candidates/', 'list_candidates'),
+            ('/api/job-descriptions/', 'list_job_descriptions'),
+            ('/api/audio-files/', 'list_audio_files'),
+        ]:
+            with self.subTest(url=url), assert_query_budget(max_queries=budgets[view]):
+                self.get(url)
+
+    def test_results_within_budget(self):
+        with assert_query_budget(max_queries=settings.QUERY_BUDGETS['VIEWS']['get_interview_results']):
+            response = self.get(f'/api/interviews/{self.interview.id}/results/')
+        self.assertEqual(response.json()['evaluation_metadata']['scored_questions'], 3)
+
+    def test_finalize_reads_answers_once(self):
+        questions = [f"Question {n}?" for n in range(1, 7)]
+        job_description = JobDescription.objects.create(title='Analyst', description='d', questions=questions)
+        interview = Interview.objects.create(
+            job_description=job_description, candidate=self.interview.candidate, status='completed',
+            question_set=QuestionSet.objects.create_for_job_description(job_description, questions)
+        )
+        for question in interview.questions:
+            Answer.objects.create(interview=interview, question=question, transcript='An answer', score=6)
+
+        with assert_query_budget(n_plus_one_threshold=2):
+            finalize_interview(interview.id)
+        self.assertIn("Total Questions Answered: 6", self.backend.calls[-1]['messages'][-1]['content'])
+
+    def test_over_budget_fails(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with assert_query_budget(max_queries=1):
+                self.get('/api/interviews/')
+
+        options = {**settings.QUERY_BUDGETS, 'ENABLED': True, 'RAISE': True, 'VIEWS': {'list_interviews': 1}}
+        with override_settings(QUERY_BUDGETS=options), self.assertRaises(QueryBudgetExceeded), \
+                self.assertLogs('interviews.queries', 'WARNING'), self.assertLogs('django.request', 'ERROR') as logs:
+            self.get('/api/interviews/')
+        self.assertIn('Internal Server Error: /api/interviews/', logs.output[0])
+
+
+@override_settings(
+    ADAPTIVE_FOLLOWUPS_ENABLED=True, TWILIO_MEDIA_STREAMS={**settings.TWILIO_MEDIA_STREAMS, 'ENABLED': True},
+    TWILIO_WEBHOOK_IDEMPOTENCY={**settings.TWILIO_WEBHOOK_IDEMPOTENCY, 'ENABLED': False},
+)
+class FollowupTests(TestCase):
+    def setUp(self):
+        job_description = JobDescription.objects.create(title='Engineer', description='d', questions=['q1', 'q2'])
+        question_set = QuestionSet.objects.create_for_job_description(job_description, ['Why Kafka?', 'Why Django?'])
+        candidate = Candidate.objects.create(name='Ann', email='ann@example.com', phone='+15550001111')
+        self.interview = Interview.objects.create(
+            job_description=job_description, candidate=candidate, question_set=question_set, status='in_progress'
+        )
+        self.first, self.second = self.interview.question_list
+        self.backend = FakeBackend()
+        reset_llm_gateway(self.backend)
+        self.addCleanup(reset_llm_gateway)
+
+    def post_answer(self):
+        with mock.patch('interviews.views.claim_stream_transcript', return_value=("Ordering and replay.", [])):
+            return self.client.post(
+                f'/api/webhook/interview/{self.interview.id}/answer/{self.first.id}/', {'CallSid': 'CA1'}
+            )
+
+    def test_asks_a_followup(self):
+        response = self.post_answer()
+        self.assertIn(b'Can you give a specific example of that?', response.content)
+        # Spoken live, in the voice that matches the pre-rendered prompts
+        self.assertIn(f'voice="{settings.TTS["SAY_VOICE"]}"'.encode(), response.content)
+
+    def test_backend_error_falls_back_to_the_next_question(self):
+        request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+        self.backend.responses = [
+            openai.BadRequestError("bad request", response=httpx.Response(400, request=request), body=None)
+        ]
+        response = self.post_answer()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(b'We are sorry', response.content)
+        self.assertIn(f'/answer/{self.second.id}/'.encode(), response.content)
+
+
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False}, BACKGROUND_TASKS_EAGER=True)
+class EvaluationClaimTests(TestCase):
+    """Results polls and manual evaluations never repeat work a background evaluation has claimed"""
+
+    def setUp(self):
+        job_description = JobDescription.objects.create(title='Engineer', description='d', questions=['q1', 'q2'])
+        question_set = QuestionSet.objects.create_for_job_description(job_description, ['Why Kafka?', 'Why Django?'])
+        candidate = Candidate.objects.create(name='Ann', email='ann@example.com', phone='+15550001111')
+        self.interview = Interview.objects.create(
+            job_description=job_description, candidate=candidate, question_set=question_set, status='completed'
+        )
+        first, second = self.interview.question_list
+        self.scored = Answer.objects.create(interview=self.interview, question=first, transcript='Replay.', score=8)
+        self.unscored = Answer.objects.create(interview=self.interview, question=second, transcript='Batteries.')
+        self.backend = FakeBackend()
+        reset_llm_gateway(self.backend)
+        self.addCleanup(reset_llm_gateway)
+
+    def get_results(self):
+        response = self.client.get(f'/api/interviews/{self.interview.id}/results/', HTTP_X_API_KEY=settings.API_KEY)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_results_skip_answers_claimed_by_a_background_task(self):
+        Answer.objects.filter(pk=self.unscored.pk).update(evaluation_started_at=timezone.now())
+        results = self.get_results()
+        self.assertEqual(self.backend.calls, [])
+        self.assertEqual(results['evaluation_metadata']['answers_scored'], 0)
+        self.assertIsNone(results['evaluation_metadata']['errors'])
+
+    def test_results_score_unclaimed_answers_but_leave_the_recommendation_to_finalize(self):
+        results = self.get_results()
+        self.assertEqual(results['evaluation_metadata']['answers_scored'], 1)
+        self.assertEqual(len(self.backend.calls), 1)
+        self.unscored.refresh_from_db()
+        self.assertEqual((self.unscored.score, self.unscored.evaluation_started_at), (7, None))
+        self.interview.refresh_from_db()
+        self.assertEqual(self.interview.recommendation, '')
+
+    def test_evaluate_finalizes_in_the_background(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/interviews/{self.interview.id}/evaluate/', HTTP_X_API_KEY=settings.API_KEY)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['evaluation_summary']['scored_questions'], 1)
+        # One score for the unscored answer, then the recommendation; the scored answer is kept
+        self.assertEqual(len(self.backend.calls), 2)
+        self.scored.refresh_from_db()
+        self.interview.refresh_from_db()
+        self.assertEqual(self.scored.score, 8)
+        self.assertTrue(self.interview.recommendation)
+
+
+def resolves_to(address):
+    """Patch DNS resolution in interviews.tasks to return `address` for every host"""
+    return mock.patch(
+        'interviews.tasks.socket.getaddrinfo',
+        return_value=[(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (address, 443))]
+    )
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True, JOB_DESCRIPTION_CALLBACK_ALLOWED_HOSTS=[])
+class JobDescriptionCreateTests(TestCase):
+    callback_url = 'https://ats.example.com/hooks/questions'
+
+    def setUp(self):
+        self.backend = FakeBackend()
+        reset_llm_gateway(self.backend)
+        self.addCleanup(reset_llm_gateway)
+
+    def create(self, description='Backend engineer, Kafka', callback_url=callback_url):
+        # The mock outlives the callbacks, which run when the capture block exits
+        with mock.patch('interviews.tasks.requests.post') as self.callback, \
+                self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/job-descriptions/create/', {
+                'title': 'Engineer', 'description': description, 'callback_url': callback_url
+            }, HTTP_X_API_KEY=settings.API_KEY)
+
+    def test_generates_questions_in_the_background(self):
+        with resolves_to('93.184.216.34'):
+            response = self.create()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['questions_status'], 'pending')
+
+        job_description = JobDescription.objects.get(id=response.json()['id'])
+        self.assertEqual(job_description.questions_status, 'ready')
+        self.assertEqual(job_description.get_current_question_set().questions.count(), len(job_description.questions))
+        (url,), kwargs = self.callback.call_args
+        self.assertEqual((url, kwargs['json']['questions_status']), (self.callback_url, 'ready'))
+
+        # The same description again is answered from the question cache
+        self.assertEqual(self.create(callback_url='').status_code, 201)
+        self.assertEqual(len(self.backend.calls), 1)
+
+    def test_failed_generation_is_reported(self):
+        self.backend.responses = ['not a JSON array']
+        with resolves_to('93.184.216.34'):
+            response = self.create()
+        job_description = JobDescription.objects.get(id=response.json()['id'])
+        self.assertEqual((job_description.questions_status, job_description.questions), ('failed', []))
+        self.assertEqual(self.callback.call_args.kwargs['json']['questions_status'], 'failed')
+
+    def test_rejects_invalid_callback_urls_without_resolving_them(self):
+        with mock.patch('interviews.tasks.socket.getaddrinfo', side_effect=AssertionError("DNS in the request")):
+            for url in ['http://ats.example.com/hook', 'https://10.0.0.8/hook', 'https://[::1]/hook', 'not a url']:
+                with self.subTest(url=url):
+                    self.assertEqual(self.create(callback_url=url).status_code, 400)
+            self.assertEqual(JobDescription.objects.count(), 0)
+
+    def test_does_not_call_back_a_host_resolving_to_a_private_address(self):
+        with resolves_to('10.0.0.8'):
+            response = self.create()
+        self.assertEqual(response.status_code, 202)
+        self.callback.assert_not_called()
+        self.assertEqual(JobDescription.objects.get(id=response.json()['id']).questions_status, 'ready')
+
+
+@override_settings(WEBHOOKS={**settings.WEBHOOKS, 'ENABLED': True, 'DISPATCHER': 'command', 'ALLOWED_HOSTS': ['127.0.0.1']})
+class WebhookOutboxTests(TestCase):
+    def setUp(self):
+        job_description = JobDescription.objects.create(title='Engineer', description='d', questions=['q1'])
+        candidate = Candidate.objects.create(name='Ann', email='ann@example.com', phone='+15550001111')
+        self.interview = Interview.objects.create(job_description=job_description, candidate=candidate)
+        self.receiver = FakeWebhookReceiver(secret='s3cret').start()
+        self.addCleanup(self.receiver.stop)
+        self.endpoint = WebhookEndpoint.objects.create(url=self.receiver.endpoint_url, secret='s3cret')
+
+    def complete(self):
+        self.interview.status = 'completed'
+        self.interview.save()
+
+    def deliver(self):
+        """Lease and send the endpoint's due batch in this thread, which sees the test transaction"""
+        dispatcher = WebhookDispatcher()
+        self.addCleanup(dispatcher.executor.shutdown)
+        token = dispatcher._lease(self.endpoint, timezone.now())
+        self.assertIsNotNone(token)
+        dispatcher.deliver_batch(self.endpoint, token)
+
+    def test_records_each_event_once_per_endpoint(self):
+        self.complete()
+        self.complete()
+        self.assertEqual(record_event('interview.completed', self.interview), [])
+        self.assertEqual(WebhookDelivery.objects.filter(event='interview.completed').count(), 1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            WebhookDelivery.objects.create(
+                endpoint=self.endpoint, interview=self.interview, event='interview.completed', payload={}
+            )
+
+    def test_fallback_recommendations_are_not_evaluations(self):
+        self.interview.recommendation = FAILED_RECOMMENDATION
+        self.interview.save()
+        self.assertFalse(WebhookDelivery.objects.filter(event='interview.evaluated').exists())
+        self.interview.recommendation = 'Proceed to the next round.'
+        self.interview.save()
+        self.assertTrue(WebhookDelivery.objects.filter(event='interview.evaluated').exists())
+
+    def test_delivers_signed_batches(self):
+        self.complete()
+        with self.assertLogs('interviews.webhooks', 'INFO'):
+            self.deliver()
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual((delivery.status, delivery.attempts), ('delivered', 1))
+        (event,) = self.receiver.events.values()
+        self.assertEqual((event['id'], event['data']['status']), (str(delivery.id), 'completed'))
+
+    def test_retries_with_backoff_until_max_attempts(self):
+        self.endpoint.secret = 'rotated'
+        self.endpoint.save()
+        self.complete()
+        with self.assertLogs('interviews.webhooks', 'WARNING'):
+            self.deliver()
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual((delivery.status, delivery.attempts), ('pending', 1))
+        self.assertIn('HTTP 401', delivery.last_error)
+        # Jitter takes the delay down to half of BACKOFF_BASE at most
+        self.assertGreaterEqual(
+            (delivery.next_attempt_at - timezone.now()).total_seconds(), settings.WEBHOOKS['BACKOFF_BASE'] / 2 - 1
+        )
+        self.assertEqual(self.receiver.events, {})
+
+        WebhookDelivery.objects.update(attempts=settings.WEBHOOKS['MAX_ATTEMPTS'] - 1, next_attempt_at=timezone.now())
+        with self.assertLogs('interviews.webhooks', 'WARNING'):
+            self.deliver()
+        self.assertEqual(WebhookDelivery.objects.get().status, 'failed')
+
+    def test_rejects_private_endpoint_urls(self):
+        for url in ['http://hooks.example.com/', 'https://10.0.0.8/hooks', 'https://[::1]/hooks']:
+            with self.subTest(url=url):
+                response = self.client.post(
+                    '/api/webhooks/create/', {'url': url}, content_type='application/json', HTTP_X_API_KEY=settings.API_KEY
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('url', response.json())
+
+    def test_does_not_send_to_a_host_resolving_to_a_private_address(self):
+        WebhookEndpoint.objects.filter(pk=self.endpoint.pk).update(url='https://hooks.example.com/')
+        self.endpoint.refresh_from_db()
+        self.complete()
+        with resolves_to('10.0.0.8'), mock.patch('interviews.webhooks.requests.Session.post') as post, \
+                self.assertLogs('interviews.webhooks', 'WARNING'):
+            self.deliver()
+        post.assert_not_called()
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual(delivery.status, 'pending')
+        self.assertIn('private', delivery.last_error)
+
+
+@override_settings(
+    ADAPTIVE_FOLLOWUPS_ENABLED=False, TWILIO_MEDIA_STREAMS={**settings.TWILIO_MEDIA_STREAMS, 'ENABLED': False},
+    TWILIO_WEBHOOK_IDEMPOTENCY={**settings.TWILIO_WEBHOOK_IDEMPOTENCY, 'ENABLED': True},
+)
+class AnswerWebhookIdempotencyTests(TestCase):
+    """Twilio's retries of the answer webhook, against recordings served by the fake Twilio"""
+
+    def setUp(self):
+        job_description = JobDescription.objects.create(title='Engineer', description='d', questions=['q1', 'q2'])
+        question_set = QuestionSet.objects.create_for_job_description(job_description, ['Why Kafka?', 'Why Django?'])
+        candidate = Candidate.objects.create(name='Ann', email='ann@example.com', phone='+15550001111')
+        self.interview = Interview.objects.create(
+            job_description=job_description, candidate=candidate, question_set=question_set, status='in_progress'
+        )
+        self.first, self.second = self.interview.question_list
+        self.path = f'/api/webhook/interview/{self.interview.id}/answer/{self.first.id}/'
+        self.twilio = FakeTwilio().start()
+        self.addCleanup(self.twilio.stop)
+        self.payload = {
+            'CallSid': 'CA1', 'RecordingSid': 'RE1', 'RecordingUrl': self.twilio.recording_url('RE1'),
+            'RecordingDuration': '12',
+        }
+        idempotency.get_cache().clear()
+        self.addCleanup(idempotency.get_cache().clear)
+
+    def downloads(self):
+        return self.twilio.count('GET', r'/Recordings/RE1')
+
+    def assert_asks_the_next_question(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'/answer/{self.second.id}/'.encode(), response.content)
+
+    def test_replays_the_first_response(self):
+        first = self.client.post(self.path, self.payload)
+        retry = self.client.post(self.path, self.payload)
+        self.assert_asks_the_next_question(first)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(self.downloads(), 1)
+        answer = Answer.objects.get()
+        self.assertEqual((answer.recording_sid, answer.audio_duration), ('RE1', 12))
+        self.assertTrue(answer.audio_file)
+
+    def test_in_flight_retry_is_redirected_with_the_recording(self):
+        key = idempotency.delivery_key('answer', self.path, 'CA1', 'RE1')
+        self.assertIsNone(idempotency.claim(key))
+        response = self.client.post(self.path, self.payload)
+        self.assertIn(b'<Pause', response.content)
+        redirect = html.unescape(re.search(r'<Redirect>(.*?)</Redirect>', response.content.decode()).group(1))
+        self.assertEqual(self.downloads(), 0)
+
+        # The first delivery fails; Twilio follows the redirect with only the call's parameters
+        idempotency.release(key)
+        self.assert_asks_the_next_question(self.client.post(redirect, {'CallSid': 'CA1'}))
+        self.assertEqual(self.downloads(), 1)
+        self.assertTrue(Answer.objects.get().audio_file)
+
+    def test_failed_delivery_releases_the_key(self):
+        with mock.patch('interviews.views.say_or_play', side_effect=RuntimeError("TTS down")), \
+                self.assertLogs('interviews.views', 'ERROR'):
+            failed = self.client.post(self.path, self.payload)
+        self.assertIn(b'We are sorry', failed.content)
+        self.assertEqual(failed['Cache-Control'], 'no-store')
+
+        # The retry is handled again; the recording saved by the failed delivery is not downloaded twice
+        self.assert_asks_the_next_question(self.client.post(self.path, self.payload))
+        self.assertEqual(self.downloads(), 1)
+
+    @override_settings(TWILIO_RECORDING_DOWNLOAD_TIMEOUT=0.2)
+    def test_abandons_a_download_past_the_deadline(self):
+        def trickle(response, chunk_size):
+            for _ in range(5):
+                time.sleep(0.1)
+                yield b'\0' * 10
+
+        with mock.patch('requests.Response.iter_content', trickle), self.assertLogs('interviews.views', 'WARNING') as logs:
+            response = self.client.post(self.path, self.payload)
+        self.assert_asks_the_next_question(response)
+        self.assertIn('took over', ''.join(logs.output))
+        self.assertFalse(Answer.objects.exists())
+        # A later delivery may download it again
+        self.assertTrue(idempotency.claim_recording('RE1'))
+
+
+def run_media_stream(*texts):
+    """Feed `texts` to the media stream app as one connection; returns the messages it sent"""
+    sent = []
+
+    async def connection():
+        queue = asyncio.Queue()
+        queue.put_nowait({'type': 'websocket.connect'})
+        for text in texts:
+            queue.put_nowait({'type': 'websocket.receive', 'text': text})
+        queue.put_nowait({'type': 'websocket.disconnect'})
+
+        async def send(message):
+            sent.append(message)
+
+        await media_stream_app({'type': 'websocket', 'path': settings.TWILIO_MEDIA_STREAMS['PATH']}, queue.get, send)
+
+    asyncio.run(connection())
+    return sent
+
+
+@override_settings(TWILIO_MEDIA_STREAMS={**settings.TWILIO_MEDIA_STREAMS, 'ENABLED': True, 'RECORD_DIR': None})
+class MediaStreamTests(TestCase):
+    interview_id = '5f0c7f6e-8d43-4c1e-9a35-0d8d2b1c4e77'
+
+    def setUp(self):
+        patcher = mock.patch('interviews.media_streams.open_stream_session')
+        self.open_session = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start(self, token):
+        return json.dumps({'event': 'start', 'start': {
+            'callSid': 'CA1', 'customParameters': {'interview_id': self.interview_id, 'token': token},
+        }})
+
+    def test_feeds_audio_after_a_valid_start(self):
+        media = json.dumps({'event': 'media', 'media': {'payload': base64.b64encode(b'\xff' * 160).decode()}})
+        with self.assertLogs('interviews.media_streams', 'WARNING') as logs:
+            sent = run_media_stream('{not json', '[]', self.start(media_stream_token(self.interview_id, 'CA1')), media)
+        # Malformed messages are skipped without dropping the call
+        self.assertEqual(len(logs.output), 2)
+        self.open_session.assert_called_once_with('CA1')
+        self.open_session.return_value.feed_ulaw.assert_called_once_with(b'\xff' * 160)
+        self.assertEqual(sent, [{'type': 'websocket.accept'}])
+
+    def test_rejects_a_start_without_a_valid_token(self):
+        for token in [None, 'forged', media_stream_token(self.interview_id, 'CA2')]:
+            with self.subTest(token=token), self.assertLogs('interviews.media_streams', 'WARNING'):
+                sent = run_media_stream(self.start(token))
+                self.assertEqual(sent[-1], {'type': 'websocket.close', 'code': 1008})
+        self.open_session.assert_not_called()
+
+    def test_refuses_connections_when_disabled(self):
+        with self.settings(TWILIO_MEDIA_STREAMS={**settings.TWILIO_MEDIA_STREAMS, 'ENABLED': False}):
+            sent = run_media_stream(self.start(media_stream_token(self.interview_id, 'CA1')))
+        self.assertEqual(sent, [{'type': 'websocket.close'}])
+        self.open_session.assert_not_called()
+
+    def test_recorder_buffers_a_bounded_number_of_messages_before_start(self):
+        recorder = FrameRecorder('/nonexistent')
+        for number in range(FrameRecorder.MAX_BUFFERED * 3):
+            recorder.write(f'{{"event": "media", "sequenceNumber": "{number}"}}')
+        self.assertEqual(len(recorder.buffered), FrameRecorder.MAX_BUFFERED)
+
+
+@override_settings(RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': True})
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        self.job_description = JobDescription.objects.create(title='Engineer', description='d', questions=['q1'])
+        self.candidate = Candidate.objects.create(name='Ann', email='ann@example.com', phone='+15550001111')
+        self.interview = Interview.objects.create(job_description=self.job_description, candidate=self.candidate)
+        response_cache.get_cache().clear()
+        self.addCleanup(response_cache.get_cache().clear)
+
+    def get(self, url, **headers):
+        return self.client.get(url, HTTP_X_API_KEY=settings.API_KEY, **headers)
+
+    def change(self, instance, **fields):
+        """Save `instance` and run the invalidation, which waits for the commit"""
+        for name, value in fields.items():
+            setattr(instance, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.save()
+
+    def test_revalidates_with_etag_and_last_modified(self):
+        first = self.get('/api/interviews/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(self.get('/api/interviews/')['X-Cache'], 'HIT')
+        self.assertEqual(self.get('/api/interviews/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        self.assertEqual(self.get('/api/interviews/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 304)
+
+    def test_saving_a_row_invalidates_the_responses_including_it(self):
+        url = f'/api/interviews/{self.interview.id}/results/'
+        first = self.get(url)
+        self.change(self.candidate, name='Ann Lee')
+        second = self.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((second.status_code, second['X-Cache']), (200, 'MISS'))
+        self.assertEqual(second.json()['candidate_name'], 'Ann Lee')
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+    def test_job_description_changes_reach_the_interviews_embedding_it(self):
+        url = f'/api/interviews/{self.interview.id}/results/'
+        self.get(url)
+        self.change(self.job_description, title='Staff engineer')
+        self.assertEqual(self.get(url)['X-Cache'], 'MISS')
+
+    def test_refuses_a_per_process_cache_with_several_workers(self):
+        with self.settings(WEB_CONCURRENCY=4), self.assertRaises(ImproperlyConfigured):
+            response_cache.check_shared_cache()
+        with self.settings(WEB_CONCURRENCY=4, RESPONSE_CACHE={**settings.RESPONSE_CACHE, 'ENABLED': False}):
+            response_cache.check_shared_cache()
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.job_description = JobDescription.objects.create(
+            title='Backend engineer', description='Kafka streaming and Django services', questions=['q1']
+        )
+        self.candidate = Candidate.objects.create(
+            name='Ann Lee', email='ann@example.com', phone='+15550001111', resume_text='Built Kafka consumers in Go.'
+        )
+        interview = Interview.objects.create(job_description=self.job_description, candidate=self.candidate)
+        self.question = Question.objects.create(interview=interview, question_text='Why Kafka?', question_number=1)
+        self.interview = interview
+
+    def answer(self, transcript):
+        return Answer.objects.create(interview=self.interview, question=self.question, transcript=transcript)
+
+    def ids(self, query, **kwargs):
+        results, _has_next = search(query, **kwargs)
+        return [result['id'] for result in results]
+
+    def test_matches_every_kind_with_highlighted_snippets(self):
+        answer = self.answer('We used Kafka for ordering and replay.')
+        self.assertCountEqual(self.ids('kafka'), [str(answer.id), str(self.candidate.id), str(self.job_description.id)])
+        (result,), has_next = search('kafka replay', kind='answer')
+        self.assertFalse(has_next)
+        self.assertEqual((result['type'], result['title']), ('answer', 'Why Kafka?'))
+        self.assertIn('[Kafka]', result['snippet'])
+
+    def test_prefix_matches_the_last_word_and_ignores_query_syntax(self):
+        self.assertEqual(self.ids('strea', kind='job_description'), [str(self.job_description.id)])
+        self.assertEqual(self.ids('"kafka" (*', kind='job_description'), [str(self.job_description.id)])
+        self.assertEqual(self.ids('***'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        answer = self.answer('')
+        self.assertEqual(self.ids('rebalancing'), [])
+        answer.transcript = 'Consumer group rebalancing.'
+        answer.save(update_fields=['transcript'])
+        self.assertEqual(self.ids('rebalancing'), [str(answer.id)])
+        answer.delete()
+        self.assertEqual(self.ids('rebalancing'), [])
+
+    def test_ranks_the_newest_window_then_lists_older_matches_newest_first(self):
+        answers = [self.answer('partition ' * (1 if i % 2 else 5)) for i in range(5)]
+        with self.settings(SEARCH_RANK_WINDOW=2):
+            first, has_next = search('partition', kind='answer', page=1, page_size=3)
+            second, _ = search('partition', kind='answer', page=2, page_size=3)
+        ids = [result['id'] for result in first + second]
+        self.assertTrue(has_next)
+        # The newest two by rank (answers[4] mentions it more often), then the rest by recency
+        self.assertEqual(ids, [str(answers[i].id) for i in (4, 3, 2, 1, 0)])
+
+    def test_endpoint_validates_parameters(self):
+        get = lambda **params: self.client.get('/api/search/', params, HTTP_X_API_KEY=settings.API_KEY)
+        self.assertEqual(get(q='kafka', type='answer').status_code, 200)
+        self.assertEqual(get(q='').status_code, 400)
+        self.assertEqual(get(q='kafka', type='resume').status_code, 400)
+        self.assertEqual(get(q='kafka', page='x').status_code, 400)
+
+
+def parse_sse(chunk):
+    """(event type, data) of one server-sent event chunk, or None for comments and the retry field"""
+    fields = dict(line.split(': ', 1) for line in chunk.decode().strip().splitlines())
+    return (fields['event'], json.loads(fields['data'])) if 'event' in fields else None
+
+
+@override_settings(EVENTS={**settings.EVENTS, 'HEARTBEAT_SECONDS': 5})
+class InterviewEventsTests(TestCase):
+    def setUp(self):
+        job_description = JobDescription.objects.create(title='Engineer', description='d', questions=['q1'])
+        candidate = Candidate.objects.create(name='Ann', email='ann@example.com', phone='+15550001111')
+        self.interview = Interview.objects.create(job_description=job_description, candidate=candidate, status='completed')
+        question = Question.objects.create(interview=self.interview, question_text='Why Kafka?', question_number=1)
+        self.answer = Answer.objects.create(interview=self.interview, question=question, transcript='Replay.')
+        self.url = f'/api/interviews/{self.interview.id}/events/'
+        events.reset_broker()
+        self.addCleanup(events.reset_broker)
+
+    async def open_stream(self):
+        response = await self.async_client.get(self.url, headers={'X-API-Key': settings.API_KEY})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry: '))
+        return stream
+
+    async def next_event(self, stream):
+        return parse_sse(await asyncio.wait_for(anext(stream), 5))
+
+    def save(self, instance, **fields):
+        for name, value in fields.items():
+            setattr(instance, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.save(update_fields=list(fields))
+
+    async def test_streams_a_snapshot_then_changes_until_the_recommendation(self):
+        stream = await self.open_stream()
+        kind, snapshot = await self.next_event(stream)
+        self.assertEqual((kind, snapshot['status'], snapshot['recommendation']), ('snapshot', 'completed', None))
+        self.assertEqual([a['transcript'] for a in snapshot['answers']], ['Replay.'])
+
+        await sync_to_async(self.save)(self.answer, score=8.0, feedback='Clear.')
+        kind, event = await self.next_event(stream)
+        self.assertEqual((kind, event['answer_id'], event['score']), ('score_ready', str(self.answer.id), 8.0))
+
+        await sync_to_async(self.save)(self.interview, recommendation='Proceed.')
+        kind, event = await self.next_event(stream)
+        self.assertEqual((kind, event['recommendation']), ('recommendation', 'Proceed.'))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertFalse(events.get_broker().has_subscribers(events.channel_for(self.interview.id)))
+
+    async def test_ends_after_the_snapshot_of_a_finished_interview(self):
+        await sync_to_async(Interview.objects.filter(pk=self.interview.pk).update)(recommendation='Proceed.')
+        stream = await self.open_stream()
+        kind, snapshot = await self.next_event(stream)
+        self.assertEqual((kind, snapshot['recommendation']), ('snapshot', 'Proceed.'))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+
+    @override_settings(EVENTS={**settings.EVENTS, 'HEARTBEAT_SECONDS': 5, 'MAX_QUEUED': 1})
+    async def test_resends_a_snapshot_to_a_client_that_fell_behind(self):
+        stream = await self.open_stream()
+        await self.next_event(stream)
+        for score in (5.0, 6.0):
+            events.publish(self.interview.id, {'type': 'score_ready', 'answer_id': str(self.answer.id), 'score': score})
+        kind, snapshot = await self.next_event(stream)
+        self.assertEqual(kind, 'snapshot')
+        self.assertEqual(len(snapshot['answers']), 1)
@@ -0,0 +1,197 @@
+"""Optional OpenTelemetry tracing for the interview lifecycle.
+
+With ``settings.TRACING['ENABLED']`` every request, background task and
+`metrics.span` stage becomes an OpenTelemetry span. Work that belongs to an
+interview (trigger, TwiML, answer and status webhooks, evaluation) is recorded
+under a trace id derived from the interview's UUID, so one interview is one
+trace without passing context through Twilio. Call SIDs and question ids are
+span attributes. Database queries are child spans of the request or task
+running them.
+
+Requires ``pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http``;
+with tracing disabled nothing is imported and every hook is a no-op.
+"""
+import contextlib
+import contextvars
+import logging
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+_tracer = None
+_provider = None
+
+# Trace id forced by interview_trace(); new root spans use it instead of a random id
+_interview_trace_id = contextvars.ContextVar('interview_trace_id', default=None)
+
+
+def is_enabled():
+    return _tracer is not None
+
+
+def interview_trace_id(interview_id):
+    """The 128-bit trace id of an interview: its UUID"""
+    return uuid.UUID(str(interview_id)).int
+
+
+def configure():
+    """Install the tracer provider and exporter from settings.TRACING (called from AppConfig.ready)"""
+    global _tracer, _provider
+    options = settings.TRACING
+    if not options['ENABLED'] or _tracer is not None:
+        return
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.id_generator import RandomIdGenerator
+    except ImportError:
+        raise ImproperlyConfigured(
+            "TRACING_ENABLED requires `pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http`"
+        )
+
+    class InterviewIdGenerator(RandomIdGenerator):
+        def generate_trace_id(self):
+            return _interview_trace_id.get() or super().generate_trace_id()
+
+    _provider = TracerProvider(
+        resource=Resource.create({'service.name': options['SERVICE_NAME']}),
+        id_generator=InterviewIdGenerator(),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(_exporter(options)))
+    _tracer = _provider.get_tracer('interviews')
+    logger.info("Tracing enabled, exporting to %s", options['EXPORTER'])
+
+
+def _exporter(options):
+    if options['EXPORTER'] == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=options['OTLP_ENDPOINT'])
+    if options['EXPORTER'] == 'file':
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        # One JSON span per line, for offline analysis
+        return ConsoleSpanExporter(
+            out=open(options['FILE_PATH'], 'a', buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    raise ImproperlyConfigured(f"Unknown TRACING['EXPORTER'] {options['EXPORTER']!r} (expected 'otlp' or 'file')")
+
+
+def shutdown():
+    """Flush pending spans (used by commands that exit right after tracing)"""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+@contextlib.contextmanager
+def interview_trace(interview_id):
+    """Spans started inside the block without a parent join the interview's trace"""
+    if interview_id is None:
+        yield
+        return
+    token = _interview_trace_id.set(interview_trace_id(interview_id))
+    try:
+        yield
+    finally:
+        _interview_trace_id.reset(token)
+
+
+def clean_attributes(attributes):
+    return {key: value if isinstance(value, (bool, int, float)) else str(value)
+            for key, value in attributes.items() if value is not None}
+
+
+def start_span(name, attributes=None):
+    """Start a span as a child of the current one; returns a context manager, or None if disabled"""
+    if _tracer is None:
+        return None
+    return _tracer.start_as_current_span(name, attributes=clean_attributes(attributes or {}))
+
+
+@contextlib.contextmanager
+def task_span(name, interview_id=None, **attributes):
+    """A root span for a background task, in the interview's trace if it has one"""
+    if _tracer is None:
+        yield None
+        return
+    from opentelemetry import context
+    # Detach from whatever span enqueued the work so the task is its own root
+    token = context.attach(context.Context())
+    try:
+        with interview_trace(interview_id), start_span(
+            name, {'interview.id': interview_id, **attributes}
+        ) as current, trace_queries():
+            yield current
+    finally:
+        context.detach(token)
+
+
+def _trace_query(execute, sql, params, many, context):
+    with _tracer.start_as_current_span('db.query', attributes={
+        'db.system': connection.vendor,
+        'db.statement': sql,
+        'db.operation': sql.split(None, 1)[0].upper() if sql else '',
+    }):
+        return execute(sql, params, many, context)
+
+
+def trace_queries():
+    """Record each query on the default connection as a child span inside the block"""
+    if _tracer is None:
+        return contextlib.nullcontext()
+    return connection.execute_wrapper(_trace_query)
+
+
+class TracingMiddleware:
+    """One server span per request, in the interview's trace when the URL names an interview"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if _tracer is None:
+            return self.get_response(request)
+        interview_id, name, attributes = self.describe(request)
+        with interview_trace(interview_id), start_span(name, attributes) as current, trace_queries():
+            response = self.get_response(request)
+            current.set_attribute('http.status_code', response.status_code)
+            return response
+
+    async def __acall__(self, request):
+        if _tracer is None:
+            return await self.get_response(request)
+        interview_id, name, attributes = self.describe(request)
+        with interview_trace(interview_id), start_span(name, attributes) as current, trace_queries():
+            response = await self.get_response(request)
+            current.set_attribute('http.status_code', response.status_code)
+            return response
+
+    def describe(self, request):
+        """(interview id, span name, attributes) of a request"""
+        try:
+            match = resolve(request.path_info)
+            route, kwargs = match.route, match.kwargs
+        except Resolver404:
+            route, kwargs = request.path_info, {}
+        attributes = {
+            'http.method': request.method,
+            'http.route': route,
+            'interview.id': kwargs.get('interview_id'),
+            'question.id': kwargs.get('question_id'),
+        }
+        if request.method == 'POST' and request.content_type == 'application/x-www-form-urlencoded':
+            attributes['twilio.call_sid'] = request.POST.get('CallSid')
+            attributes['twilio.recording_sid'] = request.POST.get('RecordingSid')
+        return kwargs.get('interview_id'), f"{request.method} {route}", attributes
@@ -0,0 +1,162 @@
+"""Pluggable speech-to-text backends.
+
+The active backend is chosen by ``settings.TRANSCRIPTION['BACKEND']``: one of
+the names in ``BACKENDS``, ``'routing'`` to spread traffic over
+``TRANSCRIPTION['ROUTING_BACKENDS']`` by observed latency, or a dotted path to
+a ``TranscriptionBackend`` subclass. Pooling, timeouts and concurrency are all
+read from the same ``TRANSCRIPTION`` settings dict.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from ..audio import validate_audio_file, debug_audio_file
+from ..metrics import span
+from .base import TranscriptionBackend, TranscriptionError, TranscriptionResult
+from .chunking import transcribe_chunked
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = {
+    'assemblyai': 'interviews.transcription.assemblyai.AssemblyAIBackend',
+    'whisper_api': 'interviews.transcription.whisper_api.WhisperAPIBackend',
+    'stub': 'interviews.transcription.stub.StubBackend',
+    'local': 'interviews.transcription.local.LocalWhisperBackend',
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def build_backend(name):
+    """Instantiate a backend by registered name or dotted path using the TRANSCRIPTION settings"""
+    options = dict(settings.TRANSCRIPTION)
+    max_concurrency = options.get('MAX_CONCURRENCY', 4)
+    if name == 'routing':
+        from .routing import RoutingBackend
+        return RoutingBackend(
+            [get_transcription_backend(backend_name) for backend_name in options['ROUTING_BACKENDS']],
+            max_concurrency=max_concurrency * len(options['ROUTING_BACKENDS']),
+            **options
+        )
+    backend_class = import_string(BACKENDS.get(name, name))
+    return backend_class(max_concurrency=max_concurrency, **options)
+
+
+def get_transcription_backend(name=None):
+    """Return the process-wide instance of a backend (the configured one by default)"""
+    name = name or settings.TRANSCRIPTION['BACKEND']
+    with _backends_lock:
+        backend = _backends.get(name)
+    if backend is None:
+        backend = build_backend(name)
+        with _backends_lock:
+            backend = _backends.setdefault(name, backend)
+    return backend
+
+
+def reset_transcription_backends():
+    """Forget cached backend instances so changed settings take effect"""
+    with _backends_lock:
+        _backends.clear()
+
+
+def transcribe_audio(path, duration=None):
+    """Transcribe a file with the configured backend, chunking recordings longer than CHUNK_THRESHOLD_SECONDS"""
+    backend = get_transcription_backend()
+    threshold = settings.TRANSCRIPTION.get('CHUNK_THRESHOLD_SECONDS')
+    if threshold and (duration is None or duration > threshold):
+        # Unknown durations go through the chunker too; a single chunk is sent as-is
+        return transcribe_chunked(path, backend)
+    return backend.transcribe_file(path)
+
+
+def generate_transcript_from_audio(answer_obj):
+    """Transcribe an answer's recording with the configured backend and store the transcript"""
+    try:
+        if not answer_obj.audio_file:
+            return None
+
+        # Return existing transcript if available
+        if answer_obj.transcript:
+            return answer_obj.transcript
+
+        audio_path = answer_obj.audio_file.path
+        logger.debug("Processing audio file: %s", audio_path)
+
+        with span('transcription.validate_audio'):
+            is_valid, validation_msg = validate_audio_file(audio_path)
+        if not is_valid:
+            logger.warning("Audio file validation failed: %s", validation_msg)
+            debug_audio_file(answer_obj)
+            return None
+
+        with span('transcription.transcribe'):
+            result = transcribe_audio(audio_path, answer_obj.audio_duration)
+        answer_obj.transcript = result.text
+        answer_obj.transcript_segments = result.segments
+        answer_obj.save(update_fields=["transcript", "transcript_segments"])
+        logger.info("Transcript saved via %s in %.2fs (%d chars)", result.backend, result.latency, len(result.text))
+        return result.text
+
+    except TranscriptionError as e:
+        logger.error("Error generating transcript: %s", e)
+        return None
+    except Exception as e:
+        logger.exception("Error generating transcript: %s", e)
+        return None
+
+
+def process_wav_to_transcript(wav_file_path, output_mp3_path=None):
+    """
+    Generate a transcript for a WAV file with the configured backend.
+
+    Args:
+        wav_file_path (str): Path to the input WAV file
+        output_mp3_path (str, optional): Unused; backends manage their own intermediate files
+
+    Returns:
+        dict: Dictionary containing:
+            - 'success' (bool): Whether the process was successful
+            - 'transcript' (str): The generated transcript text
+            - 'mp3_path' (str): Always None; intermediate files are cleaned up by the backend
+            - 'error' (str): Error message if failed
+            - 'processing_time' (float): Time taken for the entire process
+    """
+    start_time = time.time()
+
+    def failure(error):
+        return {
+            'success': False,
+            'transcript': None,
+            'mp3_path': None,
+            'error': error,
+            'processing_time': time.time() - start_time
+        }
+
+    if not os.path.exists(wav_file_path):
+        return failure(f'Input WAV file not found: {wav_file_path}')
+    if not wav_file_path.lower().endswith('.wav'):
+        return failure(f'Input file is not a WAV file: {wav_file_path}')
+
+    try:
+        result = transcribe_audio(wav_file_path)
+    except TranscriptionError as e:
+        return failure(str(e))
+
+    return {
+        'success': True,
+        'transcript': result.text,
+        'mp3_path': None,
+        'error': None,
+        'processing_time': time.time() - start_time
+    }
+
+
+def test_assemblyai_connection():
+    """Test if AssemblyAI API is accessible"""
+    return get_transcription_backend('assemblyai').check_connection()
@@ -0,0 +1,143 @@
+import logging
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..audio import convert_to_mp3_local
+from ..metrics import registry, span
+from .base import TranscriptionBackend, TranscriptionError, TranscriptionResult, transcription_retries
+
+logger = logging.getLogger(__name__)
+
+assemblyai_polls = registry.counter('assemblyai_polls_total', 'AssemblyAI transcript status polls by returned status')
+
+ASSEMBLYAI_BASE_URL = "https://api.assemblyai.com/v2"
+
+
+class AssemblyAIBackend(TranscriptionBackend):
+    """Upload, request and poll an AssemblyAI transcript over a pooled HTTP session"""
+    name = 'assemblyai'
+
+    def __init__(self, api_key=None, **options):
+        super().__init__(**options)
+        self.api_key = api_key or self.options.get('ASSEMBLYAI_API_KEY')
+        self.base_url = self.options.get('ASSEMBLYAI_BASE_URL') or ASSEMBLYAI_BASE_URL
+        self.request_timeout = self.options.get('REQUEST_TIMEOUT', 30)
+        self.poll_interval = self.options.get('POLL_INTERVAL', 3)
+        self.timeout = self.options.get('TIMEOUT', 300)
+
+        pool_size = self.options.get('POOL_SIZE', 10)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        self.session.mount('http://', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        self.session.headers['authorization'] = self.api_key or ''
+
+    def check_connection(self):
+        try:
+            if not self.api_key:
+                return False, "AssemblyAI API key not configured"
+            response = self.session.get(
+                f"{self.base_url}/transcript", params={"limit": 1}, timeout=self.request_timeout
+            )
+            if response.status_code == 200:
+                return True, "AssemblyAI API connection successful"
+            elif response.status_code == 401:
+                return False, "AssemblyAI API key is invalid"
+            else:
+                return False, f"AssemblyAI API error: {response.status_code}"
+        except Exception as e:
+            return False, f"AssemblyAI API connection failed: {str(e)}"
+
+    def _transcribe(self, path):
+        if not self.api_key:
+            raise TranscriptionError("AssemblyAI API key not configured")
+
+        # AssemblyAI transcodes MP3 more reliably than Twilio's WAV; fall back to the original file
+        mp3_path = path.rsplit('.', 1)[0] + "_converted.mp3"
+        try:
+            convert_to_mp3_local(path, mp3_path)
+        except Exception as e:
+            logger.warning("Error converting audio, uploading original file: %s", e)
+            mp3_path = None
+
+        try:
+            try:
+                text = self._upload_and_poll(mp3_path or path)
+            except TranscriptionError as e:
+                if mp3_path is None or "Transcoding failed" not in str(e):
+                    raise
+                logger.info("AssemblyAI could not transcode the MP3; retrying with the original file")
+                transcription_retries.inc(backend=self.name, reason='transcoding_failed')
+                text = self._upload_and_poll(path)
+        finally:
+            if mp3_path and os.path.exists(mp3_path):
+                os.remove(mp3_path)
+
+        return TranscriptionResult(text=text, backend=self.name)
+
+    def _upload_and_poll(self, path):
+        with open(path, "rb") as f, span('assemblyai.upload'):
+            upload_response = self.session.post(
+                f"{self.base_url}/upload", files={"file": f}, timeout=self.request_timeout
+            )
+        if upload_response.status_code != 200:
+            raise TranscriptionError(f"Upload failed: {upload_response.status_code} - {upload_response.text}")
+        audio_url = upload_response.json()["upload_url"]
+
+        with span('assemblyai.request'):
+            transcript_response = self.session.post(
+                f"{self.base_url}/transcript",
+                json={
+                    "audio_url": audio_url,
+                    "auto_chapters": False,
+                    "speaker_labels": False,
+                    "punctuate": True,
+                    "format_text": True
+                },
+                timeout=self.request_timeout
+            )
+        if transcript_response.status_code != 200:
+            raise TranscriptionError(
+                f"Transcription request failed: {transcript_response.status_code} - {transcript_response.text}"
+            )
+        transcript_id = transcript_response.json()["id"]
+
+        with span('assemblyai.wait'):
+            return self._poll(transcript_id)
+
+    def _poll(self, transcript_id):
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            try:
+                with span('assemblyai.poll'):
+                    response = self.session.get(
+                        f"{self.base_url}/transcript/{transcript_id}", timeout=self.request_timeout
+                    )
+                if 400 <= response.status_code < 500 and response.status_code != 429:
+                    # Bad key, unknown transcript id...: polling again won't help
+                    assemblyai_polls.inc(status=f'http_{response.status_code}')
+                    raise TranscriptionError(
+                        f"Polling transcription failed: {response.status_code} - {response.text[:200]}"
+                    )
+                # 429s and 5xx while polling are transient; the transcript keeps processing
+                response.raise_for_status()
+                status_response = response.json()
+            except (requests.RequestException, ValueError) as e:
+                assemblyai_polls.inc(status='failed')
+                logger.warning("Error polling transcription status: %s", e)
+                time.sleep(self.poll_interval)
+                continue
+
+            assemblyai_polls.inc(status=status_response["status"])
+            if status_response["status"] == "completed":
+                if not status_response.get("text"):
+                    raise TranscriptionError("Transcription completed but no text returned")
+                return status_response["text"]
+            elif status_response["status"] == "error":
+                raise TranscriptionError(f"AssemblyAI error: {status_response.get('error', 'Unknown error')}")
+
+            time.sleep(self.poll_interval)
+
+        raise TranscriptionError(f"Transcription polling timed out after {self.timeout} seconds")
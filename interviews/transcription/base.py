@@ -0,0 +1,57 @@
+import threading
+import time
+from dataclasses import dataclass, field
+
+from ..metrics import registry
+
+transcription_requests = registry.counter('transcription_requests_total', 'Transcriptions by backend and outcome')
+transcription_retries = registry.counter('transcription_retries_total', 'Transcription retries by backend and reason')
+transcription_latency = registry.histogram('transcription_seconds', 'End-to-end transcription latency by backend')
+
+
+class TranscriptionError(Exception):
+    """Raised by a backend when an audio file could not be transcribed"""
+
+
+@dataclass
+class TranscriptionResult:
+    text: str
+    backend: str
+    latency: float = 0.0
+    segments: list = field(default_factory=list)  # [{'start': s, 'end': s, 'text': str}]
+
+
+class TranscriptionBackend:
+    """Interface for speech-to-text providers.
+
+    Subclasses implement `_transcribe(path)`; callers use `transcribe_file(path)`,
+    which bounds concurrency per backend and records latency metrics.
+    """
+    name = 'base'
+
+    def __init__(self, max_concurrency=4, **options):
+        self.options = options
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def transcribe_file(self, path):
+        started = time.perf_counter()
+        with self._semaphore:
+            try:
+                result = self._transcribe(path)
+            except TranscriptionError:
+                transcription_requests.inc(backend=self.name, outcome='error')
+                raise
+            except Exception as e:
+                transcription_requests.inc(backend=self.name, outcome='error')
+                raise TranscriptionError(f"{self.name} transcription failed: {e}") from e
+        result.latency = time.perf_counter() - started
+        transcription_requests.inc(backend=self.name, outcome='success')
+        transcription_latency.observe(result.latency, backend=self.name)
+        return result
+
+    def _transcribe(self, path):
+        raise NotImplementedError
+
+    def check_connection(self):
+        """Return (ok, message) describing whether the backend is usable"""
+        return True, f"{self.name} backend available"
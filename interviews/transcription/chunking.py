@@ -0,0 +1,97 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from ..clients import get_audio_segment
+from .base import TranscriptionResult
+
+
+def plan_chunks(sound, target_ms, max_ms, min_silence_ms, silence_thresh_db, keep_silence_ms):
+    """Return [(start_ms, end_ms)] chunk boundaries that fall in silences.
+
+    Speech regions are merged until a chunk reaches `target_ms`; a single
+    region longer than `max_ms` is cut at fixed intervals.
+    """
+    from pydub.silence import detect_nonsilent
+
+    duration = len(sound)
+    regions = detect_nonsilent(
+        sound,
+        min_silence_len=min_silence_ms,
+        silence_thresh=sound.dBFS - silence_thresh_db,
+        seek_step=10
+    )
+    if not regions:
+        return [(0, duration)]
+
+    chunks = []
+    start, end = regions[0]
+    for region_start, region_end in regions[1:]:
+        if end - start >= target_ms or region_end - start > max_ms:
+            chunks.append((start, end))
+            start = region_start
+        end = region_end
+    chunks.append((start, end))
+
+    bounded = []
+    for start, end in chunks:
+        while end - start > max_ms:
+            bounded.append((start, start + max_ms))
+            start += max_ms
+        bounded.append((start, end))
+
+    # Keep a little silence on each side so words at the edges are not clipped
+    return [(max(0, s - keep_silence_ms), min(duration, e + keep_silence_ms)) for s, e in bounded]
+
+
+def transcribe_chunked(path, backend, workers=None):
+    """Split `path` on silence, transcribe chunks in parallel and stitch them with timestamps.
+
+    Short recordings that yield a single chunk go to the backend unchanged.
+    """
+    options = settings.TRANSCRIPTION
+    started = time.perf_counter()
+    sound = get_audio_segment().from_file(path)
+    chunks = plan_chunks(
+        sound,
+        target_ms=options.get('CHUNK_TARGET_SECONDS', 30) * 1000,
+        max_ms=options.get('CHUNK_MAX_SECONDS', 60) * 1000,
+        min_silence_ms=options.get('CHUNK_MIN_SILENCE_MS', 700),
+        silence_thresh_db=options.get('CHUNK_SILENCE_THRESHOLD_DB', 16),
+        keep_silence_ms=300,
+    )
+    if len(chunks) == 1:
+        return backend.transcribe_file(path)
+
+    sound = sound.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        chunk_paths = []
+        for i, (start, end) in enumerate(chunks):
+            chunk_path = os.path.join(tmpdir, f"chunk_{i:04d}.wav")
+            sound[start:end].export(chunk_path, format="wav")
+            chunk_paths.append(chunk_path)
+
+        workers = workers or options.get('CHUNK_WORKERS') or options.get('MAX_CONCURRENCY', 4)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='transcribe-chunk') as executor:
+            results = list(executor.map(backend.transcribe_file, chunk_paths))
+
+    segments = []
+    for (start, end), result in zip(chunks, results):
+        offset = start / 1000
+        if result.segments:
+            segments.extend(
+                {'start': round(offset + s['start'], 2), 'end': round(offset + s['end'], 2), 'text': s['text']}
+                for s in result.segments
+            )
+        elif result.text:
+            segments.append({'start': round(offset, 2), 'end': round(end / 1000, 2), 'text': result.text})
+
+    return TranscriptionResult(
+        text=' '.join(segment['text'] for segment in segments).strip(),
+        backend=f"{backend.name}+chunked",
+        latency=time.perf_counter() - started,
+        segments=segments,
+    )
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from ..audio import convert_to_wav_local
+from .base import TranscriptionBackend, TranscriptionError, TranscriptionResult
+
+# Per-worker-process model, loaded once by `_init_worker`
+_model = None
+
+
+def _init_worker(model_size, compute_type, cpu_threads):
+    global _model
+    from faster_whisper import WhisperModel
+    _model = WhisperModel(model_size, device='cpu', compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _transcribe_in_worker(wav_path, beam_size, language):
+    segments, _info = _model.transcribe(wav_path, beam_size=beam_size, language=language, vad_filter=True)
+    segments = [
+        {'start': round(segment.start, 2), 'end': round(segment.end, 2), 'text': segment.text.strip()}
+        for segment in segments
+    ]
+    return ' '.join(segment['text'] for segment in segments).strip(), segments
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """On-box CPU transcription with faster-whisper (optional dependency).
+
+    Audio is converted to the 16kHz mono WAV produced by `convert_to_wav_local`
+    and decoded in a process pool with one single-threaded model per core, so
+    several answers are transcribed in parallel without the GIL or network.
+    """
+    name = 'local'
+
+    def __init__(self, **options):
+        workers = options.get('LOCAL_WORKERS') or os.cpu_count() or 1
+        options['max_concurrency'] = workers
+        super().__init__(**options)
+        self.workers = workers
+        self.model_size = self.options.get('LOCAL_MODEL', 'base.en')
+        self.compute_type = self.options.get('LOCAL_COMPUTE_TYPE', 'int8')
+        self.beam_size = self.options.get('LOCAL_BEAM_SIZE', 1)
+        self.language = self.options.get('LOCAL_LANGUAGE', 'en')
+        self.timeout = self.options.get('TIMEOUT', 300)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # spawn: forking a threaded Django process is unsafe
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.model_size, self.compute_type, 1),
+                )
+            return self._pool
+
+    def check_connection(self):
+        try:
+            import faster_whisper  # noqa: F401
+        except ImportError:
+            return False, "faster-whisper is not installed (pip install faster-whisper)"
+        return True, f"Local faster-whisper '{self.model_size}' model, {self.workers} worker processes"
+
+    def _transcribe(self, path):
+        ok, message = self.check_connection()
+        if not ok:
+            raise TranscriptionError(message)
+
+        fd, wav_path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            convert_to_wav_local(path, wav_path)
+            future = self.pool.submit(_transcribe_in_worker, wav_path, self.beam_size, self.language)
+            text, segments = future.result(timeout=self.timeout)
+        finally:
+            if os.path.exists(wav_path):
+                os.remove(wav_path)
+
+        if not text:
+            raise TranscriptionError("Local model returned an empty transcript")
+        return TranscriptionResult(text=text, backend=self.name, segments=segments)
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,57 @@
+import random
+import threading
+
+from .base import TranscriptionBackend, TranscriptionError
+
+
+class RoutingBackend(TranscriptionBackend):
+    """Send each file to the currently fastest backend, falling back to the others on failure.
+
+    Speed is an exponentially weighted moving average of observed latency;
+    backends that have not been tried yet rank first, and a small share of
+    traffic is routed randomly so estimates for slower backends stay fresh.
+    """
+    name = 'routing'
+    FAILURE_PENALTY = 60.0  # seconds added to the slowest known latency when a backend fails
+
+    def __init__(self, backends, explore_ratio=0.05, smoothing=0.3, **options):
+        super().__init__(**options)
+        self.backends = list(backends)
+        self.explore_ratio = explore_ratio
+        self.smoothing = smoothing
+        self.latencies = {backend.name: None for backend in self.backends}
+        self._lock = threading.Lock()
+
+    def ranked_backends(self):
+        with self._lock:
+            ranked = sorted(self.backends, key=lambda b: self.latencies[b.name] or 0.0)
+        if len(ranked) > 1 and random.random() < self.explore_ratio:
+            random.shuffle(ranked)
+        return ranked
+
+    def record_latency(self, backend_name, latency):
+        with self._lock:
+            previous = self.latencies[backend_name]
+            self.latencies[backend_name] = latency if previous is None else (
+                self.smoothing * latency + (1 - self.smoothing) * previous
+            )
+
+    def check_connection(self):
+        results = [(backend.name, *backend.check_connection()) for backend in self.backends]
+        ok = any(result[1] for result in results)
+        return ok, '; '.join(f"{name}: {message}" for name, _, message in results)
+
+    def _transcribe(self, path):
+        errors = []
+        for backend in self.ranked_backends():
+            try:
+                result = backend.transcribe_file(path)
+            except TranscriptionError as e:
+                # Push failing backends to the back of the ranking
+                slowest = max((latency or 0.0) for latency in self.latencies.values())
+                self.record_latency(backend.name, slowest + self.FAILURE_PENALTY)
+                errors.append(f"{backend.name}: {e}")
+                continue
+            self.record_latency(backend.name, result.latency)
+            return result
+        raise TranscriptionError("All transcription backends failed: " + "; ".join(errors))
@@ -0,0 +1,231 @@
+"""Incremental transcription of live call audio (Twilio Media Streams).
+
+Twilio sends 8kHz mono μ-law frames. A `StreamingSession` decodes them, runs
+a cheap energy-based voice activity detector and, whenever the caller pauses,
+hands the finished utterance to a batch `TranscriptionBackend` on a worker
+thread. By the time an answer's recording webhook arrives, all but the last
+utterance are already transcribed, so `flush()` only waits for the tail.
+"""
+import array
+import logging
+import os
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+from .base import TranscriptionError
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 8000
+FRAME_MS = 20
+FRAME_BYTES = SAMPLE_RATE * FRAME_MS // 1000 * 2  # 16-bit PCM
+
+
+def _ulaw_to_linear(value):
+    value = ~value & 0xFF
+    sign = value & 0x80
+    exponent = (value >> 4) & 0x07
+    mantissa = value & 0x0F
+    sample = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return -sample if sign else sample
+
+
+ULAW_TO_LINEAR = array.array('h', [_ulaw_to_linear(value) for value in range(256)])
+
+
+def ulaw_to_pcm16(data):
+    """Decode G.711 μ-law bytes to little-endian 16-bit PCM"""
+    return array.array('h', [ULAW_TO_LINEAR[value] for value in data]).tobytes()
+
+
+def pcm16_to_ulaw(data):
+    """Encode 16-bit PCM to G.711 μ-law (used to build replay fixtures)"""
+    samples = array.array('h')
+    samples.frombytes(data)
+    encoded = bytearray()
+    for sample in samples:
+        sign = 0x80 if sample < 0 else 0
+        magnitude = min(-sample if sign else sample, 32635) + 0x84
+        exponent = 7
+        mask = 0x4000
+        while exponent > 0 and not magnitude & mask:
+            exponent -= 1
+            mask >>= 1
+        mantissa = (magnitude >> (exponent + 3)) & 0x0F
+        encoded.append(~(sign | (exponent << 4) | mantissa) & 0xFF)
+    return bytes(encoded)
+
+
+def frame_energy(frame):
+    samples = array.array('h')
+    samples.frombytes(frame)
+    return (sum(sample * sample for sample in samples) / len(samples)) ** 0.5 if samples else 0.0
+
+
+class StreamingSession:
+    """Voice-activity-segmented transcription of one call's inbound audio"""
+
+    def __init__(self, backend, executor, end_silence_ms=600, energy_threshold=500,
+                 min_utterance_ms=300, max_utterance_ms=30000):
+        self.backend = backend
+        self.executor = executor
+        self.end_silence_ms = end_silence_ms
+        self.energy_threshold = energy_threshold
+        self.min_utterance_ms = min_utterance_ms
+        self.max_utterance_ms = max_utterance_ms
+        self.created_at = time.monotonic()
+        self._buffer = bytearray()
+        self._utterance = bytearray()
+        self._utterance_start_ms = 0
+        self._silence_ms = 0
+        self._received_ms = 0
+        self._pending = []  # [(start_s, end_s, future)] since the last flush
+        self._lock = threading.Lock()
+
+    def feed(self, pcm16):
+        """Add decoded audio; cuts an utterance whenever the caller pauses"""
+        with self._lock:
+            self._buffer.extend(pcm16)
+            while len(self._buffer) >= FRAME_BYTES:
+                frame = bytes(self._buffer[:FRAME_BYTES])
+                del self._buffer[:FRAME_BYTES]
+                self._process_frame(frame)
+
+    def feed_ulaw(self, payload):
+        self.feed(ulaw_to_pcm16(payload))
+
+    def _process_frame(self, frame):
+        speech = frame_energy(frame) >= self.energy_threshold
+        if speech:
+            if not self._utterance:
+                self._utterance_start_ms = self._received_ms
+            self._utterance.extend(frame)
+            self._silence_ms = 0
+        elif self._utterance:
+            self._utterance.extend(frame)
+            self._silence_ms += FRAME_MS
+            if self._silence_ms >= self.end_silence_ms:
+                self._finish_utterance()
+        self._received_ms += FRAME_MS
+        if self._utterance and self._duration_ms(self._utterance) >= self.max_utterance_ms:
+            self._finish_utterance()
+
+    @staticmethod
+    def _duration_ms(pcm16):
+        return len(pcm16) * 1000 // (SAMPLE_RATE * 2)
+
+    def _finish_utterance(self):
+        utterance = bytes(self._utterance)
+        start_ms = self._utterance_start_ms
+        trailing_silence_ms = self._silence_ms
+        self._utterance = bytearray()
+        self._silence_ms = 0
+        if self._duration_ms(utterance) - trailing_silence_ms < self.min_utterance_ms:
+            return
+        future = self.executor.submit(self._transcribe, utterance)
+        end_ms = start_ms + self._duration_ms(utterance) - trailing_silence_ms
+        self._pending.append((start_ms / 1000, end_ms / 1000, future))
+
+    def _transcribe(self, pcm16):
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            with wave.open(path, 'wb') as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(SAMPLE_RATE)
+                f.writeframes(pcm16)
+            return self.backend.transcribe_file(path).text
+        finally:
+            os.remove(path)
+
+    def flush(self, timeout=1.0):
+        """Close the current utterance and return (text, segments, complete) for audio since the last flush.
+
+        `complete` is False if some utterance was still being transcribed when
+        `timeout` expired; callers should then fall back to batch transcription.
+        """
+        with self._lock:
+            if self._utterance:
+                self._finish_utterance()
+            pending, self._pending = self._pending, []
+
+        _done, not_done = wait([future for _, _, future in pending], timeout=timeout)
+        segments = []
+        for start, end, future in pending:
+            if future in not_done:
+                continue
+            try:
+                text = future.result()
+            except TranscriptionError as e:
+                logger.warning("Streaming utterance transcription failed: %s", e)
+                not_done.add(future)
+                continue
+            if text:
+                segments.append({'start': round(start, 2), 'end': round(end, 2), 'text': text})
+
+        return ' '.join(s['text'] for s in segments).strip(), segments, not not_done and bool(segments)
+
+
+_executor = None
+_sessions = {}
+_sessions_lock = threading.Lock()
+SESSION_TTL = 3 * 60 * 60  # seconds; sessions of calls that never reported completion are dropped
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.TWILIO_MEDIA_STREAMS['WORKERS'],
+            thread_name_prefix='stream-transcribe'
+        )
+    return _executor
+
+
+def open_stream_session(call_sid):
+    """Start (or return) the streaming session for a call"""
+    from . import get_transcription_backend
+
+    options = settings.TWILIO_MEDIA_STREAMS
+    with _sessions_lock:
+        now = time.monotonic()
+        for stale_sid in [sid for sid, s in _sessions.items() if now - s.created_at > SESSION_TTL]:
+            del _sessions[stale_sid]
+        session = _sessions.get(call_sid)
+        if session is None:
+            session = _sessions[call_sid] = StreamingSession(
+                get_transcription_backend(options['BACKEND']),
+                _get_executor(),
+                end_silence_ms=options['END_SILENCE_MS'],
+                energy_threshold=options['ENERGY_THRESHOLD'],
+            )
+        return session
+
+
+def get_stream_session(call_sid):
+    with _sessions_lock:
+        return _sessions.get(call_sid)
+
+
+def close_stream_session(call_sid):
+    with _sessions_lock:
+        return _sessions.pop(call_sid, None)
+
+
+def claim_stream_transcript(call_sid, timeout=None):
+    """Transcript of the caller's speech since the previous claim, or None if unavailable/incomplete"""
+    session = get_stream_session(call_sid)
+    if session is None:
+        return None
+    if timeout is None:
+        timeout = settings.TWILIO_MEDIA_STREAMS['FLUSH_TIMEOUT']
+    text, segments, complete = session.flush(timeout=timeout)
+    if not complete:
+        return None
+    return text, segments
@@ -0,0 +1,16 @@
+import os
+import time
+
+from .base import TranscriptionBackend, TranscriptionResult
+
+
+class StubBackend(TranscriptionBackend):
+    """Local backend for tests and offline development; never touches the network"""
+    name = 'stub'
+
+    def _transcribe(self, path):
+        latency = self.options.get('STUB_LATENCY', 0)
+        if latency:
+            time.sleep(latency)
+        text = self.options.get('STUB_TEXT') or f"Stub transcript for {os.path.basename(path)}"
+        return TranscriptionResult(text=text, backend=self.name)
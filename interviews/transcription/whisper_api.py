@@ -0,0 +1,39 @@
+from ..metrics import span
+from .base import TranscriptionBackend, TranscriptionError, TranscriptionResult
+
+
+class WhisperAPIBackend(TranscriptionBackend):
+    """OpenAI's hosted Whisper transcription endpoint (single synchronous request, no polling)"""
+    name = 'whisper_api'
+
+    def __init__(self, api_key=None, **options):
+        super().__init__(**options)
+        self.api_key = api_key or self.options.get('OPENAI_API_KEY')
+        self.model = self.options.get('WHISPER_MODEL', 'whisper-1')
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(
+                api_key=self.api_key,
+                base_url=self.options.get('OPENAI_BASE_URL'),
+                timeout=self.options.get('TIMEOUT', 300),
+                max_retries=2
+            )
+        return self._client
+
+    def check_connection(self):
+        if not self.api_key:
+            return False, "OpenAI API key not configured"
+        return True, "OpenAI Whisper API configured"
+
+    def _transcribe(self, path):
+        if not self.api_key:
+            raise TranscriptionError("OpenAI API key not configured")
+        with open(path, "rb") as f, span('whisper_api.transcribe'):
+            response = self.client.audio.transcriptions.create(model=self.model, file=f)
+        if not response.text:
+            raise TranscriptionError("Whisper returned an empty transcript")
+        return TranscriptionResult(text=response.text, backend=self.name)
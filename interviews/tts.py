@@ -0,0 +1,145 @@
+"""Pre-rendered text-to-speech for interview prompts.
+
+Prompts are synthesized once, stored under a content address (a hash of the
+voice settings and text) and played with `<Play>` instead of being
+synthesized by Twilio's `<Say>` on every call. Prompts that have not been
+rendered yet, and text generated during the call, are spoken with `<Say>` in
+``TTS['SAY_VOICE']``, a Twilio voice chosen to sound close to ``TTS['VOICE']``
+so the interviewer doesn't audibly change between prompts.
+"""
+import functools
+import hashlib
+import io
+import wave
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from .metrics import span
+
+# Shared by every call; rendered together with each job description's questions
+WELCOME_PROMPT = "Welcome to your AI interview. I'll be asking you several questions. Please answer each question clearly. Let's begin."
+NEXT_QUESTION_PROMPT = "Thank you for your answer. Moving to the next question."
+GOODBYE_PROMPT = "Thank you for completing all the questions. We'll review your responses and get back to you soon. Goodbye!"
+BOILERPLATE_PROMPTS = [WELCOME_PROMPT, NEXT_QUESTION_PROMPT, GOODBYE_PROMPT]
+
+
+def question_prompt(question):
+    return f"Question {question.question_number}: {question.question_text}"
+
+
+class OpenAITTSBackend:
+    name = 'openai'
+    extension = 'mp3'
+    content_type = 'audio/mpeg'
+
+    def __init__(self, model, voice):
+        self.model = model
+        self.voice = voice
+        self.client = None
+
+    @property
+    def cache_key(self):
+        return f"{self.name}:{self.model}:{self.voice}"
+
+    def synthesize(self, text):
+        if self.client is None:
+            import openai
+            self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+        response = self.client.audio.speech.create(
+            model=self.model, voice=self.voice, input=text, response_format='mp3'
+        )
+        return response.content
+
+
+class StubTTSBackend:
+    """Writes silence sized to the text; for development without an API key"""
+    name = 'stub'
+    extension = 'wav'
+    content_type = 'audio/wav'
+    cache_key = 'stub'
+
+    def __init__(self, model=None, voice=None):
+        pass
+
+    def synthesize(self, text):
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(8000)
+            f.writeframes(b'\0\0' * 8000 * max(1, len(text) // 15))
+        return buffer.getvalue()
+
+
+TTS_BACKENDS = {
+    'openai': OpenAITTSBackend,
+    'stub': StubTTSBackend,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_tts_backend():
+    options = settings.TTS
+    return TTS_BACKENDS[options['BACKEND']](model=options['MODEL'], voice=options['VOICE'])
+
+
+def prompt_digest(text):
+    """Content address of a prompt: identical text and voice settings share one file"""
+    key = f"{get_tts_backend().cache_key}\n{text}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def prompt_path(digest):
+    return f"tts/{digest[:2]}/{digest}.{get_tts_backend().extension}"
+
+
+# Digests known to be rendered, so TwiML generation skips the storage lookup
+_rendered = set()
+
+
+def is_rendered(digest):
+    if digest in _rendered:
+        return True
+    if default_storage.exists(prompt_path(digest)):
+        _rendered.add(digest)
+        return True
+    return False
+
+
+def render_prompt(text):
+    """Synthesize and store `text` unless it is already stored; returns its digest"""
+    digest = prompt_digest(text)
+    if not is_rendered(digest):
+        backend = get_tts_backend()
+        with span('tts.synthesize', backend=backend.name):
+            audio = backend.synthesize(text)
+        default_storage.save(prompt_path(digest), ContentFile(audio))
+        _rendered.add(digest)
+    return digest
+
+
+def prompt_url(text):
+    """Absolute URL of the pre-rendered audio for `text`, or None if it must be spoken live"""
+    if not settings.TTS['PRERENDER_ENABLED']:
+        return None
+    digest = prompt_digest(text)
+    if not is_rendered(digest):
+        return None
+    return settings.BASE_URL.rstrip('/') + reverse('tts_prompt', kwargs={'digest': digest})
+
+
+def say(response, text):
+    """Add `text` to a VoiceResponse as `<Say>` in the interviewer's voice"""
+    response.say(text, voice=settings.TTS['SAY_VOICE'])
+
+
+def say_or_play(response, text):
+    """Add `text` to a VoiceResponse as pre-rendered `<Play>` if available, else `<Say>`"""
+    url = prompt_url(text)
+    if url:
+        response.play(url)
+    else:
+        say(response, text)
@@ -1,10 +1,11 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 
 urlpatterns = [
     # Job Description endpoints
     path('job-descriptions/', views.JobDescriptionListView.as_view(), name='list_job_descriptions'),
     path('job-descriptions/create/', views.JobDescriptionCreateView.as_view(), name='create_job_description'),
+    path('job-descriptions/<uuid:job_description_id>/', views.JobDescriptionDetailView.as_view(), name='get_job_description'),
     
     # Candidate endpoints
     path('candidates/', views.CandidateListView.as_view(), name='list_candidates'),
@@ -15,6 +16,7 @@ urlpatterns = [
     path('interviews/create/', views.InterviewCreateView.as_view(), name='create_interview'),
     path('interviews/<uuid:interview_id>/trigger/', views.InterviewTriggerView.as_view(), name='trigger_interview'),
     path('interviews/<uuid:interview_id>/results/', views.InterviewResultsView.as_view(), name='get_interview_results'),
+    path('interviews/<uuid:interview_id>/events/', views.InterviewEventsView.as_view(), name='interview_events'),
     
     # Twilio webhooks
     path('webhook/interview/<uuid:interview_id>/twiml/', views.TwilioWebhookTwiMLView.as_view(), name='twilio_webhook_twiml'),
@@ -29,6 +31,20 @@ urlpatterns = [
     path('audio-files/', views.AudioFilesListView.as_view(), name='list_audio_files'),
     path('audio-files/interview/<uuid:interview_id>/', views.AudioFilesByInterviewView.as_view(), name='list_audio_files_by_interview'),
     
+    # Outbound webhook subscriptions
+    path('webhooks/', views.WebhookEndpointListView.as_view(), name='list_webhook_endpoints'),
+    path('webhooks/create/', views.WebhookEndpointCreateView.as_view(), name='create_webhook_endpoint'),
+    path('webhooks/<uuid:endpoint_id>/', views.WebhookEndpointDetailView.as_view(), name='webhook_endpoint'),
+    
+    # Search
+    path('search/', views.SearchView.as_view(), name='search'),
+    
+    # Pre-rendered prompt audio
+    re_path(r'^tts/(?P<digest>[0-9a-f]{64})/$', views.TTSPromptView.as_view(), name='tts_prompt'),
+    
+    # Metrics
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
+    
     # Debug endpoints
     path('debug/transcription/<uuid:answer_id>/', views.DebugTranscriptionView.as_view(), name='debug_transcription'),
     
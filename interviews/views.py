@@ -3,26 +3,151 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from asgiref.sync import sync_to_async
+import functools
 import json
+import logging
+import math
+import secrets
+import time
+from urllib.parse import urlencode
 import requests
-from .models import JobDescription, Candidate, Interview, Question, Answer
+from .models import (
+    JobDescription, QuestionSet, Candidate, Interview, Question, Answer, SearchDocument, WebhookEndpoint,
+    prefetch_questions
+)
 from .serializers import (
     JobDescriptionSerializer, CandidateSerializer, InterviewSerializer,
-    InterviewCreateSerializer, InterviewResultSerializer
+    InterviewCreateSerializer, InterviewResultSerializer, WebhookEndpointSerializer
 )
-from .utils import (
-    generate_questions_from_jd, parse_resume, score_answer, generate_final_recommendation,
-    validate_phone_number, is_whitelisted_number, create_twilio_call,
-    generate_interview_twiml, generate_transcript_from_audio
+from .tasks import (
+    enqueue, evaluate_answer, finalize_interview, generate_job_description_questions,
+    prerender_job_description_prompts, validate_callback_url
 )
+from .ai import get_cached_questions, generate_followup_question
+from . import events, idempotency, response_cache
+from .llm import get_llm_gateway
+from .metrics import registry, span
+from .resume import parse_resume
+from .resume_index import build_resume_index
+from .search import search
+from .telephony import validate_phone_number, is_whitelisted_number, create_twilio_call, generate_interview_twiml
+from .transcription import generate_transcript_from_audio
+from .tts import GOODBYE_PROMPT, NEXT_QUESTION_PROMPT, question_prompt, say, say_or_play, get_tts_backend, prompt_path
+from .transcription.streaming import claim_stream_transcript, close_stream_session
 from twilio.twiml.voice_response import VoiceResponse
 
+logger = logging.getLogger(__name__)
+
+webhook_latency = registry.histogram(
+    'twilio_webhook_seconds', 'Time to answer Twilio webhooks by webhook',
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+)
+followup_questions = registry.counter('followup_questions_total', 'Adaptive follow-up question attempts by outcome')
+
+def timed_webhook(name):
+    """Record a webhook handler's latency in the twilio_webhook_seconds histogram"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return handler(self, request, *args, **kwargs)
+            finally:
+                webhook_latency.observe(time.perf_counter() - started, webhook=name)
+        return wrapper
+    return decorator
+
+def idempotent_webhook(name, *fields, redirect=False):
+    """Answer Twilio's retries of a webhook with the first delivery's response (see interviews.idempotency).
+
+    Deliveries are identified by the request path and the POST `fields`;
+    requests missing any of them are always handled. Responses marked
+    ``Cache-Control: no-store`` (see `webhook_error`) are not replayed.
+
+    A retry arriving while the first delivery is still running gets an empty
+    TwiML response, or with `redirect` a pause and a redirect back to this URL
+    carrying the delivery's parameters, so Twilio asks again once the first
+    response is stored. If the first delivery failed in between, the
+    redirected request is handled with those parameters (see `webhook_param`).
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            values = [webhook_param(request, field) for field in fields]
+            if not settings.TWILIO_WEBHOOK_IDEMPOTENCY['ENABLED'] or not all(values):
+                return handler(self, request, *args, **kwargs)
+
+            key = idempotency.delivery_key(name, request.path, *values)
+            stored = idempotency.claim(key)
+            if stored is not None:
+                if stored['content'] is None:
+                    # The first delivery is still running; answer without holding a worker
+                    idempotency.twilio_webhook_duplicates.inc(webhook=name, outcome='in_flight')
+                    response = VoiceResponse()
+                    if redirect:
+                        response.pause(length=settings.TWILIO_WEBHOOK_IDEMPOTENCY['IN_FLIGHT_PAUSE'])
+                        # Twilio posts only the call's parameters to a redirect, not the recording's
+                        params = {**request.GET.dict(), **request.POST.dict()}
+                        response.redirect(f"{request.path}?{urlencode(params)}")
+                    return HttpResponse(str(response), content_type='text/xml; charset=utf-8')
+                idempotency.twilio_webhook_duplicates.inc(webhook=name, outcome='replayed')
+                logger.info("Replaying the response to a retried %s webhook", name)
+                return HttpResponse(stored['content'], content_type=stored['content_type'])
+
+            try:
+                response = handler(self, request, *args, **kwargs)
+            except Exception:
+                idempotency.release(key)
+                raise
+            if response.status_code == 200 and 'no-store' not in response.get('Cache-Control', ''):
+                idempotency.store(key, response.content, response['Content-Type'])
+            else:
+                idempotency.release(key)
+            return response
+        return wrapper
+    return decorator
+
+def webhook_param(request, name):
+    """A Twilio webhook parameter from the POST body, or the query string of a redirected retry"""
+    return request.POST.get(name) or request.GET.get(name)
+
+def download_recording(recording_url):
+    """Fetch a Twilio recording, giving up TWILIO_RECORDING_DOWNLOAD_TIMEOUT seconds after the request started.
+
+    requests' own timeout applies to each socket read, so a slowly trickling
+    body could otherwise keep the webhook past Twilio's 15 second retry.
+    Returns the response and its body; raises requests.Timeout past the deadline.
+    """
+    limit = settings.TWILIO_RECORDING_DOWNLOAD_TIMEOUT
+    deadline = time.monotonic() + limit
+    with requests.get(
+        recording_url, auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN), timeout=limit, stream=True
+    ) as response:
+        chunks = []
+        for chunk in response.iter_content(64 * 1024):
+            if time.monotonic() > deadline:
+                raise requests.Timeout(f"Recording download took over {limit}s")
+            chunks.append(chunk)
+    return response, b''.join(chunks)
+
+def webhook_error(content, content_type='text/xml; charset=utf-8'):
+    """Response to a Twilio webhook that failed; never replayed to retries, which are handled afresh"""
+    response = HttpResponse(content, content_type=content_type)
+    response['Cache-Control'] = 'no-store'
+    return response
+
 def validate_api_key(request):
     """Validate API key from request headers"""
     api_key = request.headers.get('X-API-Key')
@@ -30,8 +155,53 @@ def validate_api_key(request):
         return False
     return True
 
+def cached_response(scope):
+    """Serve a GET handler's data from the response cache, with ETag/Last-Modified revalidation.
+
+    `scope(**kwargs)` names the rows the response depends on (see
+    interviews.response_cache). Only 200 responses to a valid API key are
+    cached, and not those marked Cache-Control: no-store.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            if not settings.RESPONSE_CACHE['ENABLED'] or not validate_api_key(request):
+                return handler(self, request, *args, **kwargs)
+
+            view = type(self).__name__
+            uncached = None
+
+            def build():
+                nonlocal uncached
+                response = handler(self, request, *args, **kwargs)
+                if response.status_code != 200 or 'no-store' in response.get('Cache-Control', ''):
+                    uncached = response
+                    return None
+                return response.data
+
+            entry, hit = response_cache.get_or_build(scope(**kwargs), view, request.get_full_path(), build)
+            if entry is None:
+                response_cache.response_cache_requests.inc(view=view, result='uncacheable')
+                return uncached
+
+            last_modified = math.ceil(entry['last_modified'])
+            response = get_conditional_response(request, etag=entry['etag'], last_modified=last_modified)
+            if response is None:
+                response = Response(entry['data'])
+                result = 'hit' if hit else 'miss'
+            else:
+                result = 'not_modified'
+            response_cache.response_cache_requests.inc(view=view, result=result)
+            response['ETag'] = entry['etag']
+            response['Last-Modified'] = http_date(last_modified)
+            response['Cache-Control'] = 'private, no-cache'
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+            return response
+        return wrapper
+    return decorator
+
 class JobDescriptionCreateView(APIView):
-    """Create a job description and generate questions"""
+    """Create a job description; questions are generated in the background unless cached"""
     permission_classes = [AllowAny]
     
     def post(self, request):
@@ -41,6 +211,7 @@ class JobDescriptionCreateView(APIView):
         try:
             title = request.data.get('title')
             description = request.data.get('description')
+            callback_url = request.data.get('callback_url') or ''
             
             if not title or not description:
                 return Response(
@@ -48,17 +219,38 @@ class JobDescriptionCreateView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Generate questions using OpenAI
-            questions = generate_questions_from_jd(description)
+            if callback_url:
+                try:
+                    # The host is resolved and checked when the callback is sent
+                    validate_callback_url(callback_url, resolve=False)
+                except ValidationError as e:
+                    return Response(
+                        {'error': f"Invalid callback_url: {' '.join(e.messages)}"}, 
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
             
-            # Create job description
-            job_description = JobDescription.objects.create(
-                title=title,
-                description=description,
-                questions=questions
-            )
+            # Identical descriptions are answered from the question cache without calling OpenAI
+            questions = get_cached_questions(description)
+            
+            with transaction.atomic():
+                job_description = JobDescription.objects.create(
+                    title=title,
+                    description=description,
+                    questions=questions or [],
+                    questions_status='ready' if questions is not None else 'pending',
+                    callback_url=callback_url
+                )
+                if questions is not None:
+                    QuestionSet.objects.create_for_job_description(job_description, questions)
+                    if settings.TTS['PRERENDER_ENABLED']:
+                        enqueue(prerender_job_description_prompts, job_description.id)
+                else:
+                    # Generate questions using OpenAI in the background
+                    enqueue(generate_job_description_questions, job_description.id)
             
             serializer = JobDescriptionSerializer(job_description)
+            if job_description.questions_status == 'pending':
+                return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
             
         except Exception as e:
@@ -67,10 +259,23 @@ class JobDescriptionCreateView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class JobDescriptionDetailView(APIView):
+    """Get a job description, used to poll for generated questions"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request, job_description_id):
+        if not validate_api_key(request):
+            return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        job_description = get_object_or_404(JobDescription, id=job_description_id)
+        serializer = JobDescriptionSerializer(job_description)
+        return Response(serializer.data)
+
 class JobDescriptionListView(APIView):
     """List all job descriptions"""
     permission_classes = [AllowAny]
     
+    @cached_response(lambda: 'job_descriptions')
     def get(self, request):
         if not validate_api_key(request):
             return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
@@ -118,7 +323,8 @@ class CandidateCreateView(APIView):
                 email=email,
                 phone=formatted_phone,
                 resume=resume,
-                resume_text=resume_text
+                resume_text=resume_text,
+                resume_index=build_resume_index(resume_text, settings.RESUME_PARSING['CHUNK_CHARS']) if resume_text else {}
             )
             
             serializer = CandidateSerializer(candidate)
@@ -134,6 +340,7 @@ class CandidateListView(APIView):
     """List all candidates"""
     permission_classes = [AllowAny]
     
+    @cached_response(lambda: 'candidates')
     def get(self, request):
         if not validate_api_key(request):
             return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
@@ -153,17 +360,16 @@ class InterviewCreateView(APIView):
         try:
             serializer = InterviewCreateSerializer(data=request.data)
             if serializer.is_valid():
-                interview = serializer.save()
-                
-                # Create Question objects from job description
-                job_description = interview.job_description
-                for i, question_text in enumerate(job_description.questions, 1):
-                    Question.objects.create(
-                        interview=interview,
-                        question_text=question_text,
-                        question_number=i
+                job_description = serializer.validated_data['job_description']
+                if job_description.questions_status != 'ready':
+                    return Response(
+                        {'error': f'Questions for this job description are {job_description.questions_status}'}, 
+                        status=status.HTTP_400_BAD_REQUEST
                     )
                 
+                # Reference the job description's shared question set instead of copying rows
+                interview = serializer.save(question_set=job_description.get_current_question_set())
+                
                 serializer = InterviewSerializer(interview)
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             else:
@@ -179,11 +385,14 @@ class InterviewListView(APIView):
     """List all interviews"""
     permission_classes = [AllowAny]
     
+    @cached_response(lambda: 'interviews')
     def get(self, request):
         if not validate_api_key(request):
             return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        interviews = Interview.objects.all().order_by('-created_at')
+        interviews = prefetch_questions(
+            Interview.objects.select_related('job_description', 'candidate').order_by('-created_at')
+        )
         serializer = InterviewSerializer(interviews, many=True, context={'request': request})
         return Response(serializer.data)
 
@@ -196,16 +405,13 @@ class InterviewTriggerView(APIView):
             return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
         
         try:
-            print(f"Triggering interview: {interview_id}")
             interview = get_object_or_404(Interview, id=interview_id)
-            print(f"Interview found: {interview.id}")
-            print(f"Candidate phone: {interview.candidate.phone}")
             
             # Check if phone number is whitelisted
             is_whitelisted = is_whitelisted_number(interview.candidate.phone)
-            print(f"Phone whitelisted: {is_whitelisted}")
             
             if not is_whitelisted:
+                logger.info("Interview call refused: phone number not whitelisted")
                 return Response(
                     {'error': 'Phone number not whitelisted for testing'}, 
                     status=status.HTTP_400_BAD_REQUEST
@@ -213,7 +419,6 @@ class InterviewTriggerView(APIView):
             
             # Check if questions exist
             questions = interview.questions.all()
-            print(f"Questions found: {questions.count()}")
             
             if not questions.exists():
                 return Response(
@@ -222,9 +427,7 @@ class InterviewTriggerView(APIView):
                 )
             
             # Create Twilio call
-            print("Creating Twilio call...")
             call_sid = create_twilio_call(interview)
-            print(f"Call SID: {call_sid}")
             
             if not call_sid:
                 return Response(
@@ -235,7 +438,7 @@ class InterviewTriggerView(APIView):
             # Update interview status
             interview.status = 'in_progress'
             interview.twilio_call_sid = call_sid
-            interview.save()
+            interview.save(update_fields=['status', 'twilio_call_sid', 'updated_at'])
             
             return Response({
                 'message': 'Interview call initiated',
@@ -244,9 +447,7 @@ class InterviewTriggerView(APIView):
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            print(f"Error triggering interview: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error triggering interview: %s", e)
             return Response(
                 {'error': f'Error triggering interview: {str(e)}'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -256,12 +457,16 @@ class InterviewResultsView(APIView):
     """Get interview results with scores and recommendations"""
     permission_classes = [AllowAny]
     
+    @cached_response(lambda interview_id: f'interview:{interview_id}')
     def get(self, request, interview_id):
         if not validate_api_key(request):
             return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
         
         try:
-            interview = get_object_or_404(Interview, id=interview_id)
+            interview = get_object_or_404(
+                Interview.objects.select_related('candidate').prefetch_related('answers'), id=interview_id
+            )
+            questions = interview.question_list
             
             # Track evaluation progress
             evaluation_results = {
@@ -271,76 +476,53 @@ class InterviewResultsView(APIView):
                 'errors': []
             }
             
-            print(f"Step 1: Generating transcripts for interview {interview_id}")
-            for question in interview.questions.all():
-                answer = question.answers.first()
-                if answer and answer.audio_file:
-                    if not answer.transcript:
-                        try:
-                            print(f"Generating transcript for question {question.question_number}")
-                            transcript = generate_transcript_from_audio(answer)
-                            if transcript:
-                                evaluation_results['transcripts_generated'] += 1
-                                print(f"✓ Transcript generated for question {question.question_number}")
-                            else:
-                                evaluation_results['errors'].append(f"Failed to generate transcript for question {question.question_number}")
-                        except Exception as e:
-                            error_msg = f"Error generating transcript for question {question.question_number}: {str(e)}"
-                            evaluation_results['errors'].append(error_msg)
-                            print(f"✗ {error_msg}")
-                    else:
-                        print(f"✓ Transcript already exists for question {question.question_number}")
-            
-            print(f"Step 2: Scoring answers for interview {interview_id}")
-            for question in interview.questions.all():
-                answer = question.answers.first()
-                # if answer and answer.transcript and (answer.score is None or not answer.feedback):
-                try:
-                    print(f"Scoring answer for question {question.question_number}")
-                    score, feedback = score_answer(
-                        question.question_text,
-                        answer.transcript,
-                        interview.candidate.resume_text
-                    )
-                    
-                    answer.score = score
-                    answer.feedback = feedback
-                    answer.save()
-                    
-                    evaluation_results['answers_scored'] += 1
-                    print(f"✓ Answer scored for question {question.question_number}: {score}/10")
-                except Exception as e:
-                    error_msg = f"Error scoring answer for question {question.question_number}: {str(e)}"
-                    evaluation_results['errors'].append(error_msg)
-                    print(f"✗ {error_msg}")
-            
-            print(f"Step 3: Generating final recommendation for interview {interview_id}")
-            if interview.status == 'completed':
+            # Answers the background tasks haven't finished; evaluate_answer claims each
+            # one, so a poll never repeats the transcription or scoring they are doing
+            pending = [
+                answer for answer in interview.answers.all()
+                if answer.score is None and (answer.transcript or answer.audio_file)
+            ]
+            for answer in pending:
                 try:
-                    recommendation = generate_final_recommendation(interview)
-                    interview.recommendation = recommendation
-                    interview.save()
-                    evaluation_results['evaluation_completed'] = True
-                    print(f"✓ Final recommendation generated")
+                    evaluate_answer(answer.id)
                 except Exception as e:
-                    error_msg = f"Error generating final recommendation: {str(e)}"
+                    error_msg = f"Error evaluating answer {answer.id}: {str(e)}"
                     evaluation_results['errors'].append(error_msg)
-                    print(f"✗ {error_msg}")
+                    logger.warning(error_msg)
+            if pending:
+                interview = Interview.objects.select_related('candidate').prefetch_related('answers').get(id=interview_id)
+                interview.question_list = questions
+                evaluated = {answer.id: answer for answer in interview.answers.all()}
+                for before in pending:
+                    after = evaluated.get(before.id)
+                    if after is None or after.evaluation_started_at is not None:
+                        continue  # deleted, or still being evaluated by a background task
+                    if after.transcript and not before.transcript:
+                        evaluation_results['transcripts_generated'] += 1
+                    if after.score is not None:
+                        evaluation_results['answers_scored'] += 1
+                    elif not after.transcript:
+                        evaluation_results['errors'].append(f"Failed to generate transcript for answer {after.id}")
+            # The recommendation is written only by finalize_interview (after the call, or POST .../evaluate/)
             
-            total_questions = interview.questions.count()
+            total_questions = len(questions)
             answered_questions = 0
             scored_questions = 0
             
-            for question in interview.questions.all():
-                answer = question.answers.first()
+            for question in questions:
+                answer = interview.get_answer(question)
                 if answer and answer.transcript:
                     answered_questions += 1
                 if answer and answer.score is not None:
                     scored_questions += 1
             
+            if answered_questions and scored_questions >= answered_questions:
                 evaluation_results['evaluation_completed'] = True
             else:
-                print(f"⚠ Evaluation incomplete: {scored_questions}/{answered_questions}/{total_questions} questions scored/answered/total")
+                logger.info(
+                    "Evaluation incomplete: %d/%d/%d questions scored/answered/total",
+                    scored_questions, answered_questions, total_questions
+                )
             
             # Step 5: Serialize and return results
             serializer = InterviewResultSerializer(interview, context={'request': request})
@@ -357,49 +539,97 @@ class InterviewResultsView(APIView):
                 'errors': evaluation_results['errors'] if evaluation_results['errors'] else None
             }
             
-            print(f"Interview results ready: {scored_questions}/{total_questions} questions evaluated")
-            return Response(response_data, status=status.HTTP_200_OK)
+            response = Response(response_data, status=status.HTTP_200_OK)
+            if evaluation_results['errors']:
+                # Retry the failed steps on the next request instead of serving this from the cache
+                response['Cache-Control'] = 'no-store'
+            return response
             
         except Exception as e:
             error_msg = f"Error getting results: {str(e)}"
-            print(f"✗ {error_msg}")
+            logger.exception(error_msg)
             return Response(
                 {'error': error_msg}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 
+class InterviewEventsView(View):
+    """Stream an interview's progress as server-sent events (see interviews.events).
+
+    The stream starts with a snapshot and ends after the final recommendation.
+    EventSource cannot send headers, so the API key may also be passed as
+    ?api_key=. Needs an ASGI server; WSGI servers buffer the whole stream.
+    """
+    
+    async def get(self, request, interview_id):
+        api_key = request.headers.get('X-API-Key') or request.GET.get('api_key')
+        if not api_key or api_key != settings.API_KEY:
+            return HttpResponse('Invalid API key', status=401, content_type='text/plain')
+        if not await Interview.objects.filter(id=interview_id).aexists():
+            raise Http404("Interview not found")
+        
+        response = StreamingHttpResponse(
+            self.stream(interview_id), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx would otherwise buffer the stream
+        return response
+    
+    async def stream(self, interview_id):
+        options = settings.EVENTS
+        # Subscribe before reading the snapshot so no change falls in between
+        subscription = events.get_broker().subscribe(events.channel_for(interview_id))
+        try:
+            yield f"retry: {options['RETRY_MS']}\n\n"
+            event = await sync_to_async(events.interview_snapshot)(interview_id)
+            while True:
+                if event is None:
+                    # Comments keep proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                    if events.is_final(event):
+                        break
+                event = await subscription.get(timeout=options['HEARTBEAT_SECONDS'])
+                if subscription.overflowed:
+                    # This client fell behind; resend the whole state instead of the dropped events
+                    subscription.clear()
+                    event = await sync_to_async(events.interview_snapshot)(interview_id)
+        finally:
+            subscription.close()
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class TwilioWebhookTwiMLView(View):
     """Generate TwiML for the interview call"""
     
+    @timed_webhook('twiml')
     def post(self, request, interview_id):
         try:
-            print(f"TwiML webhook called for interview: {interview_id}")
+            if settings.ADAPTIVE_FOLLOWUPS_ENABLED:
+                # Build the LLM client now; the media stream keeps its connection warm while the candidate answers
+                get_llm_gateway().warm_up(settings.ADAPTIVE_FOLLOWUP_MODEL)
             
             # Check if interview exists
             try:
                 interview = get_object_or_404(Interview, id=interview_id)
-                print(f"Interview found: {interview.id}")
             except Exception as e:
-                print(f"Interview not found: {e}")
+                logger.warning("Interview not found: %s", e)
                 error_response = VoiceResponse()
-                error_response.say("Interview not found. Please check the interview ID.", voice='alice')
+                say(error_response, "Interview not found. Please check the interview ID.")
                 return HttpResponse(str(error_response), content_type='text/xml; charset=utf-8')
             
             # Check if questions exist
             questions = interview.questions.all()
             if not questions.exists():
-                print("No questions found for interview")
+                logger.warning("No questions found for interview")
                 error_response = VoiceResponse()
-                error_response.say("No questions found for this interview. Please contact support.", voice='alice')
+                say(error_response, "No questions found for this interview. Please contact support.")
                 return HttpResponse(str(error_response), content_type='text/xml; charset=utf-8')
             
-            print(f"Generating TwiML for {questions.count()} questions")
-            twiml = generate_interview_twiml(interview)
-            
-            print("TwiML generated successfully")
-            print(f"TwiML length: {len(twiml)} characters")
+            twiml = generate_interview_twiml(interview, request.POST.get('CallSid'))
+            logger.debug("TwiML length: %d characters", len(twiml))
             
             # Ensure proper XML header and content type
             if not twiml.startswith('<?xml'):
@@ -408,39 +638,43 @@ class TwilioWebhookTwiMLView(View):
             return HttpResponse(twiml, content_type='text/xml; charset=utf-8')
             
         except Exception as e:
-            print(f"Error in TwiML webhook: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in TwiML webhook: %s", e)
             
             # Return a simple error TwiML
             error_response = VoiceResponse()
-            error_response.say("We are sorry, an application error has occurred. Please try again later.", voice='alice')
-            return HttpResponse(str(error_response), content_type='text/xml; charset=utf-8')
+            say(error_response, "We are sorry, an application error has occurred. Please try again later.")
+            return webhook_error(str(error_response))
 
 @method_decorator(csrf_exempt, name='dispatch')
 class TwilioWebhookAnswerView(View):
     """Handle recorded answer from Twilio"""
     
+    @timed_webhook('answer')
+    @idempotent_webhook('answer', 'CallSid', 'RecordingSid', redirect=True)
     def post(self, request, interview_id, question_id):
+        started = time.perf_counter()
         try:
-            print(f"Answer webhook called for interview: {interview_id}, question: {question_id}")
-            
             interview = get_object_or_404(Interview, id=interview_id)
-            question = get_object_or_404(Question, id=question_id, interview=interview)
+            question = get_object_or_404(interview.questions, id=question_id)
             
             # Get recording URL from Twilio
-            recording_url = request.POST.get('RecordingUrl')
-            recording_duration = request.POST.get('RecordingDuration')
+            recording_url = webhook_param(request, 'RecordingUrl')
+            recording_sid = webhook_param(request, 'RecordingSid')
+            recording_duration = webhook_param(request, 'RecordingDuration')
+            
+            logger.debug("Recording %s, duration %s", recording_url, recording_duration)
             
-            print(f"Recording URL: {recording_url}")
-            print(f"Recording Duration: {recording_duration}")
+            if recording_url and not idempotency.claim_recording(recording_sid):
+                # A retry whose first delivery saved, or is still downloading, this recording
+                idempotency.twilio_webhook_duplicates.inc(webhook='answer', outcome='recording_skipped')
+                logger.info("Recording %s already ingested; skipping the download", recording_sid)
+                recording_url = None
             
+            answer = None
             if recording_url:
                 try:
-                    response = requests.get(
-                        recording_url,
-                        auth=(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-                    )
+                    with span('twilio.download_recording'):
+                        response, content = download_recording(recording_url)
                     if response.status_code == 200:
                         # Save audio file
                         from django.core.files.base import ContentFile
@@ -456,14 +690,14 @@ class TwilioWebhookAnswerView(View):
                         else:
                             # Default to wav, but log the content type
                             file_extension = 'mp3'
-                            print(f"Unknown content type: {content_type}, defaulting to .wav")
+                            logger.info("Unknown content type: %s, defaulting to .mp3", content_type)
                         
-                        audio_file = ContentFile(response.content, name=f"answer_{question_id}.{file_extension}")
-                        print(f"Audio file created: {audio_file.name}, size: {len(response.content)} bytes, content-type: {content_type}")
+                        audio_file = ContentFile(content, name=f"answer_{question_id}.{file_extension}")
                         
                         # Create or update answer
-                        answer, created = Answer.objects.get_or_create(question=question)
+                        answer, created = Answer.objects.get_or_create(interview=interview, question=question)
                         answer.audio_file = audio_file
+                        answer.recording_sid = recording_sid or ''
                         
                         if recording_duration:
                             try:
@@ -471,27 +705,64 @@ class TwilioWebhookAnswerView(View):
                             except (ValueError, TypeError):
                                 pass
                         
-                        answer.save()
-                        print(f"Audio file saved for question {question_id}, duration: {recording_duration}")
+                        with span('answer.save_recording'):
+                            answer.save()
+                        logger.debug(
+                            "Audio file %s saved (%d bytes, %s)", audio_file.name, len(content), content_type
+                        )
                     else:
-                        print(f"Failed to download recording: {response.status_code}")
+                        logger.warning("Failed to download recording: %s", response.status_code)
+                        idempotency.release_recording(recording_sid)
                 except Exception as e:
-                    print(f"Error downloading recording: {e}")
+                    logger.warning("Error downloading recording: %s", e)
+                    idempotency.release_recording(recording_sid)
+            
+            call_sid = webhook_param(request, 'CallSid')
+            if settings.TWILIO_MEDIA_STREAMS['ENABLED'] and call_sid:
+                # Most of the answer was transcribed while the candidate spoke;
+                # incomplete streams fall back to transcribing the recording
+                with span('stream.claim_transcript'):
+                    streamed = claim_stream_transcript(call_sid)
+                if streamed:
+                    transcript, segments = streamed
+                    answer, created = Answer.objects.get_or_create(interview=interview, question=question)
+                    if not answer.transcript:
+                        answer.transcript = transcript
+                        answer.transcript_segments = segments
+                        answer.save(update_fields=['transcript', 'transcript_segments'])
+                        logger.debug("Streamed transcript saved (%d chars)", len(transcript))
+            
+            followup = None
+            if settings.ADAPTIVE_FOLLOWUPS_ENABLED and question.follows_up_id is None:
+                followup = self.generate_followup(interview, question, answer, started)
+            
+            if answer is not None:
+                # Transcribe and score while the call moves on to the next question
+                enqueue(evaluate_answer, answer.id)
             
             current_question_number = question.question_number
             next_question = interview.questions.filter(question_number__gt=current_question_number).order_by('question_number').first()
             
             response = VoiceResponse()
             
-            if next_question:
+            if followup:
+                logger.debug("Asking follow-up question %s", followup.id)
+                say(response, followup.question_text)
+                response.pause(length=1)
+                response.record(
+                    action=f"/api/webhook/interview/{interview.id}/answer/{followup.id}/",
+                    maxLength=120,  # 2 minutes max
+                    playBeep=True,
+                    trim='trim-silence'
+                )
+            elif next_question:
                 # There are more questions
-                print(f"Moving to next question: {next_question.id}")
-                response.say("Thank you for your answer. Moving to the next question.", voice='alice')
+                logger.debug("Moving to next question %s", next_question.id)
+                say_or_play(response, NEXT_QUESTION_PROMPT)
                 response.pause(length=1)
                 
                 # Ask the next question
-                question_text = f"Question {next_question.question_number}: {next_question.question_text}"
-                response.say(question_text, voice='alice')
+                say_or_play(response, question_prompt(next_question))
                 response.pause(length=1)
                 
                 # Record the next answer
@@ -503,8 +774,8 @@ class TwilioWebhookAnswerView(View):
                 )
             else:
                 # No more questions, end the interview
-                print("No more questions, ending interview")
-                response.say("Thank you for completing all the questions. We'll review your responses and get back to you soon. Goodbye!", voice='alice')
+                logger.debug("No more questions, ending interview")
+                say_or_play(response, GOODBYE_PROMPT)
             
             twiml = str(response)
             if not twiml.startswith('<?xml'):
@@ -513,45 +784,66 @@ class TwilioWebhookAnswerView(View):
             return HttpResponse(twiml, content_type='text/xml; charset=utf-8')
             
         except Exception as e:
-            print(f"Error in answer webhook: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in answer webhook: %s", e)
             
             error_response = VoiceResponse()
-            error_response.say("We are sorry, an error occurred while processing your answer. Please try again later.", voice='alice')
-            return HttpResponse(str(error_response), content_type='text/xml; charset=utf-8')
+            say(error_response, "We are sorry, an error occurred while processing your answer. Please try again later.")
+            return webhook_error(str(error_response))
+    
+    def generate_followup(self, interview, question, answer, started):
+        """Follow-up question for this answer, or None to continue with the static questions.
+
+        Needs the streamed transcript, and gives up once ADAPTIVE_FOLLOWUP_DEADLINE
+        seconds have passed since the webhook arrived so the caller never waits in silence.
+        """
+        existing = question.followups.filter(interview=interview).first()
+        if existing is not None:
+            # A retried or duplicated delivery of this answer; ask the same follow-up again
+            followup_questions.inc(outcome='existing')
+            return existing
+        if answer is None or not answer.transcript:
+            followup_questions.inc(outcome='no_transcript')
+            return None
+        remaining = settings.ADAPTIVE_FOLLOWUP_DEADLINE - (time.perf_counter() - started)
+        if remaining <= 0:
+            followup_questions.inc(outcome='deadline')
+            return None
+        
+        followup_text = generate_followup_question(question.question_text, answer.transcript, deadline=remaining)
+        if not followup_text:
+            outcome = 'deadline' if time.perf_counter() - started >= settings.ADAPTIVE_FOLLOWUP_DEADLINE else 'none'
+            followup_questions.inc(outcome=outcome)
+            return None
+        followup_questions.inc(outcome='generated')
+        return interview.add_followup(question, followup_text)
 
 @method_decorator(csrf_exempt, name='dispatch')
 class TwilioWebhookStatusView(View):
     """Handle call status updates from Twilio"""
     
+    @timed_webhook('status')
+    @idempotent_webhook('status', 'CallSid', 'CallStatus')
     def post(self, request, interview_id):
         try:
             interview = get_object_or_404(Interview, id=interview_id)
             call_status = request.POST.get('CallStatus')
             
             if call_status == 'completed':
-                for question in interview.questions.all():
-                    answer = question.answers.first()
-                    if answer and answer.transcript and not answer.score:
-                        
-                        score, feedback = score_answer(
-                            question.question_text, 
-                            answer.transcript, 
-                            interview.candidate.resume_text
-                        )
-                        answer.score = score
-                        answer.feedback = feedback
-                        answer.save()
+                close_stream_session(request.POST.get('CallSid'))
+                
+                # Update interview status; outbound webhook events commit with it
+                with transaction.atomic():
+                    interview.status = 'completed'
+                    interview.save(update_fields=['status', 'updated_at'])
                 
-                # Update interview status
-                interview.status = 'completed'
-                interview.save()
+                # Answers were evaluated as they came in; score stragglers and write the recommendation
+                enqueue(finalize_interview, interview.id)
             
             return HttpResponse('OK', content_type='text/plain')
             
         except Exception as e:
-            return HttpResponse('Error', content_type='text/plain')
+            logger.exception("Error in status webhook: %s", e)
+            return webhook_error('Error', content_type='text/plain')
 
 # Additional utility endpoints
 class TestTwiMLView(APIView):
@@ -561,7 +853,7 @@ class TestTwiMLView(APIView):
     def get(self, request):
         try:
             response = VoiceResponse()
-            response.say("Hello, this is a test call. If you can hear this, TwiML generation is working correctly.", voice='alice')
+            say(response, "Hello, this is a test call. If you can hear this, TwiML generation is working correctly.")
             twiml = str(response)
             
             # Ensure proper XML header
@@ -571,20 +863,23 @@ class TestTwiMLView(APIView):
             return HttpResponse(twiml, content_type='text/xml; charset=utf-8')
         except Exception as e:
             error_response = VoiceResponse()
-            error_response.say(f"Error: {str(e)}", voice='alice')
+            say(error_response, f"Error: {str(e)}")
             return HttpResponse(str(error_response), content_type='text/xml; charset=utf-8')
 
 class AudioFilesListView(APIView):
     """List all audio files with their URLs"""
     permission_classes = [AllowAny]
     
+    @cached_response(lambda: 'interviews')
     def get(self, request):
         if not validate_api_key(request):
             return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
         
         try:
             # Get all answers that have audio files
-            answers = Answer.objects.filter(audio_file__isnull=False).exclude(audio_file='')
+            answers = Answer.objects.filter(audio_file__isnull=False).exclude(audio_file='').select_related(
+                'interview__candidate', 'question'
+            )
             
             audio_files = []
             for answer in answers:
@@ -594,9 +889,9 @@ class AudioFilesListView(APIView):
                 
                 audio_files.append({
                     'id': answer.id,
-                    'interview_id': answer.question.interview.id,
-                    'candidate_name': answer.question.interview.candidate.name,
-                    'candidate_email': answer.question.interview.candidate.email,
+                    'interview_id': answer.interview.id,
+                    'candidate_name': answer.interview.candidate.name,
+                    'candidate_email': answer.interview.candidate.email,
                     'question_number': answer.question.question_number,
                     'question_text': answer.question.question_text,
                     'audio_url': audio_url,
@@ -627,6 +922,7 @@ class AudioFilesByInterviewView(APIView):
     """List all audio files for a specific interview"""
     permission_classes = [AllowAny]
     
+    @cached_response(lambda interview_id: f'interview:{interview_id}')
     def get(self, request, interview_id):
         if not validate_api_key(request):
             return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
@@ -635,9 +931,9 @@ class AudioFilesByInterviewView(APIView):
             interview = get_object_or_404(Interview, id=interview_id)
             
             answers = Answer.objects.filter(
-                question__interview=interview,
+                interview=interview,
                 audio_file__isnull=False
-            ).exclude(audio_file='')
+            ).exclude(audio_file='').select_related('question')
             
             audio_files = []
             for answer in answers:
@@ -682,15 +978,12 @@ class TwilioAnswerWebhookView(View):
     
     def post(self, request, interview_id, question_id):
         try:
-            print(f"Answer webhook called for interview {interview_id}, question {question_id}")
-            
             # Get interview & question
             interview = Interview.objects.get(id=interview_id)
             current_question = Question.objects.get(id=question_id)
             
             # Get Twilio recording URL
             recording_url = request.POST.get("RecordingUrl")
-            print(f"Recording URL: {recording_url}")
             
             # Transcribe audio using OpenAI
             transcript = None
@@ -701,9 +994,8 @@ class TwilioAnswerWebhookView(View):
                 #     file=requests.get(recording_url + ".mp3", stream=True).raw
                 # )
                 # transcript = transcript_response.text.strip()
-                from .utils import process_wav_to_transcript
+                from .transcription import process_wav_to_transcript
                 transcript = process_wav_to_transcript(recording_url + ".mp3")
-                print(f"Transcript: {transcript}")
 
                 # Evaluate transcript (score 1–10)
                 eval_prompt = f"""
@@ -723,10 +1015,9 @@ class TwilioAnswerWebhookView(View):
                     temperature=0.0
                 )
                 score = int(eval_response.choices[0].message.content.strip())
-                print(f"Score: {score}")
 
             except Exception as e:
-                print(f"Transcription/Scoring failed: {e}")
+                logger.warning("Transcription/Scoring failed: %s", e)
 
             # Save answer
             Answer.objects.create(
@@ -748,7 +1039,7 @@ class TwilioAnswerWebhookView(View):
             
             if next_question:
                 # Ask next question
-                response.say(f"Question {next_question.question_number}: {next_question.question_text}", voice="alice")
+                say(response, f"Question {next_question.question_number}: {next_question.question_text}")
                 response.pause(length=1)
                 
                 # Record next answer
@@ -761,17 +1052,135 @@ class TwilioAnswerWebhookView(View):
                 )
             else:
                 # No more questions → end call
-                response.say("Thank you for completing the interview. Goodbye!", voice="alice")
+                say(response, "Thank you for completing the interview. Goodbye!")
                 response.hangup()
             
             return HttpResponse(str(response), content_type="application/xml")
         
         except Exception as e:
-            print(f"Error in answer webhook: {str(e)}")
+            logger.exception("Error in answer webhook: %s", e)
             response = VoiceResponse()
-            response.say("An error occurred. Please try again later.", voice="alice")
+            say(response, "An error occurred. Please try again later.")
             return HttpResponse(str(response), content_type="application/xml")
 
+class WebhookEndpointCreateView(APIView):
+    """Subscribe a URL to outbound interview events (see interviews.webhooks)"""
+    permission_classes = [AllowAny]
+    
+    def post(self, request):
+        if not validate_api_key(request):
+            return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        serializer = WebhookEndpointSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        endpoint = serializer.save(secret=secrets.token_hex(32))
+        # The secret is shown only here; receivers need it to verify X-Webhook-Signature
+        return Response({**serializer.data, 'secret': endpoint.secret}, status=status.HTTP_201_CREATED)
+
+class WebhookEndpointListView(APIView):
+    """List webhook subscriptions"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        if not validate_api_key(request):
+            return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        endpoints = WebhookEndpoint.objects.all().order_by('-created_at')
+        return Response(WebhookEndpointSerializer(endpoints, many=True).data)
+
+class WebhookEndpointDetailView(APIView):
+    """Get or delete a webhook subscription; deleting drops its undelivered events"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request, endpoint_id):
+        if not validate_api_key(request):
+            return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        endpoint = get_object_or_404(WebhookEndpoint, id=endpoint_id)
+        return Response(WebhookEndpointSerializer(endpoint).data)
+    
+    def delete(self, request, endpoint_id):
+        if not validate_api_key(request):
+            return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        endpoint = get_object_or_404(WebhookEndpoint, id=endpoint_id)
+        endpoint.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class SearchView(APIView):
+    """Full-text search across answer transcripts, candidates and job descriptions"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        if not validate_api_key(request):
+            return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        query = request.query_params.get('q', '').strip()
+        kind = request.query_params.get('type') or None
+        if not query:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if kind and kind not in dict(SearchDocument.KIND_CHOICES):
+            return Response(
+                {'error': f"type must be one of: {', '.join(dict(SearchDocument.KIND_CHOICES))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = min(100, max(1, int(request.query_params.get('page_size', 20))))
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            results, has_next = search(query, kind=kind, page=page, page_size=page_size)
+            return Response({
+                'query': query,
+                'type': kind,
+                'page': page,
+                'page_size': page_size,
+                'has_next': has_next,
+                'results': results,
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({'error': f'Error searching: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class TTSPromptView(View):
+    """Serve pre-rendered prompt audio to Twilio; content-addressed, so it never changes"""
+    
+    def get(self, request, digest):
+        path = prompt_path(digest)
+        if not default_storage.exists(path):
+            raise Http404("Prompt audio not found")
+        
+        etag = f'"{digest}"'
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(default_storage.open(path, 'rb'), content_type=get_tts_backend().content_type)
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={settings.TTS["CACHE_MAX_AGE"]}, immutable'
+        return response
+
+class MetricsView(APIView):
+    """Counters and latency histograms collected in this process"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        if not validate_api_key(request):
+            return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        return Response(registry.snapshot(), status=status.HTTP_200_OK)
+
+class PrometheusMetricsView(View):
+    """The same metrics in the Prometheus text format; scrape with the API key as a bearer token"""
+    
+    def get(self, request):
+        bearer = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not validate_api_key(request) and bearer != settings.API_KEY:
+            return HttpResponse('Invalid API key', status=401, content_type='text/plain')
+        
+        return HttpResponse(registry.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 class DebugTranscriptionView(APIView):
     """Debug endpoint to test transcription functionality"""
     permission_classes = [AllowAny]
@@ -784,10 +1193,12 @@ class DebugTranscriptionView(APIView):
             answer = get_object_or_404(Answer, id=answer_id)
             
             # Run debug function
-            from .utils import debug_audio_file, generate_transcript_from_audio, test_assemblyai_connection
+            from .audio import debug_audio_file
+            from .transcription import get_transcription_backend
             
-            # Test AssemblyAI connection
-            connection_ok, connection_msg = test_assemblyai_connection()
+            # Test the configured transcription backend
+            backend = get_transcription_backend()
+            connection_ok, connection_msg = backend.check_connection()
             
             # Debug audio file
             debug_audio_file(answer)
@@ -799,6 +1210,7 @@ class DebugTranscriptionView(APIView):
                 'success': True,
                 'transcript': transcript,
                 'message': 'Transcription process completed',
+                'transcription_backend': backend.name,
                 'assemblyai_connection': {
                     'status': connection_ok,
                     'message': connection_msg
@@ -813,7 +1225,10 @@ class DebugTranscriptionView(APIView):
 
 
 class EvaluateInterviewView(APIView):
-    """Manually trigger complete evaluation for an interview (transcripts + scoring + recommendation)"""
+    """Manually trigger complete evaluation for an interview (transcripts + scoring + recommendation).
+
+    Runs `finalize_interview` in the background and answers 202 at once.
+    """
     permission_classes = [AllowAny]
     
     def post(self, request, interview_id):
@@ -821,107 +1236,30 @@ class EvaluateInterviewView(APIView):
             return Response({'error': 'Invalid API key'}, status=status.HTTP_401_UNAUTHORIZED)
         
         try:
-            interview = get_object_or_404(Interview, id=interview_id)
-            
-            # Track evaluation progress
-            evaluation_results = {
-                'transcripts_generated': 0,
-                'answers_scored': 0,
-                'recommendation_generated': False,
-                'errors': []
-            }
-            
-            # Step 1: Generate transcripts for all answers that need them
-            print(f"Step 1: Generating transcripts for interview {interview_id}")
-            for question in interview.questions.all():
-                answer = question.answers.first()
-                if answer and answer.audio_file:
-                    if not answer.transcript:
-                        try:
-                            print(f"Generating transcript for question {question.question_number}")
-                            transcript = generate_transcript_from_audio(answer)
-                            if transcript:
-                                evaluation_results['transcripts_generated'] += 1
-                                print(f"✓ Transcript generated for question {question.question_number}")
-                            else:
-                                evaluation_results['errors'].append(f"Failed to generate transcript for question {question.question_number}")
-                        except Exception as e:
-                            error_msg = f"Error generating transcript for question {question.question_number}: {str(e)}"
-                            evaluation_results['errors'].append(error_msg)
-                            print(f"✗ {error_msg}")
-                    else:
-                        print(f"✓ Transcript already exists for question {question.question_number}")
-            
-            # Step 2: Score all answers that have transcripts
-            print(f"Step 2: Scoring answers for interview {interview_id}")
-            for question in interview.questions.all():
-                answer = question.answers.first()
-                if answer and answer.transcript:
-                    try:
-                        print(f"Scoring answer for question {question.question_number}")
-                        score, feedback = score_answer(
-                            question.question_text,
-                            answer.transcript,
-                            interview.candidate.resume_text
-                        )
-                        
-                        # Update the answer
-                        answer.score = score
-                        answer.feedback = feedback
-                        answer.save()
-                        
-                        evaluation_results['answers_scored'] += 1
-                        print(f"✓ Answer scored for question {question.question_number}: {score}/10")
-                    except Exception as e:
-                        error_msg = f"Error scoring answer for question {question.question_number}: {str(e)}"
-                        evaluation_results['errors'].append(error_msg)
-                        print(f"✗ {error_msg}")
-            
-            # Step 3: Generate final recommendation
-            print(f"Step 3: Generating final recommendation for interview {interview_id}")
-            try:
-                recommendation = generate_final_recommendation(interview)
-                interview.recommendation = recommendation
-                interview.save()
-                evaluation_results['recommendation_generated'] = True
-                print(f"✓ Final recommendation generated")
-            except Exception as e:
-                error_msg = f"Error generating final recommendation: {str(e)}"
-                evaluation_results['errors'].append(error_msg)
-                print(f"✗ {error_msg}")
-            
-            # Step 4: Calculate statistics
-            total_questions = interview.questions.count()
-            answered_questions = 0
-            scored_questions = 0
-            total_score = 0
+            interview = get_object_or_404(
+                Interview.objects.select_related('candidate').prefetch_related('answers'), id=interview_id
+            )
             
-            for question in interview.questions.all():
-                answer = question.answers.first()
-                if answer and answer.transcript:
-                    answered_questions += 1
-                if answer and answer.score is not None:
-                    scored_questions += 1
-                    total_score += answer.score
+            # Scores unscored answers (skipping ones already being evaluated) and
+            # rewrites the recommendation in the background
+            enqueue(finalize_interview, interview.id)
             
-            average_score = total_score / scored_questions if scored_questions > 0 else 0
+            # Progress so far; poll the results endpoint (or stream events) for the outcome
+            answers = [interview.get_answer(question) for question in interview.question_list]
+            scores = [answer.score for answer in answers if answer and answer.score is not None]
             
             return Response({
                 'success': True,
                 'interview_id': interview.id,
                 'candidate_name': interview.candidate.name,
                 'evaluation_summary': {
-                    'total_questions': total_questions,
-                    'answered_questions': answered_questions,
-                    'scored_questions': scored_questions,
-                    'average_score': round(average_score, 2),
-                    'transcripts_generated': evaluation_results['transcripts_generated'],
-                    'answers_scored': evaluation_results['answers_scored'],
-                    'recommendation_generated': evaluation_results['recommendation_generated'],
-                    'errors': evaluation_results['errors'] if evaluation_results['errors'] else None
+                    'total_questions': len(answers),
+                    'answered_questions': sum(1 for answer in answers if answer and answer.transcript),
+                    'scored_questions': len(scores),
+                    'average_score': round(sum(scores) / len(scores), 2) if scores else 0,
                 },
-                'message': f'Evaluation completed: {scored_questions}/{total_questions} questions scored, avg score: {average_score:.2f}/10'
-            }, status=status.HTTP_200_OK)
+                'message': 'Evaluation started: unscored answers are being scored and the recommendation regenerated'
+            }, status=status.HTTP_202_ACCEPTED)
             
         except Exception as e:
             return Response({
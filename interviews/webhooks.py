@@ -0,0 +1,337 @@
+"""Outbound webhooks telling client systems when interviews complete or are evaluated.
+
+Clients subscribe a URL to ``interview.completed`` (the call ended) and/or
+``interview.evaluated`` (the final recommendation was stored), each sent once
+per interview and endpoint. Each event is written to the `WebhookDelivery`
+outbox by a post_save signal, inside the transaction that saved the interview
+when there is one, so events survive restarts and are never sent for
+rolled-back changes.
+
+The dispatcher leases due rows per endpoint in batches of ``BATCH_SIZE`` and
+POSTs each batch as one JSON body signed with the endpoint's secret (see
+`sign`). Failed batches are retried with exponential backoff and jitter
+(honouring Retry-After) until ``MAX_ATTEMPTS``; at most
+``MAX_CONCURRENCY_PER_ENDPOINT`` batches per endpoint are in flight in one
+process. Delivery is at least once and unordered, so receivers should
+deduplicate on the event ``id``.
+
+With ``WEBHOOKS['DISPATCHER'] = 'thread'`` a dispatcher thread starts in the
+process that first commits an event; with ``'command'`` run
+``python manage.py dispatch_webhooks`` (or ``--once`` from a scheduler).
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import Counter
+import hashlib
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .ai import FALLBACK_RECOMMENDATIONS
+from .metrics import registry, span
+from .models import Interview, WebhookDelivery, WebhookEndpoint
+from .tasks import validate_callback_url
+
+logger = logging.getLogger(__name__)
+
+webhook_deliveries = registry.counter(
+    'webhook_deliveries_total', 'Outbound webhook events by event and outcome (delivered, retry, failed)'
+)
+webhook_batch_latency = registry.histogram(
+    'webhook_batch_seconds', 'Time to POST one batch of webhook events by outcome'
+)
+
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+
+
+def sign(secret, body, timestamp):
+    """Signature header value: ``t=<unix time>,v1=<hex HMAC-SHA256 of "<t>.<body>">``.
+
+    Receivers recompute the HMAC over the raw body and reject stale timestamps.
+    """
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def retry_delay(attempts, options, retry_after=None):
+    """Seconds before retrying a batch that has failed `attempts` times"""
+    delay = min(options['BACKOFF_MAX'], options['BACKOFF_BASE'] * 2 ** (attempts - 1))
+    # Jitter spreads retries of batches that failed together
+    delay *= random.uniform(0.5, 1.0)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def interview_payload(interview):
+    return {
+        'interview_id': str(interview.id),
+        'candidate_id': str(interview.candidate_id),
+        'job_description_id': str(interview.job_description_id),
+        'status': interview.status,
+        'recommendation': interview.recommendation or None,
+        'scores': [
+            {'question_id': str(question_id), 'score': score}
+            for question_id, score in interview.answers.values_list('question_id', 'score')
+        ],
+        'results_url': f"{settings.BASE_URL or ''}/api/interviews/{interview.id}/results/",
+    }
+
+
+def record_event(event, interview):
+    """Add an outbox row for `event` for every active endpoint subscribed to it and not yet sent it"""
+    endpoints = [endpoint for endpoint in WebhookEndpoint.objects.filter(is_active=True) if endpoint.subscribes_to(event)]
+    if not endpoints:
+        return []
+    # Each event happens once per interview: Twilio may report the completed call
+    # more than once, and any later save touching the recommendation (or a
+    # re-evaluation) is not a new evaluation
+    notified = set(
+        WebhookDelivery.objects.filter(interview=interview, event=event).values_list('endpoint_id', flat=True)
+    )
+    endpoints = [endpoint for endpoint in endpoints if endpoint.pk not in notified]
+    if not endpoints:
+        return []
+
+    payload = interview_payload(interview)
+    now = timezone.now()
+    # The unique constraint catches a concurrent save that got past the filter above
+    deliveries = WebhookDelivery.objects.bulk_create([
+        WebhookDelivery(endpoint=endpoint, interview=interview, event=event, payload=payload, next_attempt_at=now)
+        for endpoint in endpoints
+    ], ignore_conflicts=True)
+    transaction.on_commit(wake_dispatcher)
+    return deliveries
+
+
+def _changed(update_fields, field):
+    return update_fields is None or field in update_fields
+
+
+def _on_interview_save(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw or created or not settings.WEBHOOKS['ENABLED']:
+        return
+    if instance.status == 'completed' and _changed(update_fields, 'status'):
+        record_event('interview.completed', instance)
+    # A fallback recommendation is not an evaluation; recording it would block the real one
+    if (instance.recommendation and instance.recommendation not in FALLBACK_RECOMMENDATIONS
+            and _changed(update_fields, 'recommendation')):
+        record_event('interview.evaluated', instance)
+
+
+def connect_signals():
+    post_save.connect(_on_interview_save, sender=Interview, dispatch_uid='webhooks_interview')
+
+
+def _due(now):
+    return WebhookDelivery.objects.filter(status='pending', next_attempt_at__lte=now).filter(
+        Q(leased_until__isnull=True) | Q(leased_until__lt=now)
+    )
+
+
+class WebhookDispatcher:
+    """Lease due outbox rows and deliver them from a worker pool"""
+
+    def __init__(self, options=None):
+        self.options = options or settings.WEBHOOKS
+        self.executor = ThreadPoolExecutor(max_workers=self.options['WORKERS'], thread_name_prefix='webhooks')
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.options['WORKERS'], pool_maxsize=self.options['WORKERS'])
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.in_flight = Counter()  # batches being sent, by endpoint id
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run_forever, name='webhook-dispatcher', daemon=True)
+                self.thread.start()
+
+    def wake(self):
+        self.wakeup.set()
+
+    def run_forever(self):
+        """Dispatch due rows whenever woken, and every POLL_INTERVAL seconds for retries"""
+        while True:
+            self.wakeup.clear()
+            try:
+                self.dispatch_due()
+            except Exception as e:
+                logger.exception("Error dispatching webhooks: %s", e)
+            finally:
+                close_old_connections()
+            self.wakeup.wait(self.options['POLL_INTERVAL'])
+
+    def run_once(self):
+        """Deliver everything due now, waiting for the batches; returns the number of batches sent"""
+        sent = 0
+        while True:
+            futures = self.dispatch_due()
+            if not futures:
+                return sent
+            wait(futures)
+            sent += len(futures)
+
+    def dispatch_due(self):
+        """Lease batches for every endpoint with room for more in-flight requests; returns their futures"""
+        now = timezone.now()
+        endpoint_ids = set(_due(now).values_list('endpoint_id', flat=True).distinct())
+        futures = []
+        for endpoint in WebhookEndpoint.objects.filter(pk__in=endpoint_ids, is_active=True):
+            while self._acquire(endpoint.pk):
+                token = self._lease(endpoint, now)
+                if token is None:
+                    self._release(endpoint.pk)
+                    break
+                futures.append(self.executor.submit(self._send, endpoint, token))
+        return futures
+
+    def _acquire(self, endpoint_id):
+        with self.lock:
+            if self.in_flight[endpoint_id] >= self.options['MAX_CONCURRENCY_PER_ENDPOINT']:
+                return False
+            self.in_flight[endpoint_id] += 1
+            return True
+
+    def _release(self, endpoint_id):
+        with self.lock:
+            self.in_flight[endpoint_id] -= 1
+            if not self.in_flight[endpoint_id]:
+                del self.in_flight[endpoint_id]
+
+    def _lease(self, endpoint, now):
+        """Lease up to BATCH_SIZE of the endpoint's oldest due rows; None if another dispatcher took them"""
+        ids = list(
+            _due(now).filter(endpoint=endpoint).order_by('created_at').values_list('pk', flat=True)[:self.options['BATCH_SIZE']]
+        )
+        if not ids:
+            return None
+        token = uuid.uuid4()
+        # Rows another process leased since the select are skipped by the status/lease filter
+        leased = _due(now).filter(pk__in=ids).update(
+            lease_token=token, leased_until=now + timedelta(seconds=self.options['LEASE_SECONDS'])
+        )
+        return token if leased else None
+
+    def _send(self, endpoint, token):
+        close_old_connections()
+        try:
+            self.deliver_batch(endpoint, token)
+        except Exception as e:
+            # The lease expires and the rows are retried
+            logger.exception("Error delivering webhooks to %s: %s", endpoint.url, e)
+        finally:
+            close_old_connections()
+            self._release(endpoint.pk)
+            # The endpoint may have more rows waiting for a free slot
+            self.wake()
+
+    def deliver_batch(self, endpoint, token):
+        deliveries = list(WebhookDelivery.objects.filter(lease_token=token).order_by('created_at'))
+        if not deliveries:
+            return
+        body = json.dumps({
+            'deliveries': [
+                {
+                    'id': str(delivery.id),
+                    'event': delivery.event,
+                    'created_at': delivery.created_at.isoformat(),
+                    'data': delivery.payload,
+                }
+                for delivery in deliveries
+            ]
+        }, separators=(',', ':')).encode()
+        headers = {
+            'Content-Type': 'application/json',
+            SIGNATURE_HEADER: sign(endpoint.secret, body, int(time.time())),
+        }
+
+        error, retry_after = None, None
+        started = time.perf_counter()
+        try:
+            # Resolved at every send: the host may point somewhere else than when it was registered
+            validate_callback_url(endpoint.url, allowed_hosts=self.options.get('ALLOWED_HOSTS', ()))
+            with span('webhook.deliver'):
+                response = self.session.post(endpoint.url, data=body, headers=headers, timeout=self.options['TIMEOUT'])
+            if not 200 <= response.status_code < 300:
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                retry_after = _retry_after(response)
+        except ValidationError as e:
+            error = f"Refused {endpoint.url}: {' '.join(e.messages)}"
+        except requests.RequestException as e:
+            error = str(e)
+        webhook_batch_latency.observe(time.perf_counter() - started, outcome='failed' if error else 'delivered')
+
+        now = timezone.now()
+        for delivery in deliveries:
+            delivery.attempts += 1
+            delivery.lease_token = None
+            delivery.leased_until = None
+            if error is None:
+                delivery.status = 'delivered'
+                delivery.delivered_at = now
+                delivery.last_error = ''
+                outcome = 'delivered'
+            elif delivery.attempts >= self.options['MAX_ATTEMPTS']:
+                delivery.status = 'failed'
+                delivery.last_error = error
+                outcome = 'failed'
+            else:
+                delay = retry_delay(delivery.attempts, self.options, retry_after)
+                delivery.next_attempt_at = now + timedelta(seconds=delay)
+                delivery.last_error = error
+                outcome = 'retry'
+            webhook_deliveries.inc(event=delivery.event, outcome=outcome)
+        WebhookDelivery.objects.bulk_update(
+            deliveries,
+            ['attempts', 'lease_token', 'leased_until', 'status', 'delivered_at', 'next_attempt_at', 'last_error']
+        )
+        if error:
+            logger.warning("Webhook batch of %d to %s failed: %s", len(deliveries), endpoint.url, error)
+        else:
+            logger.info("Delivered %d webhook events to %s", len(deliveries), endpoint.url)
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """Return the process-wide dispatcher, creating it on first use"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = WebhookDispatcher()
+        return _dispatcher
+
+
+def wake_dispatcher():
+    """Deliver newly committed events now, starting the dispatcher thread if this process runs one"""
+    if settings.WEBHOOKS['DISPATCHER'] != 'thread':
+        return
+    dispatcher = get_dispatcher()
+    dispatcher.start()
+    dispatcher.wake()